@@ -3,10 +3,11 @@
 Script para agregar URLs de logos oficiales de EuroLeague a los equipos
 """
 
-import json
-import os
 import sys
 
+from teams_asset import TEAMS_FILE, patch_teams, team_code
+from telemetry import run_report
+
 def main():
     print("🖼️ Agregando URLs de logos oficiales de EuroLeague...")
     
@@ -34,44 +35,24 @@ def main():
         "DUB": "https://img.euroleaguebasketball.net/design/ec/logos/clubs/dubai-basketball.png"
     }
     
-    # Rutas
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    assets_dir = os.path.join(project_root, "app", "src", "main", "assets")
-    static_data_dir = os.path.join(assets_dir, "static_data")
-    teams_file = os.path.join(static_data_dir, "teams_2025_26.json")
-    
-    # Cargar datos actuales
-    print("📥 Cargando datos de equipos...")
-    with open(teams_file, 'r', encoding='utf-8') as f:
-        teams_data = json.load(f)
+    # Aplicar todos los logos en una sola lectura/escritura
+    print("📥 Actualizando datos de equipos...")
+    result = patch_teams({code: {"logoUrl": url} for code, url in team_logos.items()}, TEAMS_FILE)
     
-    # Actualizar logos
-    updated_count = 0
-    for team in teams_data['teams']:
-        team_code = team.get('code', team.get('id', ''))
-        
-        if team_code in team_logos:
-            old_logo = team.get('logoUrl', '')
-            team['logoUrl'] = team_logos[team_code]
-            if old_logo != team['logoUrl']:
-                updated_count += 1
-                print(f"✅ {team['name']}: {team_code} → Logo actualizado")
-        else:
-            print(f"⚠️ {team['name']}: Código {team_code} no encontrado en mapeo de logos")
-    
-    # Guardar datos actualizados
-    with open(teams_file, 'w', encoding='utf-8') as f:
-        json.dump(teams_data, f, ensure_ascii=False, indent=2)
+    for team, _ in result.updated:
+        print(f"✅ {team['name']}: {team_code(team)} → Logo actualizado")
+    for team in result.teams:
+        if team_code(team) not in team_logos:
+            print(f"⚠️ {team['name']}: Código {team_code(team)} no encontrado en mapeo de logos")
     
     print(f"\n📊 Resumen:")
-    print(f"   🏆 {len(teams_data['teams'])} equipos procesados")
-    print(f"   🖼️ {updated_count} logos actualizados")
-    print(f"   ⚠️ {len(teams_data['teams']) - updated_count} equipos sin logo específico")
+    print(f"   🏆 {len(result.teams)} equipos procesados")
+    print(f"   🖼️ {result.updated_count} logos actualizados")
+    print(f"   ⚠️ {len(result.teams) - result.updated_count} equipos sin logo específico")
     
     # Mostrar algunos ejemplos
     print(f"\n🖼️ Ejemplos de logos agregados:")
-    for team in teams_data['teams'][:3]:
+    for team in result.teams[:3]:
         if team.get('logoUrl'):
             print(f"   {team['name']}: {team['logoUrl']}")
     
@@ -83,11 +64,13 @@ def main():
     return True
 
 if __name__ == "__main__":
-    success = main()
-    if success:
-        print("\n🎉 ¡URLs de logos agregadas exitosamente!")
-        print("Ahora los equipos tendrán sus logos oficiales.")
-    else:
-        print("\n💥 Error agregando URLs de logos")
+    with run_report("add_team_logos") as run:
+        success = main()
+        run.ok = success
+        if success:
+            print("\n🎉 ¡URLs de logos agregadas exitosamente!")
+            print("Ahora los equipos tendrán sus logos oficiales.")
+        else:
+            print("\n💥 Error agregando URLs de logos")
     
     sys.exit(0 if success else 1)
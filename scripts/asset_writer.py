@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Escritura de los assets JSON en formatos compactos.
+
+Formatos disponibles:
+- pretty:   JSON indentado (formato histórico, el que lee StaticDataManager)
+- minified: mismo contenido sin espacios (compatible con StaticDataManager)
+- columnar: la lista de partidos se guarda como un array por campo y los
+            códigos de equipo se codifican con un diccionario. Se escribe en un
+            fichero aparte (*.columnar.json) junto al asset compatible. Es sin
+            pérdida: las filas a las que les falta un campo se anotan en
+            "missing", así que un null explícito y un campo ausente se
+            distinguen al reconstruir
+
+Con gzip se añade una copia comprimida (*.gz) de cada fichero escrito.
+El informe compara tamaño y tiempo de parseo de cada variante.
+
+Uso:
+    python3 asset_writer.py [--repeat N] [ficheros...]
+"""
+
+import argparse
+import gzip
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import json_codec
+import telemetry
+
+FORMAT_PRETTY = "pretty"
+FORMAT_MINIFIED = "minified"
+FORMAT_COLUMNAR = "columnar"
+FORMATS = (FORMAT_PRETTY, FORMAT_MINIFIED, FORMAT_COLUMNAR)
+
+COLUMNAR_SUFFIX = ".columnar.json"
+GZIP_SUFFIX = ".gz"
+
+# Campos con códigos de equipo de cada asset (comparten diccionario)
+MATCH_TEAM_FIELDS = ("homeTeamCode", "awayTeamCode")
+GAME_TEAM_FIELDS = ("homeTeamId", "awayTeamId")
+
+# mkstemp crea los ficheros con 0600; se aplican los permisos habituales de open()
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path: str) -> Optional[str]:
+    """SHA-256 de un fichero, o None si no existe"""
+    try:
+        with open(path, 'rb') as f:
+            return sha256_bytes(f.read())
+    except OSError:
+        return None
+
+
+def write_atomic(path: str, data: bytes):
+    """Escribe en un temporal del mismo directorio y lo renombra sobre el destino"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, FILE_MODE)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    telemetry.incr("asset_files_written_total")
+    telemetry.incr("asset_bytes_written_total", len(data))
+
+
+def record_worker_writes(files_written: int, bytes_written: int, files_unchanged: int = 0):
+    """
+    Suma a la telemetría del proceso principal lo escrito en procesos del pool
+    (sus contadores se pierden al terminar el proceso hijo)
+    """
+    telemetry.incr("asset_files_written_total", files_written)
+    telemetry.incr("asset_bytes_written_total", bytes_written)
+    telemetry.incr("asset_files_unchanged_total", files_unchanged)
+
+
+def write_if_changed(path: str, data: bytes) -> bool:
+    """Escribe solo si el SHA-256 difiere del fichero existente. Devuelve si escribió"""
+    if sha256_file(path) == sha256_bytes(data):
+        telemetry.incr("asset_files_unchanged_total")
+        return False
+    write_atomic(path, data)
+    return True
+
+
+def encode_json(data: Any, output_format: str = FORMAT_PRETTY) -> bytes:
+    """
+    Serializa a bytes UTF-8 en formato indentado o minificado. Los bytes son
+    los de json.dumps sea cual sea el backend de json_codec
+    """
+    return json_codec.dumps(data, pretty=output_format == FORMAT_PRETTY)
+
+
+def to_columnar(data: Dict[str, Any], list_key: str, dict_fields: Sequence[str] = ()) -> Dict[str, Any]:
+    """
+    Convierte data[list_key] (lista de objetos) a columnas. Los campos de
+    `dict_fields` se guardan como índices sobre un diccionario común y, por
+    campo, `missing` lista las filas que no lo tienen (en la columna van como
+    null).
+    """
+    rows = data.get(list_key) or []
+
+    fields: List[str] = []
+    seen = set()
+    for row in rows:
+        for field in row:
+            if field not in seen:
+                seen.add(field)
+                fields.append(field)
+
+    dictionary: List[str] = []
+    dictionary_index: Dict[str, int] = {}
+    encoded = [field for field in dict_fields if field in seen]
+
+    def encode_value(value: Any) -> Any:
+        if value is None:
+            return None
+        if value not in dictionary_index:
+            dictionary_index[value] = len(dictionary)
+            dictionary.append(value)
+        return dictionary_index[value]
+
+    columns: Dict[str, List[Any]] = {}
+    missing: Dict[str, List[int]] = {}
+    for field in fields:
+        values = [row.get(field) for row in rows]
+        columns[field] = [encode_value(v) for v in values] if field in encoded else values
+        absent = [i for i, row in enumerate(rows) if field not in row]
+        if absent:
+            missing[field] = absent
+
+    columnar = dict(data)
+    columnar[list_key] = {
+        "layout": FORMAT_COLUMNAR,
+        "count": len(rows),
+        "dictionary": dictionary,
+        "encodedFields": encoded,
+        "columns": columns,
+        "missing": missing,
+    }
+    return columnar
+
+
+def from_columnar(data: Dict[str, Any], list_key: str) -> Dict[str, Any]:
+    """Operación inversa de to_columnar: reconstruye la lista de objetos"""
+    table = data.get(list_key)
+    if not isinstance(table, dict) or table.get("layout") != FORMAT_COLUMNAR:
+        return data
+
+    dictionary = table["dictionary"]
+    columns = {}
+    for field, values in table["columns"].items():
+        if field in table["encodedFields"]:
+            values = [None if v is None else dictionary[v] for v in values]
+        columns[field] = values
+
+    absent = {field: set(indices) for field, indices in table.get("missing", {}).items()}
+    rows = []
+    for i in range(table["count"]):
+        row = {}
+        for field, values in columns.items():
+            if field not in absent or i not in absent[field]:
+                row[field] = values[i]
+        rows.append(row)
+
+    restored = dict(data)
+    restored[list_key] = rows
+    return restored
+
+
+def columnar_path(path: str) -> str:
+    base, _ = os.path.splitext(path)
+    return base + COLUMNAR_SUFFIX
+
+
+def write_asset(path: str, data: Dict[str, Any], output_format: str = FORMAT_PRETTY,
+                list_key: Optional[str] = None, dict_fields: Sequence[str] = (),
+                gzip_copy: bool = False) -> List[str]:
+    """
+    Escribe un asset de forma atómica en el formato pedido y devuelve las rutas
+    escritas. En formato columnar el fichero compatible se escribe minificado
+    y la variante columnar va a *.columnar.json.
+    """
+    if output_format not in FORMATS:
+        raise ValueError(f"Formato desconocido: {output_format}")
+
+    with telemetry.span("write", asset=os.path.basename(path), format=output_format):
+        outputs: List[Tuple[str, bytes]] = []
+        if output_format == FORMAT_COLUMNAR:
+            outputs.append((path, encode_json(data, FORMAT_MINIFIED)))
+            if list_key:
+                columnar = to_columnar(data, list_key, dict_fields)
+                outputs.append((columnar_path(path), encode_json(columnar, FORMAT_MINIFIED)))
+        else:
+            outputs.append((path, encode_json(data, output_format)))
+
+        written = []
+        for target, content in outputs:
+            write_atomic(target, content)
+            written.append(target)
+            if gzip_copy:
+                write_atomic(target + GZIP_SUFFIX, gzip.compress(content, mtime=0))
+                written.append(target + GZIP_SUFFIX)
+    return written
+
+
+def _parse_time(content: bytes, decode: Callable[[bytes], Any], repeat: int) -> float:
+    """Mejor tiempo (ms) de `repeat` decodificaciones"""
+    best = float('inf')
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        decode(content)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def compare_formats(data: Dict[str, Any], list_key: Optional[str] = None,
+                    dict_fields: Sequence[str] = (), repeat: int = 20) -> List[Dict[str, Any]]:
+    """
+    Mide tamaño y tiempo de parseo de cada variante. El tiempo de la variante
+    columnar incluye reconstruir la lista de objetos, que debe ser igual a la
+    original (si no, ValueError).
+    """
+    variants: List[Tuple[str, bytes, Callable[[bytes], Any]]] = [
+        (FORMAT_PRETTY, encode_json(data, FORMAT_PRETTY), json_codec.loads),
+        (FORMAT_MINIFIED, encode_json(data, FORMAT_MINIFIED), json_codec.loads),
+    ]
+    if list_key:
+        columnar = encode_json(to_columnar(data, list_key, dict_fields), FORMAT_MINIFIED)
+        if from_columnar(json_codec.loads(columnar), list_key) != data:
+            raise ValueError(f"La variante columnar de '{list_key}' no reconstruye los datos originales")
+        variants.append((FORMAT_COLUMNAR, columnar, lambda b: from_columnar(json_codec.loads(b), list_key)))
+
+    rows = []
+    for name, content, decode in variants:
+        compressed = gzip.compress(content, mtime=0)
+        rows.append({
+            "format": name,
+            "bytes": len(content),
+            "parse_ms": _parse_time(content, decode, repeat),
+            "gzip_bytes": len(compressed),
+            "gzip_parse_ms": _parse_time(compressed, lambda b, d=decode: d(gzip.decompress(b)), repeat),
+        })
+    return rows
+
+
+def print_format_report(name: str, rows: List[Dict[str, Any]]):
+    """Tabla de tamaños y tiempos relativa al formato pretty"""
+    baseline = rows[0]["bytes"] or 1
+    print(f"\n📏 {name}")
+    print(f"   {'formato':<10} {'bytes':>9} {'%':>5} {'parseo':>9} {'gzip':>8} {'parseo gz':>10}")
+    for row in rows:
+        print(f"   {row['format']:<10} {row['bytes']:>9} {row['bytes'] * 100 // baseline:>4}%"
+              f" {row['parse_ms']:>7.2f}ms {row['gzip_bytes']:>8} {row['gzip_parse_ms']:>8.2f}ms")
+
+
+def report_asset(path: str, repeat: int = 20):
+    """Compara los formatos de un asset ya generado"""
+    data = json_codec.load(path)
+
+    list_key, dict_fields = None, ()
+    if isinstance(data.get("matches"), list):
+        list_key, dict_fields = "matches", MATCH_TEAM_FIELDS
+    elif isinstance(data.get("games"), list):
+        list_key, dict_fields = "games", GAME_TEAM_FIELDS
+
+    print_format_report(os.path.basename(path), compare_formats(data, list_key, dict_fields, repeat))
+
+
+def add_format_arguments(parser: argparse.ArgumentParser):
+    """Opciones de formato comunes a los scripts que generan assets"""
+    parser.add_argument('--format', choices=FORMATS, default=FORMAT_PRETTY,
+                        help='Formato de salida de los assets JSON (por defecto: pretty)')
+    parser.add_argument('--gzip', action='store_true',
+                        help='Escribir además una copia comprimida .gz de cada asset')
+    parser.add_argument('--report', action='store_true',
+                        help='Mostrar la comparativa de tamaño y tiempo de parseo por formato')
+
+
+def main() -> int:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    default_file = os.path.join(os.path.dirname(script_dir), "app", "src", "main", "assets",
+                                "static_data", "matches_calendar_2025_26.json")
+
+    parser = argparse.ArgumentParser(description="Comparativa de formatos de los assets JSON")
+    parser.add_argument('files', nargs='*', default=[default_file])
+    parser.add_argument('--repeat', type=int, default=20, help='Repeticiones por medición')
+    args = parser.parse_args()
+
+    for path in args.files:
+        if not os.path.exists(path):
+            print(f"❌ No existe: {path}")
+            return 1
+        report_asset(path, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Backfill histórico de varias competiciones, temporadas y fases.
+
+La unidad de trabajo es (competición, temporada, fase, jornada), p. ej.
+E/E2019/PO/3. Las unidades se reparten entre un pool de hilos con el mismo
+token bucket que round_fetcher, y cada unidad terminada se guarda en disco
+(scripts/.backfill/<comp>/<temporada>/<fase>/rNN.json, con los partidos en
+crudo). Si un backfill de horas se interrumpe, la siguiente ejecución con
+los mismos parámetros salta las unidades ya guardadas y sigue donde se quedó.
+
+No se sabe de antemano cuántas jornadas tiene cada fase (la fase regular ha
+tenido de 10 a 38 y la numeración de PO/FF puede continuar la de la fase
+regular), así que se sondean hasta PHASE_MAX_ROUND: PHASE_END_EMPTY_ROUNDS
+jornadas vacías seguidas después de una con partidos cierran la fase (una
+sola jornada vacía puede ser un aplazamiento), se anota en el checkpoint y
+las jornadas siguientes ya no se piden.
+
+Las temporadas que no han terminado (la actual) pueden seguir cambiando:
+de ellas no se guardan las jornadas vacías ni el final de fase, y una
+jornada con partidos sin terminar se guarda para las salidas pero se vuelve
+a pedir al reanudar.
+
+Al final, cada temporada sin unidades fallidas se escribe en el formato de
+los assets (ver generate_staticdatamanager_files.py y standings.py):
+
+    <salida>/<comp>/matches_calendar_2019_20.json
+    <salida>/<comp>/standings_2019_20.json     (solo fase regular)
+
+Uso:
+    python3 scripts/backfill.py --competitions E U --seasons 2000-2025 --phases RS PO FF
+    python3 scripts/backfill.py --seasons 2019 --jobs 4 --format minified
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from asset_writer import FORMAT_PRETTY, MATCH_TEAM_FIELDS, add_format_arguments, write_asset, write_atomic
+from game_store import GameStore, is_finished
+from generate_staticdatamanager_files import static_match
+import http_client
+import json_codec
+from populate_game_center_data import PHASE_REGULAR_SEASON, feeds_game_to_game, feeds_games_url
+from resilience import INCOMPLETE
+from round_fetcher import DEFAULT_BURST, DEFAULT_RATE_PER_SECOND, TokenBucket
+from standings import compute_standings, write_standings_asset
+from telemetry import run_report, span
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DEFAULT_CHECKPOINT_DIR = os.path.join(SCRIPT_DIR, ".backfill")
+DEFAULT_OUTPUT_DIR = os.path.join(PROJECT_ROOT, "data", "history")
+
+COMPETITIONS = {"E": "EuroLeague", "U": "EuroCup"}
+PHASES = ("RS", "PO", "FF")
+PHASE_MAX_ROUND = {"RS": 38, "PO": 45, "FF": 45}
+DEFAULT_SEASON = 2025
+DEFAULT_JOBS = 8
+PHASE_END_FILE = "end.json"
+# Jornadas vacías seguidas que cierran una fase
+PHASE_END_EMPTY_ROUNDS = 2
+# Mes a partir del cual empieza la temporada siguiente (agosto)
+SEASON_ROLLOVER_MONTH = 8
+
+Games = List[Dict]
+PhaseKey = Tuple[str, int, str]
+
+
+@dataclass(frozen=True, order=True)
+class Unit:
+    competition: str
+    season: int  # Año de inicio: 2019 → E2019 (temporada 2019-20)
+    phase: str
+    round: int
+
+    @property
+    def season_code(self) -> str:
+        return f"{self.competition}{self.season}"
+
+    @property
+    def phase_key(self) -> PhaseKey:
+        return self.competition, self.season, self.phase
+
+    def __str__(self) -> str:
+        return f"{self.competition}/{self.season_code}/{self.phase}/{self.round}"
+
+
+def season_label(season: int) -> str:
+    """2019 → "2019-20" """
+    return f"{season}-{(season + 1) % 100:02d}"
+
+
+def current_season(today: Optional[date] = None) -> int:
+    """Año de inicio de la temporada en curso"""
+    today = today or date.today()
+    return today.year if today.month >= SEASON_ROLLOVER_MONTH else today.year - 1
+
+
+def season_finished(season: int, today: Optional[date] = None) -> bool:
+    return season < current_season(today)
+
+
+def is_final(unit: Unit, games: Games) -> bool:
+    """Si la unidad ya no puede cambiar: temporada terminada o todos sus partidos terminados"""
+    if season_finished(unit.season):
+        return True
+    return bool(games) and all(is_finished(game) for game in games)
+
+
+def parse_seasons(values: Sequence[str]) -> List[int]:
+    """Acepta años sueltos o rangos, con o sin código de competición: 2019, E2000-E2025"""
+    seasons = set()
+    for value in values:
+        start, _, end = value.partition("-")
+        first, last = int(start.lstrip("EU")), int((end or start).lstrip("EU"))
+        if first > last:
+            raise ValueError(f"Rango de temporadas vacío: {value}")
+        seasons.update(range(first, last + 1))
+    return sorted(seasons)
+
+
+def plan_units(competitions: Iterable[str], seasons: Iterable[int], phases: Iterable[str],
+               max_round: Optional[int] = None) -> List[Unit]:
+    """Unidades ordenadas por fase y jornada, para detectar pronto el final de cada fase"""
+    return [
+        Unit(competition, season, phase, round_num)
+        for competition in competitions
+        for season in seasons
+        for phase in phases
+        for round_num in range(1, (max_round or PHASE_MAX_ROUND[phase]) + 1)
+    ]
+
+
+class Checkpoint:
+    """Unidades terminadas en disco: un fichero por unidad y un marcador de fin por fase"""
+
+    def __init__(self, directory: str = DEFAULT_CHECKPOINT_DIR):
+        self.directory = directory
+
+    def _phase_dir(self, key: PhaseKey) -> str:
+        competition, season, phase = key
+        return os.path.join(self.directory, competition, f"{competition}{season}", phase)
+
+    def path(self, unit: Unit) -> str:
+        return os.path.join(self._phase_dir(unit.phase_key), f"r{unit.round:02d}.json")
+
+    def load(self, unit: Unit) -> Optional[Games]:
+        try:
+            return json_codec.load(self.path(unit))["games"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, unit: Unit, games: Games):
+        data = {"unit": str(unit), "fetchedAt": datetime.now().isoformat(), "games": games}
+        write_atomic(self.path(unit), json_codec.dumps(data))
+
+    def phase_end(self, key: PhaseKey) -> Optional[int]:
+        try:
+            return int(json_codec.load(os.path.join(self._phase_dir(key), PHASE_END_FILE))["lastRound"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save_phase_end(self, key: PhaseKey, last_round: int):
+        data = json_codec.dumps({"lastRound": last_round})
+        write_atomic(os.path.join(self._phase_dir(key), PHASE_END_FILE), data)
+
+    def rounds(self, key: PhaseKey) -> List[Tuple[int, Games]]:
+        """(jornada, partidos) guardados de una fase, en orden de jornada"""
+        directory = self._phase_dir(key)
+        if not os.path.isdir(directory):
+            return []
+        rounds = []
+        for name in sorted(os.listdir(directory)):
+            if name.startswith("r") and name.endswith(".json"):
+                unit = Unit(*key, int(name[1:-5]))
+                games = self.load(unit)
+                if games is not None:
+                    rounds.append((unit.round, games))
+        return rounds
+
+    def reset(self, keys: Iterable[PhaseKey]):
+        for key in keys:
+            shutil.rmtree(self._phase_dir(key), ignore_errors=True)
+
+
+@dataclass
+class BackfillStats:
+    fetched: int = 0
+    resumed: int = 0
+    beyond_end: int = 0
+    games: int = 0
+    failed: List[Tuple[Unit, str]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+class PhaseTracker:
+    """Partidos por jornada de cada fase para detectar dónde termina"""
+
+    def __init__(self, checkpoint: Checkpoint):
+        self.checkpoint = checkpoint
+        self._counts: Dict[PhaseKey, Dict[int, int]] = {}
+        self._ends: Dict[PhaseKey, Optional[int]] = {}
+
+    def end(self, key: PhaseKey) -> Optional[int]:
+        if key not in self._ends:
+            # El final guardado de una temporada en curso no es fiable
+            self._ends[key] = self.checkpoint.phase_end(key) if season_finished(key[1]) else None
+        return self._ends[key]
+
+    def record(self, unit: Unit, games: int):
+        key = unit.phase_key
+        counts = self._counts.setdefault(key, {})
+        counts[unit.round] = games
+        if self.end(key) is not None:
+            return
+        # El final es una jornada con partidos seguida de PHASE_END_EMPTY_ROUNDS
+        # vacías; la recién terminada puede ser cualquiera de ellas
+        for last in range(unit.round - PHASE_END_EMPTY_ROUNDS, unit.round + 1):
+            empty = range(last + 1, last + 1 + PHASE_END_EMPTY_ROUNDS)
+            if counts.get(last) and all(counts.get(round_num) == 0 for round_num in empty):
+                self._ends[key] = last
+                if season_finished(unit.season):
+                    self.checkpoint.save_phase_end(key, last)
+                return
+
+
+def fetch_unit(unit: Unit) -> Games:
+    """Partidos en crudo de una unidad. Un 404 es una temporada o fase que no existe"""
+    response = http_client.get(feeds_games_url(unit.round, unit.competition, unit.season_code, unit.phase),
+                               timeout=30)
+    if response.status_code == 404:
+        return []
+    response.raise_for_status()
+    return json_codec.loads(response.content).get('data', [])
+
+
+def run_backfill(units: Sequence[Unit], checkpoint: Checkpoint,
+                 fetch: Callable[[Unit], Games] = fetch_unit, jobs: int = DEFAULT_JOBS,
+                 rate_per_second: float = DEFAULT_RATE_PER_SECOND,
+                 progress: Optional[Callable[[BackfillStats, int], None]] = None) -> BackfillStats:
+    """
+    Descarga las unidades pendientes con `jobs` peticiones en vuelo. Las
+    unidades se encolan a medida que hay hueco para poder saltar las
+    jornadas posteriores al final de una fase en cuanto se detecta.
+    """
+    stats = BackfillStats()
+    tracker = PhaseTracker(checkpoint)
+    bucket = TokenBucket(rate_per_second, DEFAULT_BURST)
+    start = time.perf_counter()
+
+    def work(unit: Unit) -> Games:
+        bucket.acquire()
+        return fetch(unit)
+
+    queue = iter(units)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        running = {}
+        while True:
+            while len(running) < jobs:
+                unit = next(queue, None)
+                if unit is None:
+                    break
+                end = tracker.end(unit.phase_key)
+                if end is not None and unit.round > end:
+                    stats.beyond_end += 1
+                    continue
+                games = checkpoint.load(unit)
+                if games is not None and is_final(unit, games):
+                    stats.resumed += 1
+                    tracker.record(unit, len(games))
+                    continue
+                running[executor.submit(work, unit)] = unit
+
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                unit = running.pop(future)
+                try:
+                    games = future.result()
+                except Exception as e:
+                    stats.failed.append((unit, str(e)))
+                    INCOMPLETE.record("unidad", str(unit), str(e))
+                    continue
+                # Una jornada vacía de la temporada en curso puede llenarse más adelante
+                if games or season_finished(unit.season):
+                    checkpoint.save(unit, games)
+                tracker.record(unit, len(games))
+                stats.fetched += 1
+                stats.games += len(games)
+                if progress:
+                    progress(stats, len(units))
+
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def season_games(checkpoint: Checkpoint, competition: str, season: int, phases: Iterable[str]) -> Games:
+    """Partidos de una temporada en el formato de static_data.json, sin duplicados"""
+    store = GameStore()
+    for phase in phases:
+        for round_num, games in checkpoint.rounds((competition, season, phase)):
+            for game in games:
+                converted = feeds_game_to_game(game, round_num, f"{competition}{season}")
+                if not game.get('phaseType'):
+                    converted["phaseType"] = phase
+                store.add(converted)
+    return store.to_list()
+
+
+def write_season_outputs(games: Games, competition: str, season: int, output_dir: str = DEFAULT_OUTPUT_DIR,
+                         output_format: str = FORMAT_PRETTY, gzip_copy: bool = False) -> List[str]:
+    """Calendario (StaticMatchesData) y clasificación de fase regular de una temporada"""
+    label = season_label(season)
+    suffix = label.replace("-", "_")
+    season_code = f"{competition}{season}"
+    directory = os.path.join(output_dir, competition)
+
+    matches = sorted((static_match(game, season_code) for game in games), key=lambda m: (m["dateTime"], m["id"]))
+    regular = [game for game in games if game.get("phaseType") == PHASE_REGULAR_SEASON]
+    matches_data = {
+        "version": f"{label}-v1.0",
+        "lastUpdated": datetime.now().isoformat(),
+        "season": label,
+        "competition": competition,
+        "totalRounds": max((game.get("round", 0) for game in regular), default=0),
+        "description": f"Calendario completo {COMPETITIONS.get(competition, competition)} {label}",
+        "matches": matches,
+    }
+    matches_file = os.path.join(directory, f"matches_calendar_{suffix}.json")
+    written = write_asset(matches_file, matches_data, output_format, list_key="matches",
+                          dict_fields=MATCH_TEAM_FIELDS, gzip_copy=gzip_copy)
+
+    standings_file = os.path.join(directory, f"standings_{suffix}.json")
+    write_standings_asset(standings_file, compute_standings(regular), label, output_format, gzip_copy)
+    return written + [standings_file]
+
+
+def print_progress(stats: BackfillStats, total: int):
+    if stats.fetched % 50 == 0:
+        print(f"   📥 {stats.fetched} unidades descargadas ({stats.games} partidos)...")
+
+
+def print_backfill_summary(stats: BackfillStats, total: int):
+    print(f"\n📊 Backfill: {total} unidades planificadas")
+    print(f"   📥 {stats.fetched} descargadas ({stats.games} partidos) en {stats.elapsed:.1f}s")
+    print(f"   ⏸️ {stats.resumed} ya estaban en el checkpoint")
+    print(f"   ⏭️ {stats.beyond_end} omitidas tras el final de su fase")
+    if stats.failed:
+        print(f"   ❌ {len(stats.failed)} fallidas (se reintentarán al reanudar):")
+        for unit, error in stats.failed[:10]:
+            print(f"      {unit}: {error}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Backfill histórico con checkpoints reanudables")
+    parser.add_argument('--competitions', nargs='+', choices=list(COMPETITIONS), default=["E"],
+                        help='Competiciones (E = EuroLeague, U = EuroCup)')
+    parser.add_argument('--seasons', nargs='+', default=[str(DEFAULT_SEASON)],
+                        help='Años de inicio o rangos: 2019, 2000-2025, E2000-E2025')
+    parser.add_argument('--phases', nargs='+', choices=PHASES, default=list(PHASES), help='Fases')
+    parser.add_argument('--max-round', type=int, default=None,
+                        help='Última jornada a sondear por fase (por defecto según la fase)')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS, help='Peticiones en vuelo')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE_PER_SECOND, help='Peticiones por segundo')
+    parser.add_argument('--checkpoint-dir', default=DEFAULT_CHECKPOINT_DIR, help='Carpeta de checkpoints')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR, help='Carpeta de salida por temporada')
+    parser.add_argument('--reset', action='store_true', help='Borrar los checkpoints del rango y empezar de cero')
+    add_format_arguments(parser)
+    args = parser.parse_args()
+
+    seasons = parse_seasons(args.seasons)
+    units = plan_units(args.competitions, seasons, args.phases, args.max_round)
+    checkpoint = Checkpoint(args.checkpoint_dir)
+    if args.reset:
+        checkpoint.reset({unit.phase_key for unit in units})
+
+    print(f"🏛️ Backfill {', '.join(args.competitions)} | temporadas {season_label(seasons[0])} → "
+          f"{season_label(seasons[-1])} | fases {', '.join(args.phases)}")
+    print(f"⚡ {args.jobs} peticiones en vuelo, máx. {args.rate:.1f} req/s | checkpoints en {args.checkpoint_dir}")
+
+    with span("fetch.backfill", units=len(units)):
+        stats = run_backfill(units, checkpoint, jobs=args.jobs, rate_per_second=args.rate,
+                             progress=print_progress)
+    print_backfill_summary(stats, len(units))
+
+    failed_seasons = {(unit.competition, unit.season) for unit, _ in stats.failed}
+    print("\n💾 Salidas por temporada:")
+    for competition in args.competitions:
+        for season in seasons:
+            if (competition, season) in failed_seasons:
+                print(f"   ⚠️ {competition}{season}: incompleta, se escribirá al reanudar")
+                continue
+            games = season_games(checkpoint, competition, season, args.phases)
+            if not games:
+                print(f"   ⏳ {competition}{season}: sin partidos")
+                continue
+            with span("write.season", season=f"{competition}{season}"):
+                write_season_outputs(games, competition, season, args.output_dir, args.format, args.gzip)
+            print(f"   ✅ {competition}{season}: {len(games)} partidos → "
+                  f"{os.path.relpath(os.path.join(args.output_dir, competition))}")
+
+    http_client.print_connection_stats()
+    INCOMPLETE.print_report()
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    with run_report("backfill"):
+        sys.exit(main())
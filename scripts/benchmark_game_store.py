@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de deduplicación de partidos.
+
+Compara el GameStore indexado por id con el escaneo lineal que usaba
+fetch_all_matches (`any(g.get('id') == ...)`) y comprueba que el coste por
+partido se mantiene constante a partir de 10k partidos.
+
+Uso:
+    python3 scripts/benchmark_game_store.py
+"""
+
+import sys
+import time
+from typing import Any, Dict, List
+
+from game_store import GameStore
+
+STATUSES = ["confirmed", "live", "result"]
+
+
+def synthetic_games(count: int) -> List[Dict[str, Any]]:
+    """Genera partidos sintéticos con ~25% de ids repetidos"""
+    unique = max(1, int(count * 0.75))
+    games = []
+    for i in range(count):
+        game_id = i % unique
+        games.append({
+            "id": f"game-{game_id}",
+            "status": STATUSES[i % len(STATUSES)],
+            "home": {"code": "MAD", "score": i % 100},
+            "away": {"code": "BAR", "score": (i * 7) % 100},
+        })
+    return games
+
+
+def dedupe_linear(games: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Implementación original: escaneo lineal por partido"""
+    all_games = []
+    for game in games:
+        if not any(g.get('id') == game.get('id') for g in all_games):
+            all_games.append(game)
+    return all_games
+
+
+def dedupe_store(games: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    store = GameStore()
+    store.add_many(games)
+    return store.to_list()
+
+
+def measure(func, games: List[Dict[str, Any]], repeat: int = 3) -> float:
+    """Devuelve el mejor tiempo de `repeat` ejecuciones en segundos"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(games)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print("⏱️ Benchmark de deduplicación de partidos")
+    print("=" * 60)
+    print(f"{'Partidos':>10} | {'GameStore':>12} | {'ns/partido':>10} | {'Escaneo lineal':>14}")
+
+    per_game = {}
+    for count in (1_000, 2_500, 10_000, 40_000, 160_000):
+        games = synthetic_games(count)
+        store_time = measure(dedupe_store, games)
+        per_game[count] = store_time / count * 1e9
+
+        # El escaneo lineal solo se mide en tamaños pequeños (es cuadrático)
+        if count <= 2_500:
+            linear = f"{measure(dedupe_linear, games, repeat=1) * 1000:11.1f} ms"
+        else:
+            linear = f"{'(omitido)':>14}"
+
+        print(f"{count:>10} | {store_time * 1000:9.2f} ms | {per_game[count]:10.0f} | {linear}")
+
+    # Coste por partido constante: 160k no debe costar más de 3x por partido que 10k
+    ratio = per_game[160_000] / per_game[10_000]
+    print("=" * 60)
+    print(f"📈 Coste por partido 160k/10k: {ratio:.2f}x")
+
+    if ratio > 3.0:
+        print("❌ La deduplicación no escala en tiempo constante por partido")
+        return False
+
+    print("✅ Deduplicación en tiempo constante por partido")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Benchmark del normalizador de partidos.
+
+Compara, con 100k partidos sintéticos de la API de feeds, la conversión
+original a diccionarios (cadenas de .get anidadas y datetime.fromisoformat
+por partido, como hacía feeds_game_to_game) con el normalizador compilado:
+
+- registros: from_feed_game → GameRecord (lo que se guarda en memoria)
+- registros + vista: to_static_data_game(from_feed_game(...)), la salida
+  de static_data.json
+
+Mide partidos por segundo y memoria retenida por partido (tracemalloc), y
+comprueba que ambas conversiones producen exactamente la misma salida.
+
+Uso:
+    python3 scripts/benchmark_normalizer.py
+    python3 scripts/benchmark_normalizer.py --games 20000
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+import game_normalizer
+from game_normalizer import from_feed_game, to_static_data_game
+
+TEAMS = ["ASV", "BAR", "BAS", "MAD", "MCO", "MIL", "MUN", "OLY", "PAM", "PAN",
+         "PAR", "PRS", "RED", "TEL", "ULK", "VIR", "ZAL", "HTA", "DUB", "IST"]
+STATUSES = ["confirmed", "live", "result"]
+TIP_OFFS = [timedelta(hours=h, minutes=m) for h, m in ((17, 45), (18, 0), (20, 0), (20, 0), (20, 30))]
+
+
+def synthetic_feed_games(count: int) -> List[Dict[str, Any]]:
+    """
+    Partidos con la estructura de la API de feeds: temporadas de 38 jornadas
+    de 10 partidos repartidos en dos días y cinco horarios, como el calendario
+    real (100k partidos son ~260 temporadas, casi todas las fechas distintas)
+    """
+    games = []
+    for i in range(count):
+        season, index = divmod(i, 380)
+        round_num, slot = divmod(index, 10)
+        home, away = TEAMS[slot * 2], TEAMS[(slot * 2 + round_num + 1) % 20]
+        tip_off = (datetime(2000 + season % 26, 10, 1) + timedelta(days=round_num * 7 + slot // 5)
+                   + TIP_OFFS[slot % 5] + timedelta(minutes=season // 26))
+        games.append({
+            "id": f"game-{i:06d}",
+            "code": index + 1,
+            "status": STATUSES[i % 3],
+            "date": tip_off.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "home": {"code": home, "name": f"Club {home}", "score": 60 + i % 40},
+            "away": {"code": away, "name": f"Club {away}", "score": 60 + (i * 7) % 40},
+            "venue": {"name": f"Arena {home}", "capacity": 10000 + slot * 500, "code": f"V{home}",
+                      "address": f"Calle {home}"},
+            "round": {"round": round_num + 1},
+            "phaseType": {"code": "RS"},
+            "season": {"code": f"E{2000 + season % 26}"},
+        })
+    return games
+
+
+def dict_game(game: Dict[str, Any], round_num: int, season_code: str = "E2025") -> Dict[str, Any]:
+    """Conversión original a diccionario (referencia)"""
+    date_str = game.get('date', '')
+    formatted_date = ""
+    if date_str:
+        try:
+            dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+            formatted_date = dt.strftime('%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            formatted_date = date_str
+
+    return {
+        "id": game.get('id', ''),
+        "homeTeamId": game.get('home', {}).get('code', ''),
+        "awayTeamId": game.get('away', {}).get('code', ''),
+        "homeTeamName": game.get('home', {}).get('name', ''),
+        "awayTeamName": game.get('away', {}).get('name', ''),
+        "date": formatted_date,
+        "round": game.get('round', {}).get('round', round_num),
+        "homeScore": game.get('home', {}).get('score', 0),
+        "awayScore": game.get('away', {}).get('score', 0),
+        "status": game.get('status', 'scheduled'),
+        "venue": game.get('venue', {}).get('name', ''),
+        "venueCapacity": game.get('venue', {}).get('capacity', 0),
+        "venueCode": game.get('venue', {}).get('code', ''),
+        "gameCode": game.get('code', 0),
+        "phaseType": game.get('phaseType', {}).get('code', 'RS'),
+        "season": game.get('season', {}).get('code', season_code),
+    }
+
+
+def convert_dicts(games: List[Dict[str, Any]]) -> List[Any]:
+    return [dict_game(game, 1) for game in games]
+
+
+def convert_records(games: List[Dict[str, Any]]) -> List[Any]:
+    return [from_feed_game(game, 1, "E2025") for game in games]
+
+
+def convert_records_view(games: List[Dict[str, Any]]) -> List[Any]:
+    return [to_static_data_game(from_feed_game(game, 1, "E2025")) for game in games]
+
+
+def clear_date_cache():
+    game_normalizer.feed_dates.cache_clear()
+
+
+def measure(convert: Callable[[List[Dict[str, Any]]], List[Any]], games: List[Dict[str, Any]],
+            repeat: int = 3) -> Tuple[float, float]:
+    """
+    (mejor tiempo en segundos, bytes retenidos por partido). Como timeit, se
+    mide sin el recolector: con 100k partidos retenidos sus pasadas dominan
+    el tiempo y lo hacen muy variable.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        clear_date_cache()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            convert(games)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+
+    clear_date_cache()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = convert(games)
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del result
+    return best, retained / len(games)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark del normalizador de partidos")
+    parser.add_argument('--games', type=int, default=100_000, help='Partidos sintéticos')
+    args = parser.parse_args()
+
+    games = synthetic_feed_games(args.games)
+    print(f"⏱️ Benchmark del normalizador ({args.games:,} partidos sintéticos)")
+    print("=" * 72)
+
+    identical = json.dumps(convert_dicts(games)) == json.dumps(convert_records_view(games))
+    print(f"{'✅' if identical else '❌'} Salida de static_data.json idéntica a la conversión original")
+
+    print(f"\n{'Conversión':<22} | {'Tiempo':>9} | {'partidos/s':>11} | {'bytes/partido':>13}")
+    results = {}
+    for label, convert in (("dict (original)", convert_dicts),
+                           ("GameRecord", convert_records),
+                           ("GameRecord + vista", convert_records_view)):
+        elapsed, per_game = measure(convert, games)
+        results[label] = (elapsed, per_game)
+        print(f"{label:<22} | {elapsed * 1000:6.1f} ms | {args.games / elapsed:11,.0f} | {per_game:13,.0f}")
+
+    base_time, base_memory = results["dict (original)"]
+    record_time, record_memory = results["GameRecord"]
+    view_time, _ = results["GameRecord + vista"]
+    print(f"\n🚀 Registros: {base_time / record_time:.1f}x más rápido, "
+          f"{base_memory / record_memory:.1f}x menos memoria por partido")
+    print(f"🚀 Registros + vista: {base_time / view_time:.1f}x frente a la conversión original")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Benchmark de extremo a extremo del pipeline con umbrales de regresión.
+
+Cada etapa se ejecuta en un proceso nuevo (para medir su pico de RSS sin
+arrastrar el de las anteriores) contra el servidor de reproducción de
+replay.py, sin red:
+
+- round_fetch: extract_all_games_from_feeds_api (38 jornadas; el token bucket
+  se abre a BENCHMARK_RATE_PER_SECOND para medir el código y no el limitador)
+- fetch_all_matches: EuroLeagueDataPopulator.fetch_all_matches (incluye la
+  conversión a StaticMatch)
+- transform: game_to_static_match sobre los partidos en crudo
+- dedupe: GameStore con ~25% de partidos repetidos
+- serialize: write_asset del calendario en pretty, minified y columnar
+- logos: optimize_image de 20 escudos (no depende del tamaño de la temporada)
+
+Los datos son sintéticos y se escalan a 1×, 10× y 100× una temporada (10
+partidos por jornada en 1×); con --fixtures se usan además las respuestas
+grabadas con `replay.py record` para las etapas de red en 1×.
+
+Para cada etapa se guarda tiempo de reloj, pico de RSS, número de
+peticiones HTTP y elementos producidos. Para que tiempo y memoria se puedan
+comparar entre máquinas, cada proceso hijo ejecuta antes una calibración
+(una carga fija de CPU en Python puro) y se guardan además:
+
+- wall_rel: mejor tiempo de STAGE_RUNS ejecuciones de la etapa en unidades de
+  calibración
+- rss_growth_mb: pico de RSS por encima del que tiene el proceso al empezar
+  (el intérprete no cuenta)
+
+Con --update-baseline se escriben en scripts/benchmark_baseline.json; sin él
+se comparan con esa línea base y el script falla si alguna etapa empeora más
+de la tolerancia:
+
+- tiempo relativo: +50% y al menos +1 unidad de calibración
+- crecimiento de RSS: +25% y al menos +10 MB
+- peticiones: cualquier aumento
+- elementos: cualquier diferencia
+
+La línea base del repositorio lleva solo estas métricas portables
+(--update-baseline --portable). Tiempo (+25%, +50 ms) y RSS absolutos
+(+20%, +10 MB) se comparan además cuando la línea base los incluye, tras un
+--update-baseline en la propia máquina. Sin línea base el script falla.
+
+Uso:
+    python3 scripts/benchmark_pipeline.py [--scales 1 10 100] [--update-baseline [--portable]]
+"""
+
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(SCRIPT_DIR, "benchmark_baseline.json")
+
+DEFAULT_SCALES = (1, 10, 100)
+GAMES_PER_ROUND = 10
+TOTAL_ROUNDS = 38
+LOGO_COUNT = 20
+
+FEEDS_GAMES_URL = "https://feeds.incrowdsports.com/provider/euroleague-feeds/v2/competitions/E/seasons/E2025/games"
+ROUND_NUMBER_URL = FEEDS_GAMES_URL + "?teamCode=&phaseTypeCode=RS&roundNumber={round}"
+
+WALL_TOLERANCE = 0.25
+WALL_SLACK_S = 0.05
+RSS_TOLERANCE = 0.20
+RSS_SLACK_MB = 10.0
+# Umbrales de las métricas portables: más anchos, porque la proporción entre
+# etapa y calibración varía algo de una máquina a otra
+WALL_REL_TOLERANCE = 0.50
+WALL_REL_SLACK = 1.0
+RSS_GROWTH_TOLERANCE = 0.25
+RSS_GROWTH_SLACK_MB = 10.0
+
+# Lista pequeña recorrida varias veces: la calibración dura ~0.1 s pero apenas
+# sube el pico de RSS, que así no tapa el de las etapas pequeñas
+CALIBRATION_GAMES = 2_000
+CALIBRATION_ROUNDS = 10
+CALIBRATION_REPEAT = 3
+# Ejecuciones de cada etapa para el tiempo relativo (tiempo, RSS y
+# peticiones absolutos son los de la primera)
+STAGE_RUNS = 3
+
+NETWORK_STAGES = ("round_fetch", "fetch_all_matches")
+# Límite de peticiones por segundo de round_fetch: muy por encima de lo que
+# sirve el replay, para que el token bucket no domine la medida
+BENCHMARK_RATE_PER_SECOND = 10_000.0
+# Métricas que no dependen de la máquina (las únicas de la línea base versionada)
+PORTABLE_METRICS = ("requests", "items", "wall_rel", "rss_growth_mb")
+
+
+def synthetic_round(round_num: int, scale: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """Partidos en crudo de una jornada con el formato de la API de feeds"""
+    games = []
+    for i in range(GAMES_PER_ROUND * scale):
+        home, away = f"T{(2 * i) % 20:02d}", f"T{(2 * i + 1) % 20:02d}"
+        finished = round_num <= TOTAL_ROUNDS // 2
+        games.append({
+            "id": f"E2025-{round_num:02d}-{i:05d}",
+            "code": round_num * 1000 + i,
+            "date": f"2025-{10 + round_num // 13:02d}-{1 + round_num % 28:02d}T{18 + i % 3}:00:00.000Z",
+            "status": "result" if finished else "confirmed",
+            "home": {"code": home, "name": f"Team {home}", "score": rng.randint(60, 105) if finished else 0},
+            "away": {"code": away, "name": f"Team {away}", "score": rng.randint(60, 105) if finished else 0},
+            "venue": {"name": f"Arena {home}", "capacity": 10000 + i, "code": f"V{home}", "address": "City"},
+            "round": {"round": round_num},
+            "phaseType": {"code": "RS"},
+            "season": {"code": "E2025"},
+            "broadcasters": [{"name": "DAZN"}, "EuroLeague TV"],
+        })
+    return games
+
+
+def synthetic_season(scale: int) -> Dict[int, List[Dict[str, Any]]]:
+    rng = random.Random(scale)
+    return {round_num: synthetic_round(round_num, scale, rng) for round_num in range(1, TOTAL_ROUNDS + 1)}
+
+
+def write_fixtures(directory: str, season: Dict[int, List[Dict[str, Any]]]):
+    """Fixtures de las URLs que piden round_fetch y fetch_all_matches"""
+    from paginator import DEFAULT_PAGE_SIZE, FIRST_PAGE, page_url
+    from replay import FixtureStore
+
+    store = FixtureStore(directory)
+    headers = {"Content-Type": "application/json"}
+    # Las páginas crecen con la escala (metadata.pageSize) para que el número
+    # de peticiones sea el de una temporada real y no lo domine el token bucket
+    all_games = [game for games in season.values() for game in games]
+    page_size = DEFAULT_PAGE_SIZE * max(1, len(all_games) // (GAMES_PER_ROUND * TOTAL_ROUNDS))
+    for offset in range(0, len(all_games), page_size):
+        page_num = FIRST_PAGE + offset // page_size
+        page = {"data": all_games[offset:offset + page_size],
+                "metadata": {"totalItems": len(all_games), "pageSize": page_size}}
+        requested_size = DEFAULT_PAGE_SIZE if page_num == FIRST_PAGE else page_size
+        store.save(page_url(FEEDS_GAMES_URL, page_num, requested_size), 200, headers,
+                   json.dumps(page).encode('utf-8'))
+    for round_num, games in season.items():
+        body = json.dumps({"data": games}).encode('utf-8')
+        store.save(ROUND_NUMBER_URL.format(round=round_num), 200, headers, body)
+
+
+def _peak_rss_mb() -> float:
+    # En Linux ru_maxrss conserva tras exec el pico del proceso padre (el
+    # hijo spawn empezaría con el RSS del benchmark); VmHWM es el del propio
+    # proceso
+    try:
+        with open("/proc/self/status", 'r', encoding='ascii') as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo da en KB y macOS en bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def calibrate() -> float:
+    """
+    Unidad de tiempo de la máquina: mejor tiempo (s) de serializar, parsear y
+    ordenar una lista fija de partidos con json. Solo Python puro y json de la
+    biblioteca estándar, para que no dependa de los backends opcionales
+    """
+    rng = random.Random(0)
+    games = [{"id": f"E2025-{i:05d}", "home": f"T{i % 20:02d}", "score": rng.randint(60, 105)}
+             for i in range(CALIBRATION_GAMES)]
+    best = float('inf')
+    for _ in range(CALIBRATION_REPEAT):
+        start = time.perf_counter()
+        for _ in range(CALIBRATION_ROUNDS):
+            decoded = json.loads(json.dumps(games))
+            sorted(decoded, key=lambda game: (game["home"], -game["score"], game["id"]))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# --- Etapas (se ejecutan en el proceso hijo) ---------------------------------
+
+def stage_round_fetch(season: Dict[int, List[Dict[str, Any]]], workdir: str) -> int:
+    from populate_game_center_data import extract_all_games_from_feeds_api
+    return len(extract_all_games_from_feeds_api(rate_per_second=BENCHMARK_RATE_PER_SECOND))
+
+
+def stage_fetch_all_matches(season: Dict[int, List[Dict[str, Any]]], workdir: str) -> int:
+    from populate_static_data import EuroLeagueDataPopulator
+    return len(EuroLeagueDataPopulator().fetch_all_matches())
+
+
+def stage_transform(season: Dict[int, List[Dict[str, Any]]], workdir: str) -> int:
+    from populate_static_data import game_to_static_match
+    return len([game_to_static_match(game) for games in season.values() for game in games])
+
+
+def stage_dedupe(season: Dict[int, List[Dict[str, Any]]], workdir: str) -> int:
+    from game_store import GameStore
+    games = [game for games in season.values() for game in games]
+    store = GameStore()
+    store.add_many(games + games[::4])
+    return len(store)
+
+
+def stage_serialize(season: Dict[int, List[Dict[str, Any]]], workdir: str) -> int:
+    from asset_writer import FORMATS, MATCH_TEAM_FIELDS, write_asset
+    from populate_static_data import game_to_static_match
+    matches = [game_to_static_match(game) for games in season.values() for game in games]
+    data = {"version": "1.0", "season": "2025-26", "matches": matches}
+    for fmt in FORMATS:
+        write_asset(os.path.join(workdir, f"matches.{fmt}.json"), data, fmt,
+                    list_key="matches", dict_fields=MATCH_TEAM_FIELDS)
+    return len(matches)
+
+
+def stage_logos(season: Dict[int, List[Dict[str, Any]]], workdir: str) -> int:
+    from logo_optimizer import optimize_image
+    from logo_renderer import encode_image, render_logo
+    sources = [encode_image(render_logo(f"T{i:02d}", f"#{i * 12:02x}3060", "#FFFFFF", 256), "png")
+               for i in range(LOGO_COUNT)]
+    for content in sources:
+        optimize_image(content)
+    return len(sources)
+
+
+STAGES: Dict[str, Callable[[Dict[int, List[Dict[str, Any]]], str], int]] = {
+    "round_fetch": stage_round_fetch,
+    "fetch_all_matches": stage_fetch_all_matches,
+    "transform": stage_transform,
+    "dedupe": stage_dedupe,
+    "serialize": stage_serialize,
+    "logos": stage_logos,
+}
+
+
+def _child(stage: str, scale: int, use_recorded: bool, conn):
+    """Punto de entrada del proceso hijo: prepara datos, mide la etapa y devuelve métricas"""
+    sys.path.insert(0, SCRIPT_DIR)
+    try:
+        base_rss = _peak_rss_mb()
+        calibration = calibrate()
+        # Las etapas de red leen los datos del servidor de reproducción
+        season = {} if use_recorded or stage in NETWORK_STAGES else synthetic_season(scale)
+        import http_client
+
+        with tempfile.TemporaryDirectory() as workdir, redirect_stdout(io.StringIO()):
+            requests_before = http_client.CONNECTION_STATS.requests
+            start = time.perf_counter()
+            items = STAGES[stage](season, workdir)
+            wall = time.perf_counter() - start
+            requests_made = http_client.CONNECTION_STATS.requests - requests_before
+            rss = _peak_rss_mb()
+            # El tiempo relativo usa la mejor de varias ejecuciones (y de dos
+            # calibraciones, antes y después) para no depender del ruido
+            best = wall
+            for _ in range(STAGE_RUNS - 1):
+                start = time.perf_counter()
+                STAGES[stage](season, workdir)
+                best = min(best, time.perf_counter() - start)
+        calibration = min(calibration, calibrate())
+
+        conn.send({"wall_s": wall, "rss_mb": rss, "requests": requests_made, "items": items,
+                   "wall_rel": best / calibration, "rss_growth_mb": rss - base_rss,
+                   "calibration_s": calibration})
+    except Exception as e:
+        conn.send({"error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def run_stage(stage: str, scale: int, use_recorded: bool = False) -> Dict[str, Any]:
+    context = multiprocessing.get_context("spawn")
+    parent, child = context.Pipe(duplex=False)
+    process = context.Process(target=_child, args=(stage, scale, use_recorded, child))
+    process.start()
+    child.close()
+    result = parent.recv()
+    process.join()
+    return result
+
+
+def stage_label(stage: str, scale: int, recorded: bool = False) -> str:
+    return f"{stage}@{'recorded' if recorded else f'{scale}x'}"
+
+
+def plan(scales: List[int], stages: List[str], recorded_fixtures: Optional[str]) -> List[Tuple[str, int, bool]]:
+    runs = []
+    for scale in scales:
+        for stage in stages:
+            # Los logos no dependen del tamaño de la temporada
+            if stage == "logos" and scale != scales[0]:
+                continue
+            runs.append((stage, scale, False))
+    if recorded_fixtures:
+        runs.extend((stage, 1, True) for stage in stages if stage in NETWORK_STAGES)
+    return runs
+
+
+def check_regression(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Motivos por los que `current` empeora respecto a `baseline`"""
+    problems = []
+    if "wall_rel" in baseline:
+        rel_limit = max(baseline["wall_rel"] * (1 + WALL_REL_TOLERANCE), baseline["wall_rel"] + WALL_REL_SLACK)
+        if current["wall_rel"] > rel_limit:
+            problems.append(f"tiempo relativo {current['wall_rel']:.2f} > {rel_limit:.2f} calibraciones")
+    if "rss_growth_mb" in baseline:
+        growth_limit = max(baseline["rss_growth_mb"] * (1 + RSS_GROWTH_TOLERANCE),
+                           baseline["rss_growth_mb"] + RSS_GROWTH_SLACK_MB)
+        if current["rss_growth_mb"] > growth_limit:
+            problems.append(f"crecimiento de RSS {current['rss_growth_mb']:.1f} MB > {growth_limit:.1f} MB")
+    if "wall_s" in baseline:
+        wall_limit = max(baseline["wall_s"] * (1 + WALL_TOLERANCE), baseline["wall_s"] + WALL_SLACK_S)
+        if current["wall_s"] > wall_limit:
+            problems.append(f"tiempo {current['wall_s']:.3f}s > {wall_limit:.3f}s")
+    if "rss_mb" in baseline:
+        rss_limit = max(baseline["rss_mb"] * (1 + RSS_TOLERANCE), baseline["rss_mb"] + RSS_SLACK_MB)
+        if current["rss_mb"] > rss_limit:
+            problems.append(f"RSS {current['rss_mb']:.1f} MB > {rss_limit:.1f} MB")
+    if current["requests"] > baseline["requests"]:
+        problems.append(f"peticiones {current['requests']} > {baseline['requests']}")
+    if "items" in baseline and current["items"] != baseline["items"]:
+        problems.append(f"elementos {current['items']:,} != {baseline['items']:,}")
+    return problems
+
+
+def load_baseline(path: str = BASELINE_FILE) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get("stages", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(results: Dict[str, Dict[str, Any]], path: str = BASELINE_FILE, portable: bool = False):
+    """Guarda la línea base; con portable solo las métricas que no dependen de la máquina"""
+    from asset_writer import write_atomic
+
+    stages = {label: {key: round(value, 4) if isinstance(value, float) else value
+                      for key, value in metrics.items()
+                      if key != "calibration_s" and (not portable or key in PORTABLE_METRICS)}
+              for label, metrics in sorted(results.items()) if "error" not in metrics}
+    data = {"version": 3, "stages": stages}
+    if not portable:
+        data.update({"python": sys.version.split()[0], "platform": sys.platform})
+    write_atomic(path, (json.dumps(data, indent=2) + "\n").encode('utf-8'))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark del pipeline con umbrales de regresión")
+    parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES),
+                        help='Múltiplos de una temporada a medir')
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(STAGES),
+                        help='Etapas a medir')
+    parser.add_argument('--fixtures', help='Fixtures grabadas con replay.py record (etapas de red en 1×)')
+    parser.add_argument('--latency', type=float, default=0, help='Latencia simulada del servidor en ms')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='Fichero de línea base')
+    parser.add_argument('--update-baseline', action='store_true', help='Guardar los resultados como línea base')
+    parser.add_argument('--portable', action='store_true',
+                        help='Con --update-baseline, guardar solo las métricas portables (línea base versionada)')
+    args = parser.parse_args()
+
+    baseline = {} if args.update_baseline else load_baseline(args.baseline)
+    print("⏱️ Benchmark del pipeline")
+    print("=" * 96)
+    print(f"   {'Etapa':<28} {'Elementos':>9} {'Tiempo':>9} {'Relativo':>9} {'RSS':>9} {'ΔRSS':>9} {'Peticiones':>10}")
+
+    results: Dict[str, Dict[str, Any]] = {}
+    regressions = 0
+    with tempfile.TemporaryDirectory() as synthetic_dir:
+        # Los hijos (spawn) heredan el entorno: todas las peticiones van al replay
+        os.environ.update({
+            "EUROLEAGUE_HTTP_MODE": "replay",
+            "EUROLEAGUE_HTTP_CACHE": "0",
+            "EUROLEAGUE_REPLAY_LATENCY_MS": str(args.latency),
+        })
+        current_scale = None
+        for stage, scale, recorded in plan(args.scales, args.stages, args.fixtures):
+            fixtures_dir = args.fixtures if recorded else os.path.join(synthetic_dir, f"{scale}x")
+            if not recorded and stage in NETWORK_STAGES and scale != current_scale:
+                write_fixtures(fixtures_dir, synthetic_season(scale))
+                current_scale = scale
+            os.environ["EUROLEAGUE_FIXTURES"] = fixtures_dir
+
+            label = stage_label(stage, scale, recorded)
+            metrics = run_stage(stage, scale, recorded)
+            results[label] = metrics
+            if "error" in metrics:
+                print(f"   {label:<28} ❌ {metrics['error']}")
+                regressions += 1
+                continue
+
+            problems = check_regression(metrics, baseline[label]) if label in baseline else []
+            mark = "❌" if problems else ("✅" if label in baseline else "🆕")
+            print(f"   {label:<28} {metrics['items']:>9,} {metrics['wall_s']:>8.3f}s {metrics['wall_rel']:>8.2f}x "
+                  f"{metrics['rss_mb']:>6.1f} MB {metrics['rss_growth_mb']:>6.1f} MB {metrics['requests']:>10} {mark}")
+            for problem in problems:
+                print(f"      ↳ {problem}")
+            regressions += bool(problems)
+
+    print("=" * 96)
+    if args.update_baseline:
+        save_baseline(results, args.baseline, args.portable)
+        print(f"💾 Línea base guardada en {os.path.relpath(args.baseline)}")
+        return 0 if not regressions else 1
+
+    if not baseline:
+        print(f"❌ Sin línea base en {os.path.relpath(args.baseline)}: ejecuta con --update-baseline para guardarla")
+        return 1
+    if regressions:
+        print(f"❌ {regressions} etapas empeoran respecto a la línea base")
+        return 1
+    print("✅ Sin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark del cálculo de clasificación.
+
+Mide el cálculo completo de una temporada (380 partidos), la actualización
+incremental de un partido y el cálculo por temporadas de un histórico, y
+comprueba que una temporada completa (cálculo y filas) se resuelve en menos
+de 1 ms. El límite se aplica a la mediana de muchas ejecuciones, con un margen
+para el ruido de la máquina, de modo que una ejecución lenta aislada no lo
+hace fallar.
+
+Uso:
+    python3 scripts/benchmark_standings.py
+"""
+
+import random
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+import standings
+from standings import StandingsTable, compute_by_season, compute_standings
+
+TEAMS = 20
+SEASON_BUDGET_MS = 1.0
+# Tolerancia sobre el objetivo antes de dar el benchmark por fallido
+NOISE_MARGIN = 0.25
+GATE_RUNS = 201
+
+
+def synthetic_season(season: str, rng: random.Random, teams: int = TEAMS) -> List[Dict[str, Any]]:
+    """Liga a doble vuelta: cada equipo juega contra todos en casa y fuera"""
+    codes = [f"T{i:02d}" for i in range(teams)]
+    games = []
+    for home in codes:
+        for away in codes:
+            if home == away:
+                continue
+            home_score = rng.randint(60, 105)
+            away_score = rng.randint(60, 105)
+            if home_score == away_score:
+                home_score += 1
+            games.append({
+                "id": f"{season}-{home}-{away}",
+                "season": season,
+                "homeTeamId": home,
+                "awayTeamId": away,
+                "homeScore": home_score,
+                "awayScore": away_score,
+                "status": "result",
+            })
+    return games
+
+
+def measure(func, repeat: int = 50) -> float:
+    """Mejor tiempo de `repeat` ejecuciones en milisegundos"""
+    return min(timings(func, repeat))
+
+
+def timings(func, repeat: int) -> List[float]:
+    """Tiempo de cada una de `repeat` ejecuciones en milisegundos"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    backend = "NumPy" if standings.np is not None else "listas (sin NumPy)"
+    print(f"⏱️ Benchmark de clasificación ({backend})")
+    print("=" * 60)
+
+    rng = random.Random(2025)
+    season = synthetic_season("E2025", rng)
+
+    compute_ms = measure(lambda: compute_standings(season))
+    table = compute_standings(season)
+    ranking_ms = measure(table.rows)
+    print(f"📊 Temporada completa ({len(season)} partidos): cálculo {compute_ms:.3f} ms, "
+          f"orden+filas {ranking_ms:.3f} ms")
+
+    incremental = StandingsTable()
+    start = time.perf_counter()
+    for game in season:
+        incremental.apply_game(game)
+    per_game_us = (time.perf_counter() - start) / len(season) * 1e6
+    print(f"➕ Actualización incremental: {per_game_us:.1f} µs por partido")
+
+    if incremental.rows() != table.rows():
+        print("❌ La actualización incremental no coincide con el cálculo completo")
+        return False
+
+    for seasons in (10, 50):
+        history = []
+        for i in range(seasons):
+            history.extend(synthetic_season(f"E{2000 + i}", rng))
+        history_ms = measure(lambda: compute_by_season(history), repeat=5)
+        print(f"📚 Histórico de {seasons} temporadas ({len(history)} partidos): {history_ms:.2f} ms "
+              f"({history_ms / seasons:.3f} ms/temporada)")
+
+    samples = timings(lambda: compute_standings(season).rows(), GATE_RUNS)
+    median_ms = statistics.median(samples)
+    limit_ms = SEASON_BUDGET_MS * (1 + NOISE_MARGIN)
+    print("=" * 60)
+    print(f"⏱️ Temporada completa, {GATE_RUNS} ejecuciones: mediana {median_ms:.3f} ms "
+          f"(mejor {min(samples):.3f} ms, p90 {statistics.quantiles(samples, n=10)[-1]:.3f} ms)")
+    if median_ms > limit_ms:
+        print(f"❌ La mediana supera {limit_ms:.2f} ms (objetivo < {SEASON_BUDGET_MS} ms "
+              f"+ {NOISE_MARGIN:.0%} de margen)")
+        return False
+
+    if median_ms > SEASON_BUDGET_MS:
+        print(f"⚠️ Por encima del objetivo de {SEASON_BUDGET_MS} ms, dentro del margen de ruido")
+    else:
+        print(f"✅ Temporada completa en {median_ms:.3f} ms de mediana")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -3,75 +3,32 @@
 Script para crear logos simples con iniciales de equipos como assets locales
 """
 
-import json
+import argparse
 import os
 import sys
-from PIL import Image, ImageDraw, ImageFont
+import time
+
+from logo_atlas import DEFAULT_PADDING, add_atlas_arguments, build_logo_atlas
+from logo_renderer import VARIANTS_DIR, print_render_summary, render_logo, render_logos, spec_from_team
+from teams_asset import TEAMS_FILE, load_teams, patch_teams
+from telemetry import run_report, span
 
 def create_team_logo(team_code, team_name, primary_color="#000000", secondary_color="#FFFFFF", size=128):
     """Crea un logo simple con las iniciales del equipo"""
     try:
-        # Crear imagen
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        # Convertir colores hex a RGB
-        if primary_color.startswith('#'):
-            primary_rgb = tuple(int(primary_color[i:i+2], 16) for i in (1, 3, 5))
-        else:
-            primary_rgb = (0, 0, 0)
-            
-        if secondary_color.startswith('#'):
-            secondary_rgb = tuple(int(secondary_color[i:i+2], 16) for i in (1, 3, 5))
-        else:
-            secondary_rgb = (255, 255, 255)
-        
-        # Dibujar círculo de fondo
-        margin = 8
-        draw.ellipse([margin, margin, size-margin, size-margin], fill=primary_rgb)
-        
-        # Obtener iniciales (máximo 3 caracteres)
-        initials = team_code[:3] if len(team_code) <= 3 else team_code[:2]
-        
-        # Calcular tamaño de fuente
-        font_size = max(20, size // 4)
-        
-        # Intentar usar fuente del sistema, si no usar la por defecto
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", font_size)
-        except:
-            try:
-                font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", font_size)
-            except:
-                font = ImageFont.load_default()
-        
-        # Calcular posición del texto centrado
-        bbox = draw.textbbox((0, 0), initials, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        
-        x = (size - text_width) // 2
-        y = (size - text_height) // 2 - 2  # Ajuste visual
-        
-        # Dibujar texto
-        draw.text((x, y), initials, fill=secondary_rgb, font=font)
-        
-        return img
-        
+        return render_logo(team_code, primary_color, secondary_color, size)
     except Exception as e:
         print(f"❌ Error creando logo para {team_code}: {e}")
         return None
 
-def main():
+def main(atlas=False, atlas_padding=DEFAULT_PADDING, power_of_two=True):
     print("🎨 Creando logos simples con iniciales de equipos...")
     
     # Rutas
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(script_dir)
     assets_dir = os.path.join(project_root, "app", "src", "main", "assets")
-    static_data_dir = os.path.join(assets_dir, "static_data")
     logos_dir = os.path.join(assets_dir, "team_logos")
-    teams_file = os.path.join(static_data_dir, "teams_2025_26.json")
     
     # Crear directorio para logos
     os.makedirs(logos_dir, exist_ok=True)
@@ -79,53 +36,38 @@ def main():
     
     # Cargar datos de equipos
     print("📥 Cargando datos de equipos...")
-    with open(teams_file, 'r', encoding='utf-8') as f:
-        teams_data = json.load(f)
+    teams = load_teams(TEAMS_FILE)
     
-    # Crear logos para cada equipo
+    # Crear logos para cada equipo (en paralelo, todas las densidades, PNG y WebP)
     print("🎨 Creando logos...")
-    created_logos = {}
+    start = time.perf_counter()
+    with span("transform.render_logos", teams=len(teams)):
+        results = render_logos([spec_from_team(team) for team in teams], logos_dir)
     
-    for team in teams_data['teams']:
-        team_code = team.get('code', team.get('id', ''))
-        team_name = team.get('name', '')
-        primary_color = team.get('primaryColor', '#000000')
-        secondary_color = team.get('secondaryColor', '#FFFFFF')
-        
-        print(f"🎨 Creando logo para {team_name} ({team_code})...")
-        
-        # Crear logo
-        logo_img = create_team_logo(team_code, team_name, primary_color, secondary_color)
+    created_logos = {}
+    for result in results:
+        filename = f"{result.code.lower()}_logo.png"
+        if result.error:
+            print(f"❌ {result.code}: Error creando logo ({result.error})")
+            continue
         
-        if logo_img:
-            # Guardar imagen
-            filename = f"{team_code.lower()}_logo.png"
-            filepath = os.path.join(logos_dir, filename)
-            logo_img.save(filepath, 'PNG')
-            
-            # Ruta para Android
-            android_path = f"file:///android_asset/team_logos/{filename}"
-            created_logos[team_code] = android_path
-            print(f"✅ {team_code}: {filename}")
-        else:
-            print(f"❌ {team_code}: Error creando logo")
+        # Ruta para Android
+        created_logos[result.code] = f"file:///android_asset/team_logos/{filename}"
+        mark = "⏸️ sin cambios" if result.skipped else f"{result.written} ficheros escritos"
+        print(f"✅ {result.code}: {filename} ({mark})")
+    print_render_summary(results, time.perf_counter() - start)
     
-    # Actualizar URLs de logos
-    print("\n📝 Actualizando datos de equipos...")
-    updated_count = 0
-    for team in teams_data['teams']:
-        team_code = team.get('code', team.get('id', ''))
-        
-        if team_code in created_logos:
-            old_logo = team.get('logoUrl', '')
-            team['logoUrl'] = created_logos[team_code]
-            if old_logo != team['logoUrl']:
-                updated_count += 1
-                print(f"✅ {team['name']}: Logo local asignado")
+    if atlas and created_logos:
+        with span("write.atlas"):
+            build_logo_atlas(logos_dir, list(created_logos), atlas_padding, power_of_two)
     
-    # Guardar datos actualizados
-    with open(teams_file, 'w', encoding='utf-8') as f:
-        json.dump(teams_data, f, ensure_ascii=False, indent=2)
+    # Actualizar URLs de logos (una sola lectura/escritura)
+    print("\n📝 Actualizando datos de equipos...")
+    with span("write.teams"):
+        result = patch_teams({code: {"logoUrl": path} for code, path in created_logos.items()}, TEAMS_FILE)
+    for team, _ in result.updated:
+        print(f"✅ {team['name']}: Logo local asignado")
+    updated_count = result.updated_count
     
     print("\n" + "=" * 60)
     print("✅ LOGOS CREADOS Y CONFIGURADOS")
@@ -142,6 +84,8 @@ def main():
     
     print(f"\n🎯 Características:")
     print(f"   🎨 Logos con iniciales del equipo")
+    print(f"   📐 Densidades mdpi → xxxhdpi en {os.path.relpath(VARIANTS_DIR, project_root)}/<densidad>/ "
+          f"(PNG y WebP, fuera del APK)")
     print(f"   🎨 Colores primarios y secundarios del equipo")
     print(f"   ⚡ Carga instantánea")
     print(f"   📱 Funcionamiento offline")
@@ -156,11 +100,17 @@ if __name__ == "__main__":
         print("Instala con: pip install Pillow")
         sys.exit(1)
     
-    success = main()
-    if success:
-        print("\n🎉 ¡Logos creados y configurados como assets!")
-        print("Los equipos ahora tendrán logos locales con sus iniciales.")
-    else:
-        print("\n💥 Error creando logos")
+    parser = argparse.ArgumentParser(description="Crea logos con las iniciales de los equipos como assets locales")
+    add_atlas_arguments(parser)
+    args = parser.parse_args()
+    
+    with run_report("create_team_logos") as run:
+        success = main(atlas=args.atlas, atlas_padding=args.atlas_padding, power_of_two=args.power_of_two)
+        run.ok = success
+        if success:
+            print("\n🎉 ¡Logos creados y configurados como assets!")
+            print("Los equipos ahora tendrán logos locales con sus iniciales.")
+        else:
+            print("\n💥 Error creando logos")
     
     sys.exit(0 if success else 1)
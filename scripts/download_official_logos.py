@@ -6,39 +6,37 @@ Script para descargar logos oficiales desde el sitio web de EuroLeague
 import json
 import os
 import sys
-import requests
 from urllib.parse import urlparse
-import time
+from concurrent.futures import ThreadPoolExecutor
+
+import http_client
+from logo_sync import FAILED, UNCHANGED, LogoJob, print_sync_summary, sync_logo, sync_logos
+from resilience import INCOMPLETE
+from telemetry import run_report
+
+# Cabeceras de navegador para el CDN de imágenes
+IMAGE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
+    'Accept-Language': 'es-ES,es;q=0.9,en;q=0.8',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+# Peticiones simultáneas (sustituye la pausa fija de 1 s entre equipos)
+MAX_WORKERS = 4
 
 def download_image(url, filepath):
     """Descarga una imagen desde una URL y la guarda en el filepath especificado"""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
-            'Accept-Language': 'es-ES,es;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        }
-        
-        print(f"📥 Descargando: {url}")
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        
-        # Crear directorio si no existe
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        
-        with open(filepath, 'wb') as f:
-            f.write(response.content)
-        
-        file_size = len(response.content)
-        print(f"✅ Guardado: {filepath} ({file_size} bytes)")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error descargando {url}: {e}")
+    print(f"📥 Descargando: {url}")
+    result = sync_logo(LogoJob(os.path.basename(filepath), url, filepath), headers=IMAGE_HEADERS)
+    
+    if result.status == FAILED:
+        print(f"❌ Error descargando {url}: {result.error}")
+        INCOMPLETE.record("logo", os.path.basename(filepath), result.error)
         return False
+    
+    print(f"✅ Guardado: {filepath} ({result.size} bytes, {result.status})")
+    return True
 
 def fetch_team_page_for_logo(team_code, team_name):
     """Obtiene el logo de un equipo desde su página oficial"""
@@ -51,7 +49,7 @@ def fetch_team_page_for_logo(team_code, team_name):
         }
         
         print(f"🔍 Buscando logo en: {team_url}")
-        response = requests.get(team_url, headers=headers, timeout=10)
+        response = http_client.get(team_url, headers=headers, timeout=10)
         response.raise_for_status()
         
         # Buscar el logo en el contenido HTML
@@ -111,44 +109,54 @@ def main():
     }
     
     # Directorio de destino
-    assets_dir = "app/src/main/assets/team_logos"
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    assets_dir = os.path.join(os.path.dirname(script_dir), "app", "src", "main", "assets", "team_logos")
     os.makedirs(assets_dir, exist_ok=True)
     
-    downloaded_count = 0
+    def resolve_logo_url(item):
+        team_code, team_slug = item
+        # Si tenemos URL conocida, usarla
+        if team_code in known_logos:
+            return team_code, known_logos[team_code]
+        # Buscar el logo en la página del equipo
+        return team_code, fetch_team_page_for_logo(team_code, team_slug)
+    
+    # 1. Resolver las URLs de los logos en paralelo
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        resolved = list(executor.map(resolve_logo_url, teams_data.items()))
+    
+    jobs = []
     failed_count = 0
+    for team_code, logo_url in resolved:
+        if logo_url:
+            filename = f"{team_code.lower()}_logo.png"
+            jobs.append(LogoJob(team_code, logo_url, os.path.join(assets_dir, filename)))
+        else:
+            print(f"❌ No se encontró logo para {team_code}")
+            INCOMPLETE.record("logo", team_code, "logo no encontrado en la página del equipo")
+            failed_count += 1
     
-    for team_code, team_slug in teams_data.items():
-        try:
-            # Si tenemos URL conocida, usarla
-            if team_code in known_logos:
-                logo_url = known_logos[team_code]
-            else:
-                # Buscar el logo en la página del equipo
-                logo_url = fetch_team_page_for_logo(team_code, team_slug)
-            
-            if logo_url:
-                filename = f"{team_code.lower()}_logo.png"
-                filepath = os.path.join(assets_dir, filename)
-                
-                if download_image(logo_url, filepath):
-                    downloaded_count += 1
-                else:
-                    failed_count += 1
-            else:
-                print(f"❌ No se encontró logo para {team_code}")
-                failed_count += 1
-            
-            # Pausa para no sobrecargar el servidor
-            time.sleep(1)
-            
-        except Exception as e:
-            print(f"❌ Error procesando {team_code}: {e}")
+    # 2. Descargar en paralelo, escribiendo solo los logos que han cambiado
+    results = sync_logos(jobs, headers=IMAGE_HEADERS, max_workers=MAX_WORKERS)
+    
+    downloaded_count = 0
+    for result in results:
+        if result.status == FAILED:
+            print(f"❌ {result.team_code}: {result.error}")
+            INCOMPLETE.record("logo", result.team_code, result.error)
             failed_count += 1
+        else:
+            downloaded_count += 1
+            mark = "⏸️" if result.status == UNCHANGED else "✅"
+            print(f"{mark} {result.team_code}: {os.path.basename(result.filepath)} ({result.size} bytes)")
     
     print(f"\n📊 Resumen:")
     print(f"✅ Logos descargados: {downloaded_count}")
+    print_sync_summary(results)
     print(f"❌ Fallos: {failed_count}")
     print(f"📁 Directorio: {assets_dir}")
+    http_client.print_connection_stats()
+    INCOMPLETE.print_report()
     
     if downloaded_count > 0:
         print(f"\n🎉 ¡Logos guardados exitosamente!")
@@ -157,4 +165,5 @@ def main():
         print(f"\n😞 No se pudieron descargar logos. Verifica la conectividad a internet.")
 
 if __name__ == "__main__":
-    main()
+    with run_report("download_official_logos"):
+        main()
@@ -3,33 +3,50 @@
 Script para descargar logos de equipos y guardarlos como assets locales
 """
 
-import json
+import argparse
 import os
 import sys
-import requests
 from urllib.parse import urlparse
 
+import http_client
+from logo_atlas import DEFAULT_PADDING, add_atlas_arguments, build_logo_atlas
+from logo_optimizer import (
+    DEFAULT_BUDGET_BYTES,
+    DEFAULT_MAX_SIZE,
+    LogoSource,
+    add_optimize_arguments,
+    optimize_logos,
+    print_optimization_report,
+)
+from logo_sync import FAILED, UNCHANGED, LogoJob, print_sync_summary, sync_logo, sync_logos
+from resilience import INCOMPLETE
+from teams_asset import TEAMS_FILE, patch_teams
+from telemetry import run_report, span
+
+IMAGE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
 def download_image(url, filepath):
     """Descarga una imagen desde una URL y la guarda en el filepath especificado"""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        # Crear directorio si no existe
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        
-        with open(filepath, 'wb') as f:
-            f.write(response.content)
-        
-        return True
-    except Exception as e:
-        print(f"❌ Error descargando {url}: {e}")
+    result = sync_logo(LogoJob(os.path.basename(filepath), url, filepath), headers=IMAGE_HEADERS, timeout=10)
+    if result.status == FAILED:
+        print(f"❌ Error descargando {url}: {result.error}")
         return False
+    return True
+
+def android_logo_path(filename):
+    """Ruta para usar en Android (asset://)"""
+    return f"file:///android_asset/team_logos/{filename}"
 
-def main():
+def main(download=True, update_teams=True, atlas=False, atlas_padding=DEFAULT_PADDING, power_of_two=True,
+         optimize=False, max_size=DEFAULT_MAX_SIZE, budget=DEFAULT_BUDGET_BYTES):
+    """
+    Descarga los logos y asigna las rutas locales en teams_2025_26.json.
+    Ambos pasos se pueden ejecutar por separado (ver pipeline.py). Con
+    `optimize` los logos se redimensionan y recodifican (ver logo_optimizer.py)
+    antes de escribirse, y con `atlas` se empaquetan además en team_logos/atlas.png.
+    """
     print("🖼️ Descargando logos de equipos como assets locales...")
     
     # Mapeo de códigos de equipo a URLs oficiales de logos de EuroLeague
@@ -60,61 +77,93 @@ def main():
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(script_dir)
     assets_dir = os.path.join(project_root, "app", "src", "main", "assets")
-    static_data_dir = os.path.join(assets_dir, "static_data")
     logos_dir = os.path.join(assets_dir, "team_logos")
-    teams_file = os.path.join(static_data_dir, "teams_2025_26.json")
     
     # Crear directorio para logos
     os.makedirs(logos_dir, exist_ok=True)
     print(f"📁 Directorio de logos: {logos_dir}")
     
-    # Descargar logos
-    print("📥 Descargando logos...")
     downloaded_logos = {}
+    results = []
     
-    for team_code, url in team_logos.items():
-        print(f"📥 Descargando logo para {team_code}...")
+    if download:
+        print("📥 Descargando logos...")
         
-        # Generar nombre de archivo local
-        filename = f"{team_code.lower()}_logo.png"
-        filepath = os.path.join(logos_dir, filename)
+        # Generar nombre de archivo local para cada equipo y descargar en paralelo
+        jobs = [
+            LogoJob(team_code, url, os.path.join(logos_dir, f"{team_code.lower()}_logo.png"))
+            for team_code, url in team_logos.items()
+        ]
         
-        if download_image(url, filepath):
-            # Ruta para usar en Android (asset://)
-            android_path = f"file:///android_asset/team_logos/{filename}"
-            downloaded_logos[team_code] = android_path
-            print(f"✅ {team_code}: {filename}")
-        else:
-            print(f"❌ {team_code}: Error descargando")
+        with span("fetch.logos", logos=len(jobs)):
+            results = sync_logos(jobs, headers=IMAGE_HEADERS, timeout=10, write=not optimize)
+        
+        # Con --optimize se escribe la versión optimizada en lugar de la original
+        changed = {}
+        if optimize:
+            sources = [LogoSource(r.team_code, r.content, r.filepath) for r in results if r.status != FAILED]
+            with span("transform.optimize_logos"):
+                optimized = optimize_logos(sources, logos_dir, max_size, budget)
+            changed = {r.team_code: r.written > 0 for r in optimized if r.error is None}
+            for r in optimized:
+                if r.error:
+                    INCOMPLETE.record("logo", r.team_code, r.error)
+        
+        for result in results:
+            filename = os.path.basename(result.filepath)
+            if result.status == FAILED:
+                print(f"❌ {result.team_code}: Error descargando ({result.error})")
+                INCOMPLETE.record("logo", result.team_code, result.error)
+                continue
+            if optimize and result.team_code not in changed:
+                print(f"❌ {result.team_code}: Error optimizando")
+                continue
+            
+            downloaded_logos[result.team_code] = android_logo_path(filename)
+            updated = changed[result.team_code] if optimize else result.status != UNCHANGED
+            mark = "actualizado" if updated else "⏸️ sin cambios"
+            print(f"✅ {result.team_code}: {filename} ({mark})")
+        
+        if optimize:
+            print_optimization_report(optimized, budget)
+    else:
+        # Solo asignación: se usan los logos ya presentes en team_logos/
+        for team_code in team_logos:
+            filename = f"{team_code.lower()}_logo.png"
+            if os.path.exists(os.path.join(logos_dir, filename)):
+                downloaded_logos[team_code] = android_logo_path(filename)
     
-    # Cargar datos de equipos
-    print("\n📝 Actualizando datos de equipos...")
-    with open(teams_file, 'r', encoding='utf-8') as f:
-        teams_data = json.load(f)
+    if atlas and downloaded_logos:
+        with span("write.atlas"):
+            build_logo_atlas(logos_dir, list(downloaded_logos), atlas_padding, power_of_two)
     
-    # Actualizar URLs de logos a rutas locales
-    updated_count = 0
-    for team in teams_data['teams']:
-        team_code = team.get('code', team.get('id', ''))
-        
-        if team_code in downloaded_logos:
-            old_logo = team.get('logoUrl', '')
-            team['logoUrl'] = downloaded_logos[team_code]
-            if old_logo != team['logoUrl']:
-                updated_count += 1
-                print(f"✅ {team['name']}: Logo local asignado")
+    if not update_teams:
+        print(f"\n✅ {len(downloaded_logos)} logos sincronizados (sin actualizar {os.path.basename(TEAMS_FILE)})")
+        if not optimize:
+            print_sync_summary(results)
+        http_client.print_connection_stats()
+        INCOMPLETE.print_report()
+        return True
     
-    # Guardar datos actualizados
-    with open(teams_file, 'w', encoding='utf-8') as f:
-        json.dump(teams_data, f, ensure_ascii=False, indent=2)
+    # Actualizar URLs de logos a rutas locales (una sola lectura/escritura)
+    print("\n📝 Actualizando datos de equipos...")
+    with span("write.teams"):
+        result = patch_teams({code: {"logoUrl": path} for code, path in downloaded_logos.items()}, TEAMS_FILE)
+    for team, _ in result.updated:
+        print(f"✅ {team['name']}: Logo local asignado")
+    updated_count = result.updated_count
     
     print("\n" + "=" * 60)
     print("✅ LOGOS DESCARGADOS Y CONFIGURADOS")
     print(f"📊 Resumen:")
     print(f"   🖼️ {len(downloaded_logos)} logos descargados como assets")
+    if download and not optimize:
+        print_sync_summary(results)
     print(f"   📝 {updated_count} equipos actualizados")
     print(f"   📁 Guardados en: app/src/main/assets/team_logos/")
     print(f"   🔗 URLs actualizadas a rutas locales (file:///android_asset/...)")
+    http_client.print_connection_stats()
+    INCOMPLETE.print_report()
     
     print(f"\n📂 Archivos creados:")
     for team_code in downloaded_logos:
@@ -130,11 +179,25 @@ def main():
     return True
 
 if __name__ == "__main__":
-    success = main()
-    if success:
-        print("\n🎉 ¡Logos descargados y configurados como assets!")
-        print("Los equipos ahora tendrán logos locales instantáneos.")
-    else:
-        print("\n💥 Error descargando logos")
+    parser = argparse.ArgumentParser(description="Descarga los logos de los equipos como assets locales")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--logos-only", action="store_true",
+                       help="Solo descargar los logos, sin modificar teams_2025_26.json")
+    group.add_argument("--assign-only", action="store_true",
+                       help="Solo asignar en teams_2025_26.json las rutas de los logos ya descargados")
+    add_atlas_arguments(parser)
+    add_optimize_arguments(parser)
+    args = parser.parse_args()
+    
+    with run_report("download_team_logos") as run:
+        success = main(download=not args.assign_only, update_teams=not args.logos_only,
+                       atlas=args.atlas, atlas_padding=args.atlas_padding, power_of_two=args.power_of_two,
+                       optimize=args.optimize, max_size=args.max_size, budget=args.budget)
+        run.ok = success
+        if success:
+            print("\n🎉 ¡Logos descargados y configurados como assets!")
+            print("Los equipos ahora tendrán logos locales instantáneos.")
+        else:
+            print("\n💥 Error descargando logos")
     
     sys.exit(0 if success else 1)
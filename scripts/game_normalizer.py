@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Normalizador único de partidos.
+
+Los partidos llegan de dos formas: en crudo desde los feeds (la API de feeds
+y el Game Center comparten estructura, con home/away/venue/round anidados) y
+ya aplanados en static_data.json. Cada forma se describe con un esquema
+declarativo (campo del registro → ruta en el origen) que se compila una sola
+vez en una función generada: cada subobjeto (home, away, venue...) se lee una
+vez por partido y no hay bucles ni cadenas de .get por campo.
+
+El resultado es un GameRecord con __slots__ y esquema fijo. Cada formato de
+salida (partido de static_data.json, StaticMatch, fila de Room...) es una
+vista sobre el registro, compilada igual, que fija nombres, orden de claves y
+valores por defecto. Igual que los `.get(clave, defecto)` a los que
+sustituyen, los valores por defecto solo se aplican cuando el origen no trae
+el campo (MISSING): un null explícito (p. ej. `score: null` de un partido sin
+jugar) se conserva como None. Las fechas se convierten con caché: en una
+temporada muchos partidos comparten hora de inicio.
+
+    record = from_feed_game(raw, round_num=3, season_code="E2025")
+    to_static_data_game(record)   # static_data.json
+    to_static_match(record)       # matches_calendar_2025_26.json
+"""
+
+from dataclasses import dataclass, fields
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+DATE_CACHE_SIZE = 4096
+
+
+class _Missing:
+    """Marca de campo ausente en el origen (distinto de un null explícito)"""
+    __slots__ = ()
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+MISSING: Any = _Missing()
+
+
+@dataclass
+class GameRecord:
+    """Partido normalizado. Los campos que el origen no trae quedan a MISSING"""
+    __slots__ = (
+        "id", "round", "home_code", "away_code", "home_name", "away_name", "home_score", "away_score",
+        "status", "date", "date_iso", "venue", "venue_code", "venue_address", "venue_capacity",
+        "game_code", "phase_type", "season", "url", "broadcasters",
+    )
+    id: Any
+    round: Optional[int]
+    home_code: Optional[str]
+    away_code: Optional[str]
+    home_name: Optional[str]
+    away_name: Optional[str]
+    home_score: Optional[int]
+    away_score: Optional[int]
+    status: Optional[str]
+    date: str                    # 'YYYY-MM-DD HH:MM:SS', formato de static_data.json
+    date_iso: Optional[str]      # ISO 8601 (con zona si el origen la trae)
+    venue: Optional[str]
+    venue_code: Optional[str]
+    venue_address: Optional[str]
+    venue_capacity: Optional[int]
+    game_code: Optional[int]
+    phase_type: Optional[str]
+    season: Optional[str]
+    url: Optional[str]
+    broadcasters: Optional[Tuple[str, ...]]
+
+
+RECORD_FIELDS = tuple(f.name for f in fields(GameRecord))
+
+
+@dataclass(frozen=True)
+class Source:
+    """Ruta de un campo en el partido de origen"""
+    keys: Tuple[str, ...]
+    default: Any = None
+    convert: Optional[Callable[[Any], Any]] = None
+    fallback: Optional[str] = None  # argumento de la extracción que hace de valor por defecto
+    item: Optional[int] = None      # posición en el resultado de `convert` si devuelve varios campos
+
+
+def src(*keys: str, default: Any = None, convert: Optional[Callable[[Any], Any]] = None,
+        fallback: Optional[str] = None, item: Optional[int] = None) -> Source:
+    return Source(keys, default, convert, fallback, item)
+
+
+@dataclass(frozen=True)
+class Column:
+    """Columna de una vista: campo del registro, valor si el origen no lo trae y conversión"""
+    field: str
+    default: Any = None
+    convert: Optional[Callable[[Any], Any]] = None
+
+
+@dataclass(frozen=True)
+class Const:
+    value: Any
+
+
+ViewSpec = Dict[str, Union[str, Column, Const]]
+
+
+# --- Fechas -------------------------------------------------------------------
+
+def _parse_feed_date(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+# El parseo es barato; lo caro es formatear un datetime con zona, así que los
+# textos ya validados con el formato extendido ('YYYY-MM-DDTHH:MM:SS...', en el
+# que los campos del texto son los del datetime) se recortan sin formatear
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def feed_dates(value: Optional[str]) -> Tuple[str, Any]:
+    """
+    '2025-10-03T18:00:00.000Z' → ('2025-10-03 18:00:00', '2025-10-03T18:00:00+00:00').
+    Si no se entiende se devuelve tal cual en ambos formatos; sin fecha, ('', MISSING).
+    """
+    if not value:
+        return "", MISSING
+    dt = _parse_feed_date(value)
+    if dt is None:
+        return value, value
+    extended = (len(value) >= 19 and value[4] == '-' and value[7] == '-' and value[10] in 'T '
+                and value[13] == ':' and value[16] == ':')
+    if not extended:
+        return dt.strftime('%Y-%m-%d %H:%M:%S'), dt.isoformat()
+    local = value[:10] + ' ' + value[11:19]
+    if value.endswith('Z') and not dt.microsecond:
+        return local, value[:10] + 'T' + value[11:19] + '+00:00'
+    return local, dt.isoformat()
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def static_date_iso(value: Optional[str]) -> Any:
+    """'2025-10-03 18:00:00' → '2025-10-03T18:00:00' (ISO_LOCAL_DATE_TIME); sin fecha, MISSING"""
+    return value.replace(" ", "T") if value else MISSING
+
+
+def broadcaster_names(value: Any) -> Tuple[str, ...]:
+    # Tupla: la vacía es un único objeto compartido por todos los registros
+    if not isinstance(value, list):
+        return ()
+    return tuple(b.get('name', '') if isinstance(b, dict) else str(b) for b in value)
+
+
+def tuple_or_none(value: Any) -> Optional[Tuple[Any, ...]]:
+    return tuple(value) if value is not None else None
+
+
+# --- Compilación --------------------------------------------------------------
+
+def _compile(name: str, params: List[str], body: List[str], namespace: Dict[str, Any]) -> Callable:
+    source = f"def {name}({', '.join(params)}):\n" + "\n".join(f"    {line}" for line in body) + "\n"
+    exec(compile(source, f"<{name}>", "exec"), namespace)
+    function = namespace[name]
+    function.__source__ = source
+    return function
+
+
+def compile_extractor(schema: Dict[str, Source], name: str) -> Callable[..., GameRecord]:
+    """
+    Compila un esquema de origen en `name(game, <fallbacks>=None) -> GameRecord`.
+    Todos los campos de GameRecord deben tener ruta.
+    """
+    missing = [f for f in RECORD_FIELDS if f not in schema]
+    unknown = [f for f in schema if f not in RECORD_FIELDS]
+    if missing or unknown:
+        raise ValueError(f"Esquema {name}: faltan {missing}, sobran {unknown}")
+
+    namespace: Dict[str, Any] = {"GameRecord": GameRecord, "EMPTY": {}, "MISSING": MISSING}
+    parents: Dict[Tuple[str, ...], str] = {}
+    converted: Dict[Tuple[Any, ...], str] = {}
+    body, args = [], []
+    for index, field_name in enumerate(RECORD_FIELDS):
+        source = schema[field_name]
+        obj = "game"
+        for depth in range(1, len(source.keys)):
+            prefix = source.keys[:depth]
+            if prefix not in parents:
+                parents[prefix] = f"_n{len(parents)}"
+                body.append(f"{parents[prefix]} = {obj}.get({prefix[-1]!r}) or EMPTY")
+            obj = parents[prefix]
+
+        default = source.fallback
+        if default is None and source.default is None and source.convert is None:
+            default = "MISSING"
+        elif default is None:
+            default = f"_d{index}"
+            namespace[default] = source.default
+        expression = f"{obj}.get({source.keys[-1]!r}, {default})"
+        if source.convert is not None:
+            # Una conversión que alimenta varios campos se evalúa una sola vez
+            shared = (source.keys, source.convert, source.default)
+            if source.item is None or shared not in converted:
+                namespace[f"_c{index}"] = source.convert
+                expression = f"_c{index}({expression})"
+            if source.item is not None:
+                if shared not in converted:
+                    converted[shared] = f"_t{index}"
+                    body.append(f"_t{index} = {expression}")
+                expression = f"{converted[shared]}[{source.item}]"
+        args.append(expression)
+
+    fallbacks = list(dict.fromkeys(s.fallback for s in schema.values() if s.fallback))
+    body.append(f"return GameRecord({', '.join(args)})")
+    return _compile(name, ["game"] + [f"{f}=MISSING" for f in fallbacks], body, namespace)
+
+
+def compile_view(view: ViewSpec, name: str) -> Callable[[GameRecord], Dict[str, Any]]:
+    """
+    Compila una vista (clave de salida → campo, Column o Const) en
+    `name(record) -> dict`. Un campo MISSING toma el valor por defecto de la
+    columna, o None si no tiene.
+    """
+    namespace: Dict[str, Any] = {"MISSING": MISSING}
+    items = []
+    for index, (key, column) in enumerate(view.items()):
+        if isinstance(column, Const):
+            namespace[f"_k{index}"] = column.value
+            items.append(f"{key!r}: _k{index}")
+            continue
+        if isinstance(column, str):
+            column = Column(column)
+        if column.field not in RECORD_FIELDS:
+            raise ValueError(f"Vista {name}: campo desconocido {column.field}")
+        expression = f"record.{column.field}"
+        default = "None"
+        if column.default is not None:
+            default = f"_d{index}"
+            namespace[default] = column.default
+        expression = f"({expression} if {expression} is not MISSING else {default})"
+        if column.convert is not None:
+            namespace[f"_c{index}"] = column.convert
+            expression = f"_c{index}({expression})"
+        items.append(f"{key!r}: {expression}")
+    return _compile(name, ["record"], [f"return {{{', '.join(items)}}}"], namespace)
+
+
+# --- Orígenes -----------------------------------------------------------------
+
+# Partido de la API de feeds o del Game Center
+FEED_SCHEMA = {
+    "id": src("id"),
+    "round": src("round", "round", fallback="round_num"),
+    "home_code": src("home", "code"),
+    "away_code": src("away", "code"),
+    "home_name": src("home", "name"),
+    "away_name": src("away", "name"),
+    "home_score": src("home", "score"),
+    "away_score": src("away", "score"),
+    "status": src("status"),
+    "date": src("date", convert=feed_dates, item=0),
+    "date_iso": src("date", convert=feed_dates, item=1),
+    "venue": src("venue", "name"),
+    "venue_code": src("venue", "code"),
+    "venue_address": src("venue", "address"),
+    "venue_capacity": src("venue", "capacity"),
+    "game_code": src("code"),
+    "phase_type": src("phaseType", "code"),
+    "season": src("season", "code", fallback="season_code"),
+    "url": src("url"),
+    "broadcasters": src("broadcasters", convert=broadcaster_names),
+}
+
+# Partido de static_data.json (salida de to_static_data_game)
+STATIC_DATA_SCHEMA = {
+    "id": src("id"),
+    "round": src("round"),
+    "home_code": src("homeTeamId"),
+    "away_code": src("awayTeamId"),
+    "home_name": src("homeTeamName"),
+    "away_name": src("awayTeamName"),
+    "home_score": src("homeScore"),
+    "away_score": src("awayScore"),
+    "status": src("status"),
+    "date": src("date", default=""),
+    "date_iso": src("date", convert=static_date_iso),
+    "venue": src("venue"),
+    "venue_code": src("venueCode"),
+    "venue_address": src("venueAddress"),
+    "venue_capacity": src("venueCapacity"),
+    "game_code": src("gameCode"),
+    "phase_type": src("phaseType"),
+    "season": src("season", fallback="season_code"),
+    "url": src("gameUrl"),
+    "broadcasters": src("broadcasters", convert=tuple_or_none),
+}
+
+from_feed_game = compile_extractor(FEED_SCHEMA, "from_feed_game")
+from_static_data_game = compile_extractor(STATIC_DATA_SCHEMA, "from_static_data_game")
+
+
+# --- Vistas -------------------------------------------------------------------
+
+# static_data.json (API de feeds)
+STATIC_DATA_GAME = {
+    "id": Column("id", ""),
+    "homeTeamId": Column("home_code", ""),
+    "awayTeamId": Column("away_code", ""),
+    "homeTeamName": Column("home_name", ""),
+    "awayTeamName": Column("away_name", ""),
+    "date": "date",
+    "round": "round",
+    "homeScore": Column("home_score", 0),
+    "awayScore": Column("away_score", 0),
+    "status": Column("status", "scheduled"),
+    "venue": Column("venue", ""),
+    "venueCapacity": Column("venue_capacity", 0),
+    "venueCode": Column("venue_code", ""),
+    "gameCode": Column("game_code", 0),
+    "phaseType": Column("phase_type", "RS"),
+    "season": "season",
+}
+
+# static_data.json (Game Center, con dirección del pabellón y URL del partido)
+GAME_CENTER_GAME = {
+    "id": Column("id", ""),
+    "homeTeamId": Column("home_code", ""),
+    "awayTeamId": Column("away_code", ""),
+    "homeTeamName": Column("home_name", ""),
+    "awayTeamName": Column("away_name", ""),
+    "date": "date",
+    "round": "round",
+    "homeScore": Column("home_score", 0),
+    "awayScore": Column("away_score", 0),
+    "status": Column("status", "scheduled"),
+    "venue": Column("venue", ""),
+    "venueCapacity": Column("venue_capacity", 0),
+    "venueAddress": Column("venue_address", ""),
+    "gameUrl": Column("url", ""),
+    "gameCode": Column("game_code", 0),
+}
+
+# StaticMatch de StaticDataManager (matches_calendar_2025_26.json)
+STATIC_MATCH = {
+    "id": Column("id", ""),
+    "round": Column("round", 1),
+    "homeTeamCode": Column("home_code", ""),
+    "awayTeamCode": Column("away_code", ""),
+    "venue": Column("venue", ""),
+    "season": "season",
+    "status": Column("status", "confirmed"),
+    "dateTime": Column("date_iso", ""),
+    "homeScore": Column("home_score", 0),
+    "awayScore": Column("away_score", 0),
+}
+
+# Calendario de populate_static_data.py (con pabellón, ciudad y televisiones)
+CALENDAR_MATCH = {
+    "id": Column("id", "", str),
+    "homeTeamId": Column("home_code", "", str),
+    "awayTeamId": Column("away_code", "", str),
+    "homeTeamName": Column("home_name", ""),
+    "awayTeamName": Column("away_name", ""),
+    "dateTime": Column("date_iso", "2025-10-01T20:00:00"),
+    "status": Column("status", "scheduled"),
+    "round": Column("round", 1),
+    "arena": Column("venue", ""),
+    "city": Column("venue_address", ""),
+    "country": Const(""),
+    "broadcasters": Column("broadcasters", (), list),
+    "homeScore": "home_score",
+    "awayScore": "away_score",
+}
+
+to_static_data_game = compile_view(STATIC_DATA_GAME, "to_static_data_game")
+to_game_center_game = compile_view(GAME_CENTER_GAME, "to_game_center_game")
+to_static_match = compile_view(STATIC_MATCH, "to_static_match")
+to_calendar_match = compile_view(CALENDAR_MATCH, "to_calendar_match")
+
+
+def print_compiled(function: Callable):
+    """Muestra el código generado de un extractor o una vista"""
+    print(function.__source__)
+
+
+if __name__ == "__main__":
+    for compiled in (from_feed_game, from_static_data_game, to_static_data_game, to_static_match):
+        print_compiled(compiled)
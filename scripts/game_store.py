@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Almacén de partidos indexado por id para los scripts de poblado.
+
+Mantiene el orden de inserción (igual que la lista que se construía antes) y
+deduplica en tiempo constante. Cuando el mismo partido llega dos veces con
+distinto estado o marcador, la política de fusión conserva la versión más
+avanzada (p. ej. un resultado final frente a un partido programado).
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Orden de avance de los estados que devuelven los feeds
+STATUS_RANK = {
+    "scheduled": 0,
+    "confirmed": 1,
+    "postponed": 1,
+    "cancelled": 1,
+    "live": 2,
+    "playing": 2,
+    "result": 3,
+    "played": 3,
+    "finished": 3,
+    "closed": 3,
+}
+
+# Nivel a partir del cual el partido está terminado
+FINAL_STATUS_RANK = 3
+
+ADDED = "added"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+
+
+def status_rank(game: Dict[str, Any]) -> int:
+    """Devuelve el nivel de avance del estado de un partido"""
+    return STATUS_RANK.get(str(game.get('status') or '').lower(), 0)
+
+
+def game_scores(game: Dict[str, Any]) -> tuple:
+    """Obtiene (local, visitante) tanto de partidos normalizados como del feed"""
+    if 'homeScore' in game or 'awayScore' in game:
+        return game.get('homeScore') or 0, game.get('awayScore') or 0
+    return (game.get('home') or {}).get('score') or 0, (game.get('away') or {}).get('score') or 0
+
+
+def game_team_codes(game: Dict[str, Any]) -> tuple:
+    """Obtiene (local, visitante) de static_data, del calendario de StaticDataManager o del feed"""
+    home = game.get('homeTeamId') or game.get('homeTeamCode') or (game.get('home') or {}).get('code')
+    away = game.get('awayTeamId') or game.get('awayTeamCode') or (game.get('away') or {}).get('code')
+    return home, away
+
+
+def is_finished(game: Dict[str, Any]) -> bool:
+    return status_rank(game) >= FINAL_STATUS_RANK
+
+
+def prefer_most_advanced(existing: Dict[str, Any], incoming: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Política de fusión por defecto.
+
+    Gana el estado más avanzado; con el mismo estado gana el marcador con más
+    puntos (un partido en directo que ha seguido avanzando). En empate se
+    conserva el registro existente para no generar cambios espurios.
+    """
+    existing_rank, incoming_rank = status_rank(existing), status_rank(incoming)
+    if incoming_rank != existing_rank:
+        return incoming if incoming_rank > existing_rank else existing
+
+    if sum(game_scores(incoming)) > sum(game_scores(existing)):
+        return incoming
+    return existing
+
+
+class GameStore:
+    """Colección de partidos indexada por id y ordenada por inserción"""
+
+    def __init__(self,
+                 key: Callable[[Dict[str, Any]], Any] = lambda game: game.get('id'),
+                 merge: Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]] = prefer_most_advanced):
+        self._key = key
+        self._merge = merge
+        self._games: Dict[Any, Dict[str, Any]] = {}
+
+    def add(self, game: Dict[str, Any]) -> str:
+        """Añade o fusiona un partido. Devuelve 'added', 'updated' o 'unchanged'"""
+        game_id = self._key(game)
+        existing = self._games.get(game_id)
+
+        if existing is None:
+            self._games[game_id] = game
+            return ADDED
+
+        merged = self._merge(existing, game)
+        if merged is existing or merged == existing:
+            return UNCHANGED
+
+        self._games[game_id] = merged
+        return UPDATED
+
+    def add_many(self, games: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """Añade varios partidos y devuelve el recuento por resultado"""
+        counts = {ADDED: 0, UPDATED: 0, UNCHANGED: 0}
+        for game in games:
+            counts[self.add(game)] += 1
+        return counts
+
+    def get(self, game_id: Any) -> Optional[Dict[str, Any]]:
+        return self._games.get(game_id)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return list(self._games.values())
+
+    def __contains__(self, game_id: Any) -> bool:
+        return game_id in self._games
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._games.values())
@@ -3,21 +3,49 @@
 Script para generar archivos estáticos con la estructura exacta que espera StaticDataManager
 """
 
-import json
+import argparse
 import os
 from datetime import datetime
 
-def main():
+from asset_writer import (
+    FORMAT_PRETTY,
+    MATCH_TEAM_FIELDS,
+    add_format_arguments,
+    report_asset,
+    write_asset,
+)
+from game_normalizer import from_static_data_game, to_static_match
+import json_codec
+import teams_asset
+from telemetry import run_report, span
+
+# Rutas relativas al script (no al directorio de trabajo)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+ASSETS_DIR = os.path.join(PROJECT_ROOT, "app", "src", "main", "assets")
+STATIC_DATA_DIR = os.path.join(ASSETS_DIR, "static_data")
+INPUT_FILE = os.path.join(ASSETS_DIR, "static_data.json")
+
+def record_to_static_match(record, season_code="E2025"):
+    """GameRecord con la estructura StaticMatch (de la temporada `season_code`)"""
+    match = to_static_match(record)
+    match["season"] = season_code
+    return match
+
+def static_match(game, season_code="E2025"):
+    """Partido de static_data.json con la estructura StaticMatch (de la temporada `season_code`)"""
+    return record_to_static_match(from_static_data_game(game, season_code), season_code)
+
+def main(output_format: str = FORMAT_PRETTY, gzip_copy: bool = False, report: bool = False):
     print("🔄 Generando archivos estáticos para StaticDataManager...")
     
-    # Cargar datos del archivo principal
-    with open('app/src/main/assets/static_data.json', 'r', encoding='utf-8') as f:
-        main_data = json.load(f)
+    # Cargar datos del archivo principal (los partidos ya como GameRecord)
+    with span("read.static_data"):
+        main_data, records = json_codec.load_records(INPUT_FILE, 'games', from_static_data_game, "E2025")
     
     teams = main_data.get('teams', [])
-    games = main_data.get('games', [])
     
-    print(f"✅ Cargados {len(teams)} equipos y {len(games)} partidos")
+    print(f"✅ Cargados {len(teams)} equipos y {len(records)} partidos")
     
     # Generar teams_2025_26.json con estructura StaticTeamsData
     print("📝 Generando teams_2025_26.json...")
@@ -53,31 +81,17 @@ def main():
         "teams": static_teams
     }
     
-    # Guardar teams_2025_26.json
-    teams_file = "app/src/main/assets/static_data/teams_2025_26.json"
-    with open(teams_file, 'w', encoding='utf-8') as f:
-        json.dump(teams_data, f, ensure_ascii=False, indent=2)
+    # Guardar teams_2025_26.json (bajo el mismo bloqueo que usan los scripts de logos)
+    teams_file = os.path.join(STATIC_DATA_DIR, "teams_2025_26.json")
+    with teams_asset.locked(teams_file):
+        write_asset(teams_file, teams_data, output_format, gzip_copy=gzip_copy)
     print(f"✅ Generado: teams_2025_26.json ({len(static_teams)} equipos)")
     
     # Generar matches_calendar_2025_26.json con estructura StaticMatchesData
     print("📝 Generando matches_calendar_2025_26.json...")
     
     # Transformar partidos para StaticMatch
-    static_matches = []
-    for game in games:
-        static_match = {
-            "id": game.get("id", ""),
-            "round": game.get("round", 1),
-            "homeTeamCode": game.get("homeTeamId", ""),
-            "awayTeamCode": game.get("awayTeamId", ""),
-            "venue": game.get("venue", ""),
-            "season": "E2025",
-            "status": game.get("status", "confirmed"),
-            "dateTime": game.get("date", "").replace(" ", "T"),  # Convertir formato
-            "homeScore": game.get("homeScore", 0),
-            "awayScore": game.get("awayScore", 0)
-        }
-        static_matches.append(static_match)
+    static_matches = [record_to_static_match(record) for record in records]
     
     matches_data = {
         "version": "2025-26-v1.0",
@@ -90,9 +104,9 @@ def main():
     }
     
     # Guardar matches_calendar_2025_26.json
-    matches_file = "app/src/main/assets/static_data/matches_calendar_2025_26.json"
-    with open(matches_file, 'w', encoding='utf-8') as f:
-        json.dump(matches_data, f, ensure_ascii=False, indent=2)
+    matches_file = os.path.join(STATIC_DATA_DIR, "matches_calendar_2025_26.json")
+    write_asset(matches_file, matches_data, output_format, list_key="matches",
+                dict_fields=MATCH_TEAM_FIELDS, gzip_copy=gzip_copy)
     print(f"✅ Generado: matches_calendar_2025_26.json ({len(static_matches)} partidos)")
     
     # Generar data_version.json con estructura DataVersionInfo
@@ -120,9 +134,8 @@ def main():
     }
     
     # Guardar data_version.json
-    version_file = "app/src/main/assets/static_data/data_version.json"
-    with open(version_file, 'w', encoding='utf-8') as f:
-        json.dump(version_data, f, ensure_ascii=False, indent=2)
+    version_file = os.path.join(STATIC_DATA_DIR, "data_version.json")
+    write_asset(version_file, version_data, output_format, gzip_copy=gzip_copy)
     print(f"✅ Generado: data_version.json")
     
     print("\n" + "=" * 60)
@@ -132,7 +145,17 @@ def main():
     print(f"   • teams_2025_26.json ({len(static_teams)} equipos)")
     print(f"   • matches_calendar_2025_26.json ({len(static_matches)} partidos)")
     print(f"   • data_version.json")
+    print(f"📦 Formato: {output_format}{' + gzip' if gzip_copy else ''}")
+    
+    if report:
+        report_asset(matches_file)
+    
     print(f"\n🎉 ¡Archivos compatibles con StaticDataManager generados exitosamente!")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Genera los assets que lee StaticDataManager")
+    add_format_arguments(parser)
+    args = parser.parse_args()
+    
+    with run_report("generate_staticdatamanager_files"):
+        main(output_format=args.format, gzip_copy=args.gzip, report=args.report)
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Caché HTTP en disco compartida por los scripts de poblado.
+
+Guarda los cuerpos de respuesta indexados por URL y revalida con peticiones
+condicionales (If-None-Match / If-Modified-Since), respetando el max-age de
+Cache-Control. El tamaño total se limita con expulsión LRU, de forma que un
+refresco nocturno sin cambios se resuelve casi por completo con 304.
+
+El índice se lee una vez por proceso y los cambios (entradas nuevas,
+revalidaciones, último acceso) se acumulan en memoria: se vuelcan por lotes
+de FLUSH_EVERY, en print_stats y al salir. Cada volcado toma un bloqueo
+exclusivo (fcntl, .index.json.lock), relee el índice y fusiona los cambios
+propios con los de otros procesos (el pipeline ejecuta etapas en paralelo),
+de modo que ninguno pisa las entradas de otro.
+
+Variables de entorno:
+    EUROLEAGUE_HTTP_CACHE=0          Desactiva la caché
+    EUROLEAGUE_HTTP_CACHE_DIR=<dir>  Directorio de la caché
+
+Autocomprobación offline contra un servidor local:
+    python3 scripts/http_cache.py --self-test
+"""
+
+import atexit
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import json_codec
+from teams_asset import locked
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.environ.get("EUROLEAGUE_HTTP_CACHE_DIR", os.path.join(SCRIPT_DIR, ".http_cache"))
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+INDEX_FILE = "index.json"
+# Cambios pendientes a partir de los cuales se vuelca el índice sin esperar al final
+FLUSH_EVERY = 50
+
+# Cabeceras de la respuesta original que se conservan junto al cuerpo
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+
+
+def parse_cache_control(value: str) -> Dict[str, Optional[str]]:
+    """Convierte 'public, max-age=60' en {'public': None, 'max-age': '60'}"""
+    directives = {}
+    for part in (value or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, arg = part.partition("=")
+        directives[name.strip().lower()] = arg.strip().strip('"') or None
+    return directives
+
+
+class CachedResponse:
+    """Respuesta mínima compatible con el uso que hacen los scripts de requests.Response"""
+
+    def __init__(self, url: str, status_code: int, content: bytes, headers: Dict[str, str],
+                 from_cache: bool = False, revalidated: bool = False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.from_cache = from_cache
+        self.revalidated = revalidated
+        self.encoding = "utf-8"
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self) -> Any:
+        return json_codec.loads(self.content)
+
+    def raise_for_status(self):
+        # Solo se almacenan respuestas 200, nunca hay error que propagar
+        pass
+
+
+class HttpCache:
+    """Caché HTTP en disco con revalidación condicional y expulsión LRU"""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 enabled: Optional[bool] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = enabled if enabled is not None else os.environ.get("EUROLEAGUE_HTTP_CACHE", "1") != "0"
+        self.stats = {"fresh": 0, "revalidated": 0, "miss": 0, "stored": 0, "evicted": 0}
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+        # Cambios aún no volcados: entradas guardadas/revalidadas y últimos accesos
+        self._pending_entries: Dict[str, Dict[str, Any]] = {}
+        self._pending_access: Dict[str, float] = {}
+        self._atexit_registered = False
+
+    # ------------------------------------------------------------------
+    # Índice
+    # ------------------------------------------------------------------
+
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def _body_path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            return json_codec.load(self._index_path())
+        except (OSError, ValueError):
+            return {}
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        if self._index is None:
+            self._index = self._read_index()
+        return self._index
+
+    def _write_atomic(self, path: str, data: bytes):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _mark_dirty(self, url: str, entry: Optional[Dict[str, Any]] = None):
+        """Anota un cambio (entrada completa o solo último acceso); llamar con self._lock"""
+        if entry is not None:
+            self._pending_entries[url] = entry
+        else:
+            self._pending_access[url] = self._index[url]["lastAccess"]
+        if not self._atexit_registered:
+            atexit.register(self.flush)
+            self._atexit_registered = True
+        if len(self._pending_entries) + len(self._pending_access) >= FLUSH_EVERY:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        """
+        Fusiona los cambios pendientes con el índice en disco bajo el bloqueo
+        entre procesos y lo reescribe una vez. Llamar con self._lock
+        """
+        if not self._pending_entries and not self._pending_access:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with locked(self._index_path()):
+            index = self._read_index()
+            for url, entry in self._pending_entries.items():
+                current = index.get(url)
+                # Si otro proceso guardó una versión más reciente, se conserva
+                if current is None or current["storedAt"] <= entry["storedAt"]:
+                    index[url] = entry
+            for url, last_access in self._pending_access.items():
+                if url in index:
+                    index[url]["lastAccess"] = max(index[url]["lastAccess"], last_access)
+            self._evict(index)
+            self._write_atomic(self._index_path(), json_codec.dumps(index))
+        self._index = index
+        self._pending_entries.clear()
+        self._pending_access.clear()
+
+    def flush(self):
+        """Vuelca al disco los cambios pendientes del índice"""
+        with self._lock:
+            self._flush_locked()
+
+    # ------------------------------------------------------------------
+    # Frescura y almacenamiento
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any], now: Optional[float] = None) -> bool:
+        max_age = entry.get("maxAge")
+        if max_age is None or entry.get("noCache"):
+            return False
+        return (now or time.time()) - entry["storedAt"] < max_age
+
+    @staticmethod
+    def conditional_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("lastModified"):
+            headers["If-Modified-Since"] = entry["lastModified"]
+        return headers
+
+    def _read_body(self, url: str) -> Optional[bytes]:
+        try:
+            with open(self._body_path(url), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _store(self, url: str, status_code: int, content: bytes, headers: Dict[str, str]):
+        directives = parse_cache_control(headers.get("Cache-Control", ""))
+        if "no-store" in directives:
+            return
+
+        max_age = None
+        if directives.get("max-age"):
+            try:
+                max_age = int(directives["max-age"])
+            except ValueError:
+                max_age = None
+
+        now = time.time()
+        entry = {
+            "statusCode": status_code,
+            "etag": headers.get("ETag"),
+            "lastModified": headers.get("Last-Modified"),
+            "maxAge": max_age,
+            "noCache": "no-cache" in directives,
+            "storedAt": now,
+            "lastAccess": now,
+            "size": len(content),
+            "headers": {name: headers[name] for name in STORED_HEADERS if name in headers},
+        }
+
+        # Sin validadores ni max-age la entrada nunca podría reutilizarse
+        if not entry["etag"] and not entry["lastModified"] and max_age is None:
+            return
+
+        with self._lock:
+            self._write_atomic(self._body_path(url), content)
+            self._load_index()[url] = entry
+            self.stats["stored"] += 1
+            self._mark_dirty(url, entry)
+
+    def _refresh(self, url: str, entry: Dict[str, Any], headers: Dict[str, str]):
+        """Actualiza una entrada tras un 304 (nuevos validadores y max-age)"""
+        directives = parse_cache_control(headers.get("Cache-Control", ""))
+        with self._lock:
+            entry["storedAt"] = entry["lastAccess"] = time.time()
+            if headers.get("ETag"):
+                entry["etag"] = headers["ETag"]
+            if headers.get("Last-Modified"):
+                entry["lastModified"] = headers["Last-Modified"]
+            if (directives.get("max-age") or "").isdigit():
+                entry["maxAge"] = int(directives["max-age"])
+            self._mark_dirty(url, entry)
+
+    def _evict(self, index: Dict[str, Dict[str, Any]]):
+        """Expulsa las entradas menos usadas recientemente hasta caber en max_bytes"""
+        total = sum(entry["size"] for entry in index.values())
+        if total <= self.max_bytes:
+            return
+
+        for url, entry in sorted(index.items(), key=lambda item: item[1]["lastAccess"]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._body_path(url))
+            except OSError:
+                pass
+            del index[url]
+            total -= entry["size"]
+            self.stats["evicted"] += 1
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+
+    def get(self, session: Any, url: str, headers: Optional[Dict[str, str]] = None,
+            timeout: float = 10, **kwargs) -> Any:
+        """
+        GET con caché. `session` es cualquier objeto con un método
+        get(url, headers=..., timeout=...) compatible con requests.
+        """
+        if not self.enabled:
+            return session.get(url, headers=headers, timeout=timeout, **kwargs)
+
+        with self._lock:
+            entry = self._load_index().get(url)
+            if entry is not None:
+                entry = dict(entry)
+
+        body = self._read_body(url) if entry else None
+        if entry and body is None:
+            entry = None
+
+        if entry and self.is_fresh(entry):
+            with self._lock:
+                index = self._load_index()
+                if url in index:
+                    index[url]["lastAccess"] = time.time()
+                    self._mark_dirty(url)
+                self.stats["fresh"] += 1
+            return CachedResponse(url, entry["statusCode"], body, dict(entry["headers"]), from_cache=True)
+
+        request_headers = dict(headers or {})
+        if entry:
+            request_headers.update(self.conditional_headers(entry))
+
+        response = session.get(url, headers=request_headers, timeout=timeout, **kwargs)
+
+        if entry and response.status_code == 304:
+            with self._lock:
+                stored = self._load_index().get(url)
+            if stored is not None:
+                self._refresh(url, stored, response.headers)
+            with self._lock:
+                self.stats["revalidated"] += 1
+            return CachedResponse(url, entry["statusCode"], body, dict(entry["headers"]),
+                                  from_cache=True, revalidated=True)
+
+        with self._lock:
+            self.stats["miss"] += 1
+        if response.status_code == 200:
+            self._store(url, response.status_code, response.content, response.headers)
+        return response
+
+    def print_stats(self):
+        if not self.enabled:
+            return
+        self.flush()
+        s = self.stats
+        print(f"   🗄️ Caché HTTP: {s['fresh']} frescas, {s['revalidated']} revalidadas (304), "
+              f"{s['miss']} descargas, {s['evicted']} expulsadas")
+
+
+# Instancia compartida por todos los scripts
+HTTP_CACHE = HttpCache()
+
+
+def _self_test() -> bool:
+    """Verifica el flujo 200 → 304 → max-age contra un servidor local"""
+    import http.server
+    import requests
+
+    hits = {"200": 0, "304": 0}
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            etag = '"v1"'
+            if self.path.startswith("/fresh"):
+                body = b'{"fresh": true}'
+                self.send_response(200)
+                self.send_header("Cache-Control", "max-age=60")
+            elif self.headers.get("If-None-Match") == etag:
+                hits["304"] += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            else:
+                body = b'{"data": [1, 2, 3]}'
+                self.send_response(200)
+                self.send_header("ETag", etag)
+            hits["200"] += 1
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = HttpCache(directory, enabled=True)
+        session = requests.Session()
+        checks = [
+            ("primera descarga", cache.get(session, f"{base}/games").json() == {"data": [1, 2, 3]}),
+            ("revalidación 304", cache.get(session, f"{base}/games").revalidated),
+            ("max-age sin red", cache.get(session, f"{base}/fresh").json() == {"fresh": True}
+             and cache.get(session, f"{base}/fresh").from_cache),
+            ("peticiones al servidor", hits == {"200": 2, "304": 1}),
+        ]
+        # Los aciertos por max-age no reescriben el índice hasta el volcado
+        index_path = os.path.join(directory, INDEX_FILE)
+        cache.flush()
+        before = os.stat(index_path).st_mtime_ns
+        cache.get(session, f"{base}/fresh")
+        checks.append(("acierto sin escritura", os.stat(index_path).st_mtime_ns == before))
+        cache.flush()
+
+        # Dos instancias (procesos) con el mismo directorio no se pisan
+        other = HttpCache(directory, enabled=True)
+        other._load_index()
+        cache.get(session, f"{base}/games?otra=1")
+        cache.flush()
+        other.get(session, f"{base}/fresh?otra=1")
+        other.flush()
+        merged = HttpCache(directory, enabled=True)._load_index()
+        checks.append(("índice fusionado", {f"{base}/games?otra=1", f"{base}/fresh?otra=1"} <= set(merged)))
+        checks.append(("sin temporales", not [n for n in os.listdir(directory) if n.startswith(".tmp-")]))
+    server.shutdown()
+
+    for name, ok in checks:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return all(ok for _, ok in checks)
+
+
+if __name__ == "__main__":
+    if "--self-test" in sys.argv:
+        sys.exit(0 if _self_test() else 1)
+    print(__doc__)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Cliente HTTP compartido por todos los scripts de poblado.
+
+Una única requests.Session con pool de conexiones por host, keep-alive,
+descompresión gzip/deflate (y brotli si está instalado), timeout por defecto
+y política de reintentos unificada (backoff con jitter y circuit breaker por
+host, ver resilience.py). Así las decenas de peticiones a
+feeds.incrowdsports.com e img.euroleaguebasketball.net reutilizan conexiones
+en lugar de abrir una conexión TCP+TLS nueva por petición.
+
+Incluye contadores de conexiones abiertas frente a reutilizadas, y cada
+intento se registra en telemetry.py (latencia por host y endpoint, bytes,
+reintentos y resultado de la caché).
+
+Con EUROLEAGUE_HTTP_MODE=record|replay las respuestas se graban como fixtures
+o se sirven desde un servidor local sin red (ver replay.py).
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+import telemetry
+from http_cache import HTTP_CACHE
+from replay import HttpMode, print_replay_stats
+from resilience import BREAKERS, DEFAULT_RETRY_POLICY, RetryPolicy, execute_with_retry
+
+# Configuración por defecto
+DEFAULT_TIMEOUT = 15
+DEFAULT_POOL_CONNECTIONS = 10   # Hosts distintos con pool propio
+DEFAULT_POOL_MAXSIZE = 16       # Conexiones simultáneas por host
+DEFAULT_CONNECT_RETRIES = 2
+USER_AGENT = 'EuroLeagueApp/1.0'
+
+HTTP_MODE = HttpMode.from_environment()
+
+
+def _accept_encoding() -> str:
+    """Solo se anuncia brotli si urllib3 puede decodificarlo"""
+    try:
+        import brotli  # noqa: F401
+        return "gzip, deflate, br"
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            return "gzip, deflate, br"
+        except ImportError:
+            return "gzip, deflate"
+
+
+class ConnectionStats:
+    """Contadores de peticiones y conexiones abiertas (seguros entre hilos)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.opened = 0
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def count_connection(self):
+        with self._lock:
+            self.opened += 1
+
+    @property
+    def reused(self) -> int:
+        return max(0, self.requests - self.opened)
+
+    def snapshot(self) -> Dict[str, int]:
+        return {"requests": self.requests, "opened": self.opened, "reused": self.reused}
+
+
+CONNECTION_STATS = ConnectionStats()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        CONNECTION_STATS.count_connection()
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        CONNECTION_STATS.count_connection()
+        return super()._new_conn()
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter con timeout por defecto y recuento de conexiones"""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        CONNECTION_STATS.count_request()
+        return super().send(request, **kwargs)
+
+
+def create_session(pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                   pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                   connect_retries: int = DEFAULT_CONNECT_RETRIES,
+                   timeout: float = DEFAULT_TIMEOUT) -> requests.Session:
+    """
+    Crea una sesión con pool de conexiones. urllib3 solo reintenta fallos de
+    conexión inmediatos; los reintentos por estado HTTP (429/5xx) con backoff
+    los gestiona resilience.execute_with_retry.
+    """
+    retry = Retry(
+        connect=connect_retries,
+        read=0,
+        status=0,
+        backoff_factor=0.2,
+        raise_on_status=False,
+    )
+    adapter = PooledHTTPAdapter(
+        timeout=timeout,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept-Encoding': _accept_encoding(),
+        'Connection': 'keep-alive',
+    })
+    return session
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Devuelve la sesión compartida del proceso (se crea la primera vez)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def _record_response(url: str, response: Any, elapsed: float, cache: bool, attempt: int,
+                     stream: bool = False):
+    if not cache:
+        cache_result = telemetry.CACHE_BYPASS
+    elif getattr(response, "revalidated", False):
+        cache_result = telemetry.CACHE_REVALIDATED
+    elif getattr(response, "from_cache", False):
+        cache_result = telemetry.CACHE_FRESH
+    else:
+        cache_result = telemetry.CACHE_MISS
+    # Con stream=True no se lee el cuerpo aquí: se usa Content-Length si viene
+    if stream:
+        length = response.headers.get("Content-Length", "")
+        size = int(length) if length.isdigit() else 0
+    else:
+        size = len(response.content or b"")
+    telemetry.TELEMETRY.record_http(url, response.status_code, elapsed, size, cache_result, attempt)
+
+
+def get(url: str, headers: Optional[Dict[str, str]] = None,
+        timeout: float = DEFAULT_TIMEOUT, cache: bool = True,
+        retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY, **kwargs) -> Any:
+    """
+    GET a través de la sesión compartida y, por defecto, de la caché HTTP,
+    con reintentos y circuit breaker por host. Lanza CircuitOpenError
+    (subclase de requests.RequestException) si el host está fallando.
+    """
+    target = url
+    if HTTP_MODE.replaying:
+        # Las fixtures se sirven siempre desde el servidor local, sin caché
+        target, cache = HTTP_MODE.rewrite(url), False
+
+    attempts = 0
+
+    def send():
+        nonlocal attempts
+        attempts += 1
+        start = time.perf_counter()
+        try:
+            if cache:
+                response = HTTP_CACHE.get(get_session(), target, headers=headers, timeout=timeout, **kwargs)
+            else:
+                response = get_session().get(target, headers=headers, timeout=timeout, **kwargs)
+        except Exception as e:
+            telemetry.TELEMETRY.record_http(url, type(e).__name__, time.perf_counter() - start,
+                                            attempt=attempts)
+            raise
+        _record_response(url, response, time.perf_counter() - start, cache, attempts, kwargs.get("stream"))
+        if HTTP_MODE.recording:
+            HTTP_MODE.record(url, response)
+        return response
+
+    breaker = BREAKERS.for_host(urlparse(url).hostname or "")
+    return execute_with_retry(send, breaker, retry_policy)
+
+
+def print_connection_stats():
+    """Muestra cuántas peticiones reutilizaron una conexión abierta"""
+    stats = CONNECTION_STATS.snapshot()
+    if not stats["requests"]:
+        return
+    print(f"   🔌 Conexiones HTTP: {stats['requests']} peticiones, "
+          f"{stats['opened']} abiertas, {stats['reused']} reutilizadas")
+    print_replay_stats(HTTP_MODE)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Refresco incremental del calendario a partir de los assets ya generados.
+
+Lee el static_data.json / matches_calendar_2025_26.json anterior, determina qué
+jornadas siguen abiertas (partidos futuros, estado no final o marcador sin
+jugar) y fusiona solo esas jornadas descargadas de nuevo con el resto del
+calendario, generando un resumen de cambios (añadidos/actualizados/sin cambios).
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import json_codec
+from game_store import ADDED, UNCHANGED, UPDATED, GameStore, game_scores, is_finished
+
+# Margen para seguir refrescando partidos recién terminados (correcciones de acta)
+DEFAULT_GRACE = timedelta(hours=12)
+
+
+def load_previous_games(path: str, list_key: str) -> List[Dict[str, Any]]:
+    """Carga la lista de partidos de un asset generado anteriormente"""
+    if not os.path.exists(path):
+        return []
+
+    try:
+        data = json_codec.load(path)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ No se pudo leer {path}: {e}")
+        return []
+
+    return data.get(list_key, []) or []
+
+
+def parse_game_datetime(value: str) -> Optional[datetime]:
+    """Convierte 'YYYY-MM-DD HH:MM:SS' o ISO 8601 a datetime UTC sin zona"""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00').replace(' ', 'T'))
+    except ValueError:
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def is_game_open(game: Dict[str, Any], now: datetime, date_field: str,
+                 grace: timedelta = DEFAULT_GRACE) -> bool:
+    """Un partido puede cambiar si es futuro, no tiene estado final o no tiene marcador"""
+    if not is_finished(game):
+        return True
+
+    home_score, away_score = game_scores(game)
+    if not home_score and not away_score:
+        return True
+
+    game_date = parse_game_datetime(game.get(date_field, ''))
+    return game_date is None or game_date >= now - grace
+
+
+def open_rounds(games: Iterable[Dict[str, Any]], date_field: str,
+                now: Optional[datetime] = None, total_rounds: Optional[int] = None) -> Set[int]:
+    """
+    Devuelve las jornadas con al menos un partido que todavía puede cambiar.
+    Con `total_rounds` también se incluyen las jornadas ausentes del
+    calendario anterior (p. ej. las que fallaron en la última ejecución).
+    """
+    now = now or datetime.utcnow()
+    games = list(games)
+    rounds = {game.get('round', 0) for game in games if is_game_open(game, now, date_field)}
+
+    if total_rounds:
+        present = {game.get('round', 0) for game in games}
+        rounds.update(r for r in range(1, total_rounds + 1) if r not in present)
+
+    return rounds
+
+
+def has_fields(games: List[Dict[str, Any]], fields: Iterable[str]) -> bool:
+    """Comprueba que el asset anterior tiene el mismo formato que se va a generar"""
+    return bool(games) and all(field in games[0] for field in fields)
+
+
+def merge_games(previous: List[Dict[str, Any]], fresh: List[Dict[str, Any]]) -> tuple:
+    """
+    Fusiona los partidos descargados sobre el calendario anterior.
+
+    Los datos nuevos siempre ganan (incluye cambios de fecha u horario); los
+    partidos de jornadas no descargadas se conservan tal cual y en su orden.
+    Devuelve (partidos fusionados, changeset).
+    """
+    store = GameStore(merge=lambda existing, incoming: incoming)
+    store.add_many(previous)
+
+    changeset = {ADDED: [], UPDATED: [], UNCHANGED: []}
+    for game in fresh:
+        changeset[store.add(game)].append(game.get('id'))
+
+    return store.to_list(), changeset
+
+
+def print_changeset(changeset: Dict[str, List[Any]], rounds: Iterable[int]):
+    """Muestra el resumen de cambios del refresco incremental"""
+    rounds = sorted(rounds)
+    print(f"\n🔁 Refresco incremental: {len(rounds)} jornadas descargadas {rounds}")
+    print(f"   ➕ Añadidos: {len(changeset[ADDED])}")
+    print(f"   ✏️ Actualizados: {len(changeset[UPDATED])}")
+    print(f"   ⏸️ Sin cambios: {len(changeset[UNCHANGED])}")
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Codificación y decodificación JSON de los scripts con backend intercambiable.
+
+Usa orjson o msgspec si están instalados (opcionales) y, si no, el módulo
+json estándar. La salida es idéntica byte a byte en todos los backends al
+formato histórico de los assets (json.dumps con ensure_ascii=False e
+indent=2, o separadores compactos), de modo que cambiar de backend no cambia
+ningún SHA-256 ni provoca reescrituras:
+
+- Al cargar, cada backend se valida con un documento de prueba (escapes,
+  Unicode, contenedores vacíos, claves ordenadas); si no coincide con el
+  estándar se descarta.
+- Los floats en notación exponencial se escriben distinto (1e16 frente a
+  1e+16) y los de valor absoluto menor que 1e-4 json los escribe con
+  exponente (1.5e-05) y los backends rápidos en decimal (0.000015): si la
+  salida rápida contiene alguno de los dos, se repite con json.
+- Lo que el backend rápido no admite (enteros de más de 64 bits, claves no
+  str, NaN al leer, subclases...) también pasa a json.
+- ensure_ascii=True solo lo implementa json.
+
+EUROLEAGUE_JSON_CODEC elige el backend: auto (por defecto: orjson, msgspec,
+stdlib), orjson, msgspec o stdlib.
+
+Uso:
+    python3 scripts/json_codec.py                 # comparativa con varias temporadas sintéticas
+    python3 scripts/json_codec.py app/src/main/assets/static_data.json
+    python3 scripts/json_codec.py --self-test
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import telemetry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+BACKEND_AUTO = "auto"
+BACKEND_ORJSON = "orjson"
+BACKEND_MSGSPEC = "msgspec"
+BACKEND_STDLIB = "stdlib"
+BACKENDS = (BACKEND_ORJSON, BACKEND_MSGSPEC, BACKEND_STDLIB)
+
+# Número en notación exponencial: json escribe 1e+16 / 1e-07, los backends
+# rápidos 1e16 / 1e-7. Tras el exponente de un número solo puede venir un
+# separador, así que los ids y códigos ("E2025", UUIDs) no coinciden; si
+# coincide un texto, solo se usa json sin necesidad. Empezar por la 'e'
+# literal hace la búsqueda varias veces más rápida que con clases.
+# Entre 1e-6 y 1e-4 los backends rápidos escriben decimales (0.000015) y
+# json exponente (1.5e-05): cuatro ceros tras el punto solo aparecen en esos
+# floats (json escribe 1e-4 como 0.0001). Se busca aparte: como alternativa
+# de la expresión regular, la búsqueda pierde el atajo del literal
+_EXPONENT = re.compile(rb'e-?[0-9]+(?:[,\]}\s]|\Z)')
+_SMALL_DECIMAL = b'0.0000'
+EXPONENT_PROBE = [1e16, 1e-7, -2.5e-300, 1.5e-05, -3.9164298622776456e-05, 1e-05]
+
+# Documento con los casos en los que más fácilmente difieren los backends
+PROBE = {
+    "texto": "áéí ñ \"comillas\" \\ barra\n\t\r\b\f \x00\x1f\x7f   / 😀",
+    "vacíos": [[], {}, [[]], {"a": {}}],
+    "números": [0, -1, 2 ** 53, -(2 ** 63), 1.5, 0.1, -0.0, 100.0, 123456789.123],
+    "literales": [True, False, None],
+    "b": {"z": 1, "a": [1, {"y": 2, "x": 3}]},
+}
+
+Encoder = Callable[[Any, bool, bool], bytes]
+Decoder = Callable[[Union[bytes, str]], Any]
+
+
+def _differs_from_stdlib(content: bytes) -> bool:
+    """La salida rápida contiene floats que json escribe de otra forma"""
+    return _SMALL_DECIMAL in content or _EXPONENT.search(content) is not None
+
+
+class FallbackError(Exception):
+    """El backend rápido no puede producir la misma salida que json"""
+
+
+def _stdlib_dumps(data: Any, pretty: bool = False, sort_keys: bool = False,
+                  ensure_ascii: bool = False) -> bytes:
+    if pretty:
+        text = json.dumps(data, ensure_ascii=ensure_ascii, indent=2, sort_keys=sort_keys)
+    else:
+        text = json.dumps(data, ensure_ascii=ensure_ascii, separators=(',', ':'), sort_keys=sort_keys)
+    return text.encode('utf-8')
+
+
+def _stdlib_loads(content: Union[bytes, str]) -> Any:
+    return json.loads(content)
+
+
+def _orjson_encoder() -> Encoder:
+    # Lo que json serializa de otra forma (o no serializa) se deja sin
+    # soporte para que orjson falle y se use json
+    base = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_SUBCLASS
+
+    def encode(data: Any, pretty: bool, sort_keys: bool) -> bytes:
+        option = base | (orjson.OPT_INDENT_2 if pretty else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(data, option=option)
+        except TypeError as e:  # orjson.JSONEncodeError es subclase de TypeError
+            raise FallbackError(str(e))
+
+    return encode
+
+
+def _msgspec_encoder() -> Encoder:
+    encoders = {False: msgspec.json.Encoder(), True: msgspec.json.Encoder(order="sorted")}
+
+    def encode(data: Any, pretty: bool, sort_keys: bool) -> bytes:
+        try:
+            content = encoders[sort_keys].encode(data)
+        except (TypeError, OverflowError, msgspec.EncodeError) as e:
+            raise FallbackError(str(e))
+        return msgspec.json.format(content, indent=2) if pretty else content
+
+    return encode
+
+
+def _fast_loads(loads: Callable[[Union[bytes, str]], Any], errors: tuple) -> Decoder:
+    def decode(content: Union[bytes, str]) -> Any:
+        try:
+            return loads(content)
+        except errors:
+            # NaN, enteros enormes... json decide si es válido
+            return json.loads(content)
+    return decode
+
+
+def _backend(name: str) -> Optional[Dict[str, Any]]:
+    if name == BACKEND_ORJSON and orjson is not None:
+        return {"name": name, "encode": _orjson_encoder(), "decode": _fast_loads(orjson.loads, (orjson.JSONDecodeError,))}
+    if name == BACKEND_MSGSPEC and msgspec is not None:
+        decoder = msgspec.json.Decoder()
+        return {"name": name, "encode": _msgspec_encoder(),
+                "decode": _fast_loads(decoder.decode, (msgspec.DecodeError, TypeError))}
+    return None
+
+
+def _matches_stdlib(backend: Dict[str, Any]) -> bool:
+    """
+    Comprueba el backend con el documento de prueba en todas las variantes y
+    que sus exponentes se detectan para repetirlos con json
+    """
+    try:
+        for value in EXPONENT_PROBE:
+            if not _differs_from_stdlib(backend["encode"](value, False, False)):
+                return False
+        for pretty in (False, True):
+            for sort_keys in (False, True):
+                if backend["encode"](PROBE, pretty, sort_keys) != _stdlib_dumps(PROBE, pretty, sort_keys):
+                    return False
+        return backend["decode"](_stdlib_dumps(PROBE)) == json.loads(_stdlib_dumps(PROBE))
+    except Exception:
+        return False
+
+
+def select_backend(preferred: str = BACKEND_AUTO) -> str:
+    """Primer backend disponible y validado (stdlib siempre lo está)"""
+    candidates = BACKENDS if preferred == BACKEND_AUTO else (preferred, BACKEND_STDLIB)
+    for name in candidates:
+        if name == BACKEND_STDLIB:
+            return name
+        backend = _backend(name)
+        if backend is not None and _matches_stdlib(backend):
+            return name
+    return BACKEND_STDLIB
+
+
+class JsonCodec:
+    """Codec con un backend fijo; el del proceso es CODEC"""
+
+    def __init__(self, backend: str = BACKEND_AUTO):
+        self.backend = select_backend(backend)
+        fast = _backend(self.backend)
+        self._encode: Optional[Encoder] = fast["encode"] if fast else None
+        self._decode: Decoder = fast["decode"] if fast else _stdlib_loads
+        self.fallbacks = 0
+
+    def dumps(self, data: Any, pretty: bool = False, sort_keys: bool = False,
+              ensure_ascii: bool = False) -> bytes:
+        """Bytes UTF-8 idénticos a json.dumps(indent=2 o separadores compactos)"""
+        if self._encode is not None and not ensure_ascii:
+            try:
+                content = self._encode(data, pretty, sort_keys)
+                if not _differs_from_stdlib(content):
+                    return content
+            except FallbackError:
+                pass
+            self.fallbacks += 1
+            telemetry.incr("json_codec_fallbacks_total")
+        return _stdlib_dumps(data, pretty, sort_keys, ensure_ascii)
+
+    def loads(self, content: Union[bytes, str]) -> Any:
+        return self._decode(content)
+
+    def load(self, path: str) -> Any:
+        with open(path, 'rb') as f:
+            return self._decode(f.read())
+
+    def load_records(self, path: str, list_key: str, extractor: Callable[..., Any],
+                     *args: Any) -> Tuple[Dict[str, Any], List[Any]]:
+        """
+        Decodifica un asset y convierte su lista `list_key` en registros con
+        un extractor de game_normalizer (p. ej. from_static_data_game, con
+        `args` como parámetros de respaldo). Devuelve el documento y los
+        registros
+        """
+        data = self.load(path)
+        return data, [extractor(item, *args) for item in data.get(list_key, [])]
+
+
+CODEC = JsonCodec(os.environ.get("EUROLEAGUE_JSON_CODEC", BACKEND_AUTO))
+
+
+def dumps(data: Any, pretty: bool = False, sort_keys: bool = False, ensure_ascii: bool = False) -> bytes:
+    return CODEC.dumps(data, pretty, sort_keys, ensure_ascii)
+
+
+def loads(content: Union[bytes, str]) -> Any:
+    return CODEC.loads(content)
+
+
+def load(path: str) -> Any:
+    return CODEC.load(path)
+
+
+def load_records(path: str, list_key: str, extractor: Callable[..., Any],
+                 *args: Any) -> Tuple[Dict[str, Any], List[Any]]:
+    return CODEC.load_records(path, list_key, extractor, *args)
+
+
+# --- Comparativa y verificación -----------------------------------------------
+
+def available_codecs() -> List[JsonCodec]:
+    codecs = [JsonCodec(name) for name in BACKENDS]
+    unique = {codec.backend: codec for codec in codecs}
+    return [unique[name] for name in BACKENDS if name in unique]
+
+
+def synthetic_seasons(seasons: int) -> Dict[str, Any]:
+    """Calendario de static_data.json con `seasons` temporadas sintéticas"""
+    from benchmark_normalizer import synthetic_feed_games
+    from game_normalizer import from_feed_game, to_static_data_game
+
+    games = [to_static_data_game(from_feed_game(game)) for game in synthetic_feed_games(seasons * 380)]
+    return {"season": "histórico", "totalGames": len(games), "games": games}
+
+
+def _best(function: Callable[[], Any], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def compare_backends(name: str, data: Any, repeat: int = 5) -> bool:
+    """Tiempos de lectura/escritura por backend y comprobación de bytes idénticos"""
+    reference = {pretty: _stdlib_dumps(data, pretty) for pretty in (True, False)}
+    print(f"\n📏 {name} ({len(reference[True]):,} bytes indentado)")
+    print(f"   {'backend':<9} {'lectura':>9} {'escritura':>10} {'minificado':>10}  idéntico")
+    identical = True
+    results = []
+    for codec in available_codecs():
+        outputs = {pretty: codec.dumps(data, pretty) for pretty in (True, False)}
+        same = outputs == reference and codec.loads(reference[True]) == data
+        identical &= same
+        times = (_best(lambda: codec.loads(reference[True]), repeat),
+                 _best(lambda: codec.dumps(data, pretty=True), repeat),
+                 _best(lambda: codec.dumps(data), repeat))
+        results.append((codec.backend, times, same))
+
+    baseline = results[-1][1]  # stdlib siempre es el último
+    for backend, times, same in results:
+        speedup = " / ".join(f"{b / t:.1f}x" for b, t in zip(baseline, times))
+        print(f"   {backend:<9} {times[0]:7.1f}ms {times[1]:8.1f}ms {times[2]:8.1f}ms  "
+              f"{'✅' if same else '❌'}  {speedup if backend != BACKEND_STDLIB else ''}")
+    return identical
+
+
+def _self_test() -> bool:
+    """Bytes idénticos en cada backend disponible, incluidos los casos de respaldo"""
+    cases = [
+        PROBE,
+        {"exponentes": EXPONENT_PROBE, "texto": "1e5"},
+        {"pequeños": [1.5e-05, -3.9164298622776456e-05, 9.9e-05, 1e-4, 0.00012], "texto": "0.00001"},
+        {"grande": 2 ** 70, "texto": "a,1e5,b"},
+        {1: "clave int", 2: [1e16]},
+        1e-7,
+        {"fecha": "2025-10-01T18:00:00", "lista": (1, 2)},
+        synthetic_seasons(1),
+    ]
+    checks = []
+    for codec in available_codecs():
+        for index, case in enumerate(cases):
+            for pretty in (False, True):
+                for sort_keys in (False, True):
+                    expected = json.dumps(case, ensure_ascii=False, sort_keys=sort_keys,
+                                          **({"indent": 2} if pretty else {"separators": (',', ':')}))
+                    same = codec.dumps(case, pretty, sort_keys) == expected.encode('utf-8')
+                    checks.append((f"{codec.backend} caso {index} pretty={pretty} sort={sort_keys}", same))
+        checks.append((f"{codec.backend} NaN al leer", str(codec.loads(b'[NaN]')) == "[nan]"))
+    failed = [name for name, ok in checks if not ok]
+    for name in failed:
+        print(f"❌ {name}")
+    backends = ", ".join(codec.backend for codec in available_codecs())
+    print(f"{'✅' if not failed else '❌'} {len(checks) - len(failed)}/{len(checks)} comprobaciones ({backends})")
+    return not failed
+
+
+def main() -> int:
+    if "--self-test" in sys.argv:
+        return 0 if _self_test() else 1
+
+    parser = argparse.ArgumentParser(description="Comparativa de backends JSON")
+    parser.add_argument('files', nargs='*', help='Assets a comparar (por defecto, temporadas sintéticas)')
+    parser.add_argument('--seasons', type=int, default=26, help='Temporadas sintéticas')
+    parser.add_argument('--repeat', type=int, default=5, help='Repeticiones por medida')
+    args = parser.parse_args()
+
+    print(f"🧩 Backend activo: {CODEC.backend} (disponibles: "
+          f"{', '.join(codec.backend for codec in available_codecs())})")
+    identical = True
+    if args.files:
+        for path in args.files:
+            identical &= compare_backends(os.path.basename(path), json.loads(open(path, 'rb').read()), args.repeat)
+    else:
+        identical = compare_backends(f"{args.seasons} temporadas sintéticas", synthetic_seasons(args.seasons),
+                                     args.repeat)
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Modo vigilancia de resultados en directo.
+
+En lugar de relanzar create_static_data (clubs + 38 jornadas) para tener los
+marcadores al día durante una noche de partidos, este proceso se queda en
+marcha y usa el calendario ya generado (static_data.json) para saber qué
+partidos están en juego o a punto de empezar:
+
+- Con partidos en juego consulta solo sus jornadas cada `--fast` segundos.
+- Sin partidos en juego duerme hasta el próximo inicio (menos el margen
+  previo) o, como mucho, `--idle` segundos.
+- Cada cambio de marcador, estado u horario se emite como evento a los
+  destinos configurados (fichero JSONL y/o webhook) y se aplica sobre los
+  assets (static_data.json, matches_calendar_2025_26.json y, si algún
+  partido termina, standings_2025_26.json).
+
+Uso:
+    python3 scripts/live_watch.py                       # hasta que no queden partidos
+    python3 scripts/live_watch.py --once                # un ciclo (p. ej. desde cron)
+    python3 scripts/live_watch.py --webhook http://localhost:9000/events
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from asset_writer import FORMAT_PRETTY, GAME_TEAM_FIELDS, MATCH_TEAM_FIELDS, add_format_arguments, write_asset
+from game_store import is_finished, status_rank
+from generate_staticdatamanager_files import STATIC_DATA_DIR, static_match
+import http_client
+import json_codec
+from incremental import load_previous_games, parse_game_datetime
+from populate_game_center_data import OUTPUT_FILE, STANDINGS_FILE, feeds_game_to_game, feeds_games_url
+from resilience import INCOMPLETE
+from standings import compute_standings, write_standings_asset
+from telemetry import incr, run_report, span
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CALENDAR_FILE = os.path.join(STATIC_DATA_DIR, "matches_calendar_2025_26.json")
+DEFAULT_EVENTS_FILE = os.path.join(SCRIPT_DIR, ".live_events.jsonl")
+
+DEFAULT_FAST_INTERVAL = 20.0        # segundos entre consultas con partidos en juego
+DEFAULT_IDLE_INTERVAL = 15 * 60.0   # máximo entre comprobaciones sin partidos
+PRE_GAME = timedelta(minutes=15)    # se empieza a vigilar antes del salto inicial
+GAME_WINDOW = timedelta(hours=3)    # tras el inicio, si el feed aún no lo da por terminado
+
+# Peticiones de un refresco completo (clubs + 38 jornadas), para comparar
+FULL_REFRESH_REQUESTS = 1 + 38
+
+EVENT_SCORE = "score"
+EVENT_STATUS = "status"
+EVENT_SCHEDULE = "schedule"
+
+# Campos de static_data.json que se vigilan y su equivalente en el calendario
+WATCHED_FIELDS = {"homeScore": "homeScore", "awayScore": "awayScore", "status": "status", "date": "dateTime"}
+
+
+def is_live(game: Dict[str, Any], now: datetime) -> bool:
+    """En juego o a punto de empezar: no terminado y dentro de la ventana del partido"""
+    if is_finished(game):
+        return False
+    if status_rank(game) == 2:
+        return True
+    start = parse_game_datetime(game.get('date', ''))
+    return start is not None and start - PRE_GAME <= now <= start + GAME_WINDOW
+
+
+def live_rounds(games: Iterable[Dict[str, Any]], now: datetime) -> Set[int]:
+    return {game.get('round', 0) for game in games if is_live(game, now)}
+
+
+def next_start(games: Iterable[Dict[str, Any]], now: datetime) -> Optional[datetime]:
+    """Inicio del próximo partido pendiente (None si no queda ninguno)"""
+    starts = [parse_game_datetime(game.get('date', '')) for game in games if not is_finished(game)]
+    return min((start for start in starts if start is not None and start > now), default=None)
+
+
+def diff_game(old: Dict[str, Any], new: Dict[str, Any], at: str) -> List[Dict[str, Any]]:
+    """Eventos de cambio entre dos versiones de un partido de static_data.json"""
+    base = {
+        "gameId": old.get('id'),
+        "round": old.get('round'),
+        "homeTeamId": old.get('homeTeamId'),
+        "awayTeamId": old.get('awayTeamId'),
+        "at": at,
+    }
+    events = []
+    old_score = (old.get('homeScore'), old.get('awayScore'))
+    new_score = (new.get('homeScore'), new.get('awayScore'))
+    if new_score != old_score:
+        events.append({**base, "type": EVENT_SCORE, "from": list(old_score), "to": list(new_score)})
+    if new.get('status') != old.get('status'):
+        events.append({**base, "type": EVENT_STATUS, "from": old.get('status'), "to": new.get('status')})
+    if new.get('date') and new.get('date') != old.get('date'):
+        events.append({**base, "type": EVENT_SCHEDULE, "from": old.get('date'), "to": new.get('date')})
+    return events
+
+
+class JsonlSink:
+    """Añade cada evento como una línea JSON"""
+
+    def __init__(self, path: str = DEFAULT_EVENTS_FILE):
+        self.path = path
+
+    def emit(self, events: List[Dict[str, Any]]):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for event in events:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+
+class WebhookSink:
+    """POST con la lista de eventos de cada ciclo; si falla se anota y se sigue"""
+
+    def __init__(self, url: str, timeout: float = 10):
+        self.url = url
+        self.timeout = timeout
+
+    def emit(self, events: List[Dict[str, Any]]):
+        try:
+            response = http_client.get_session().post(self.url, json={"events": events}, timeout=self.timeout)
+            response.raise_for_status()
+        except Exception as e:
+            INCOMPLETE.record("webhook", self.url, str(e))
+
+
+@dataclass
+class WatchStats:
+    polls: int = 0
+    requests: int = 0
+    failed_requests: int = 0
+    events: Dict[str, int] = field(default_factory=dict)
+    writes: int = 0
+
+    @property
+    def saved_requests(self) -> int:
+        return self.polls * FULL_REFRESH_REQUESTS - self.requests
+
+
+class LiveWatcher:
+    """Bucle de vigilancia sobre el calendario de static_data.json"""
+
+    def __init__(self, static_data_file: str = OUTPUT_FILE, calendar_file: str = CALENDAR_FILE,
+                 standings_file: str = STANDINGS_FILE, sinks: Iterable[Any] = (),
+                 fast_interval: float = DEFAULT_FAST_INTERVAL, idle_interval: float = DEFAULT_IDLE_INTERVAL,
+                 output_format: str = FORMAT_PRETTY,
+                 clock: Callable[[], datetime] = datetime.utcnow,
+                 sleep: Callable[[float], None] = time.sleep,
+                 fetch_round: Optional[Callable[[int], List[Dict[str, Any]]]] = None):
+        self.static_data_file = static_data_file
+        self.calendar_file = calendar_file
+        self.standings_file = standings_file
+        self.sinks = list(sinks)
+        self.fast_interval = fast_interval
+        self.idle_interval = idle_interval
+        self.output_format = output_format
+        self.clock = clock
+        self.sleep = sleep
+        self.fetch_round = fetch_round or self._fetch_round
+        self.stats = WatchStats()
+        self.games: List[Dict[str, Any]] = load_previous_games(static_data_file, 'games')
+
+    @staticmethod
+    def _fetch_round(round_num: int) -> List[Dict[str, Any]]:
+        # Sin caché HTTP: un max-age del feed dejaría el marcador congelado
+        response = http_client.get(feeds_games_url(round_num), timeout=15, cache=False)
+        response.raise_for_status()
+        return [feeds_game_to_game(game, round_num) for game in json_codec.loads(response.content).get('data', [])]
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """Un ciclo: consulta las jornadas en juego y aplica los cambios"""
+        now = self.clock()
+        rounds = sorted(live_rounds(self.games, now))
+        self.stats.polls += 1
+        if not rounds:
+            return []
+
+        by_id = {game.get('id'): game for game in self.games}
+        at = now.isoformat()
+        events = []
+        with span("watch.poll", rounds=len(rounds)):
+            for round_num in rounds:
+                self.stats.requests += 1
+                try:
+                    fresh = self.fetch_round(round_num)
+                except Exception as e:
+                    self.stats.failed_requests += 1
+                    INCOMPLETE.record("jornada", round_num, str(e))
+                    continue
+                for game in fresh:
+                    current = by_id.get(game.get('id'))
+                    if current is None:
+                        continue
+                    changes = diff_game(current, game, at)
+                    if changes:
+                        current.update({name: game[name] for name in WATCHED_FIELDS if name in game})
+                        events.extend(changes)
+
+        if events:
+            self._publish(events)
+            self._patch_assets(events)
+        return events
+
+    def _publish(self, events: List[Dict[str, Any]]):
+        for event in events:
+            self.stats.events[event["type"]] = self.stats.events.get(event["type"], 0) + 1
+            incr("watch_events_total", type=event["type"])
+            print_event(event)
+        for sink in self.sinks:
+            sink.emit(events)
+
+    def _patch_assets(self, events: List[Dict[str, Any]]):
+        """Aplica los partidos cambiados sobre los assets ya generados"""
+        changed = {event["gameId"] for event in events}
+        by_id = {game.get('id'): game for game in self.games}
+        with span("watch.write", games=len(changed)):
+            static_data = json_codec.load(self.static_data_file)
+            static_data["games"] = self.games
+            static_data["lastUpdated"] = datetime.now().isoformat()
+            write_asset(self.static_data_file, static_data, self.output_format, list_key="games",
+                        dict_fields=GAME_TEAM_FIELDS)
+
+            if os.path.exists(self.calendar_file):
+                calendar = json_codec.load(self.calendar_file)
+                for match in calendar.get("matches", []):
+                    if match.get("id") in changed and match["id"] in by_id:
+                        fresh = static_match(by_id[match["id"]], match.get("season", "E2025"))
+                        match.update({target: fresh[target] for target in WATCHED_FIELDS.values()})
+                calendar["lastUpdated"] = datetime.now().isoformat()
+                write_asset(self.calendar_file, calendar, self.output_format, list_key="matches",
+                            dict_fields=MATCH_TEAM_FIELDS)
+
+            if any(event["type"] == EVENT_STATUS and is_finished({"status": event["to"]}) for event in events):
+                teams = (team.get('id') for team in static_data.get('teams', []))
+                table = compute_standings(self.games, teams)
+                write_standings_asset(self.standings_file, table, static_data.get('season', "2025-26"),
+                                      self.output_format)
+        self.stats.writes += 1
+
+    def next_interval(self) -> Optional[float]:
+        """Segundos hasta el próximo ciclo (None si ya no quedan partidos por jugar)"""
+        now = self.clock()
+        if live_rounds(self.games, now):
+            return self.fast_interval
+        start = next_start(self.games, now)
+        if start is None:
+            return None
+        until_window = (start - PRE_GAME - now).total_seconds()
+        return max(1.0, min(self.idle_interval, until_window))
+
+    def run(self, max_polls: Optional[int] = None) -> WatchStats:
+        while max_polls is None or self.stats.polls < max_polls:
+            self.poll()
+            interval = self.next_interval()
+            if interval is None:
+                print("🏁 No quedan partidos pendientes en el calendario")
+                break
+            if max_polls is not None and self.stats.polls >= max_polls:
+                break
+            mode = "en juego" if interval == self.fast_interval else "en espera"
+            print(f"   ⏱️ {self.clock():%H:%M:%S} UTC · {mode} · próximo ciclo en {interval:.0f}s")
+            self.sleep(interval)
+        return self.stats
+
+
+def print_event(event: Dict[str, Any]):
+    teams = f"{event['homeTeamId']}-{event['awayTeamId']}"
+    if event["type"] == EVENT_SCORE:
+        print(f"   🏀 J{event['round']} {teams}: {event['to'][0]}-{event['to'][1]}")
+    elif event["type"] == EVENT_STATUS:
+        print(f"   🔄 J{event['round']} {teams}: {event['from']} → {event['to']}")
+    else:
+        print(f"   📅 J{event['round']} {teams}: {event['from']} → {event['to']}")
+
+
+def print_watch_summary(stats: WatchStats):
+    events = ", ".join(f"{count} {name}" for name, count in sorted(stats.events.items())) or "ninguno"
+    print(f"\n📊 Vigilancia: {stats.polls} ciclos, {stats.requests} peticiones "
+          f"({stats.failed_requests} fallidas), {stats.writes} actualizaciones de assets")
+    print(f"   📣 Eventos: {events}")
+    print(f"   📉 Peticiones ahorradas frente a refrescos completos: {max(0, stats.saved_requests)} "
+          f"({stats.polls} × {FULL_REFRESH_REQUESTS})")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Vigilancia de resultados en directo")
+    parser.add_argument('--fast', type=float, default=DEFAULT_FAST_INTERVAL,
+                        help='Segundos entre consultas con partidos en juego')
+    parser.add_argument('--idle', type=float, default=DEFAULT_IDLE_INTERVAL,
+                        help='Máximo de segundos entre comprobaciones sin partidos')
+    parser.add_argument('--once', action='store_true', help='Ejecutar un solo ciclo')
+    parser.add_argument('--max-polls', type=int, default=None, help='Terminar tras N ciclos')
+    parser.add_argument('--events', default=DEFAULT_EVENTS_FILE, help='Fichero JSONL de eventos ("" para desactivar)')
+    parser.add_argument('--webhook', default=None, help='URL a la que enviar los eventos por POST')
+    add_format_arguments(parser)
+    args = parser.parse_args()
+
+    sinks: List[Any] = []
+    if args.events:
+        sinks.append(JsonlSink(args.events))
+    if args.webhook:
+        sinks.append(WebhookSink(args.webhook))
+
+    watcher = LiveWatcher(sinks=sinks, fast_interval=args.fast, idle_interval=args.idle, output_format=args.format)
+    if not watcher.games:
+        print(f"❌ No hay calendario en {OUTPUT_FILE}: ejecuta antes populate_game_center_data.py")
+        return 1
+
+    print(f"👀 Vigilando {len(watcher.games)} partidos (cada {args.fast:.0f}s en juego, "
+          f"hasta {args.idle:.0f}s en espera)")
+    try:
+        watcher.run(1 if args.once else args.max_polls)
+    except KeyboardInterrupt:
+        print("\n⏹️ Vigilancia detenida")
+    print_watch_summary(watcher.stats)
+    http_client.print_connection_stats()
+    INCOMPLETE.print_report()
+    return 0
+
+
+if __name__ == "__main__":
+    with run_report("live_watch"):
+        sys.exit(main())
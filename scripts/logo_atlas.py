@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Atlas de logos: empaqueta todos los escudos en una sola imagen.
+
+En las listas la app abre y decodifica un PNG por equipo. Con el atlas basta
+con abrir team_logos/atlas.png una vez y recortar cada escudo con los
+rectángulos de team_logos/atlas.json:
+
+    {
+      "image": "atlas.png",
+      "width": 512, "height": 256, "padding": 2,
+      "sprites": {"MAD": {"x": 2, "y": 2, "w": 128, "h": 128}, ...}
+    }
+
+El empaquetado es por estantes (shelf packing): las imágenes se ordenan por
+altura y se colocan de izquierda a derecha en filas; se prueban varios anchos
+y se elige el de menor área. Opcionalmente ancho y alto se redondean a
+potencia de dos.
+
+Uso:
+    python3 scripts/logo_atlas.py [--padding N] [--no-power-of-two]
+    python3 scripts/download_team_logos.py --atlas
+    python3 scripts/create_team_logos.py --atlas
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from asset_writer import write_if_changed
+from telemetry import run_report
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+LOGOS_DIR = os.path.join(PROJECT_ROOT, "app", "src", "main", "assets", "team_logos")
+
+ATLAS_IMAGE = "atlas.png"
+ATLAS_INDEX = "atlas.json"
+LOGO_SUFFIX = "_logo.png"
+DEFAULT_PADDING = 2
+MAX_ATLAS_SIZE = 4096
+
+
+@dataclass
+class Atlas:
+    width: int
+    height: int
+    padding: int
+    rects: Dict[str, Tuple[int, int, int, int]] = field(default_factory=dict)
+    image: Optional[Image.Image] = None
+
+    def index(self, image_name: str = ATLAS_IMAGE) -> Dict:
+        return {
+            "version": 1,
+            "image": image_name,
+            "width": self.width,
+            "height": self.height,
+            "padding": self.padding,
+            "sprites": {
+                code: {"x": x, "y": y, "w": w, "h": h}
+                for code, (x, y, w, h) in sorted(self.rects.items())
+            },
+        }
+
+
+def next_power_of_two(value: int) -> int:
+    return 1 << max(0, value - 1).bit_length()
+
+
+def shelf_pack(sizes: Dict[str, Tuple[int, int]], width: int, padding: int) -> Tuple[Dict[str, Tuple[int, int]], int]:
+    """
+    Coloca las imágenes en estantes de ancho `width`. Devuelve las posiciones
+    (esquina superior izquierda) y la altura total usada.
+    """
+    order = sorted(sizes, key=lambda code: (-sizes[code][1], -sizes[code][0], code))
+    positions = {}
+    x = y = shelf_height = 0
+    for code in order:
+        w, h = sizes[code]
+        cell_w, cell_h = w + 2 * padding, h + 2 * padding
+        if x + cell_w > width and x > 0:
+            y += shelf_height
+            x = shelf_height = 0
+        positions[code] = (x + padding, y + padding)
+        x += cell_w
+        shelf_height = max(shelf_height, cell_h)
+    return positions, y + shelf_height
+
+
+def plan_atlas(sizes: Dict[str, Tuple[int, int]], padding: int = DEFAULT_PADDING,
+               power_of_two: bool = True) -> Atlas:
+    """Elige el ancho de estante que minimiza el área del atlas"""
+    if not sizes:
+        return Atlas(0, 0, padding)
+
+    widest = max(w for w, _ in sizes.values()) + 2 * padding
+    total_width = sum(w + 2 * padding for w, _ in sizes.values())
+    candidates = set()
+    width = widest
+    while width < total_width:
+        candidates.add(next_power_of_two(width) if power_of_two else width)
+        width += widest
+    candidates.add(next_power_of_two(total_width) if power_of_two else total_width)
+
+    best = None
+    for width in sorted(candidates):
+        positions, height = shelf_pack(sizes, width, padding)
+        if power_of_two:
+            height = next_power_of_two(height)
+        else:
+            width = max(x + sizes[code][0] + padding for code, (x, _) in positions.items())
+        if width > MAX_ATLAS_SIZE or height > MAX_ATLAS_SIZE:
+            continue
+        key = (width * height, max(width, height))
+        if best is None or key < best[0]:
+            best = (key, width, height, positions)
+
+    if best is None:
+        raise ValueError(f"Los logos no caben en un atlas de {MAX_ATLAS_SIZE}x{MAX_ATLAS_SIZE}")
+
+    _, width, height, positions = best
+    rects = {code: (x, y, sizes[code][0], sizes[code][1]) for code, (x, y) in positions.items()}
+    return Atlas(width, height, padding, rects)
+
+
+def find_logos(logos_dir: str = LOGOS_DIR) -> Dict[str, str]:
+    """{CÓDIGO: ruta} de los {code}_logo.png de la carpeta"""
+    logos = {}
+    for name in sorted(os.listdir(logos_dir)):
+        if name.endswith(LOGO_SUFFIX):
+            logos[name[:-len(LOGO_SUFFIX)].upper()] = os.path.join(logos_dir, name)
+    return logos
+
+
+def build_atlas(logo_paths: Dict[str, str], padding: int = DEFAULT_PADDING,
+                power_of_two: bool = True) -> Atlas:
+    images = {}
+    for code, path in logo_paths.items():
+        with Image.open(path) as img:
+            images[code] = img.convert('RGBA')
+
+    atlas = plan_atlas({code: img.size for code, img in images.items()}, padding, power_of_two)
+    atlas.image = Image.new('RGBA', (atlas.width, atlas.height), (0, 0, 0, 0))
+    for code, (x, y, _, _) in atlas.rects.items():
+        atlas.image.paste(images[code], (x, y))
+    return atlas
+
+
+def write_atlas(atlas: Atlas, logos_dir: str = LOGOS_DIR) -> Tuple[str, str]:
+    """Escribe atlas.png y atlas.json (solo si cambian). Devuelve sus rutas"""
+    image_path = os.path.join(logos_dir, ATLAS_IMAGE)
+    index_path = os.path.join(logos_dir, ATLAS_INDEX)
+
+    buffer = io.BytesIO()
+    atlas.image.save(buffer, "PNG", optimize=True)
+    write_if_changed(image_path, buffer.getvalue())
+    write_if_changed(index_path, json.dumps(atlas.index(), indent=2).encode('utf-8'))
+    return image_path, index_path
+
+
+def print_atlas_report(atlas: Atlas, logo_paths: Dict[str, str], image_path: str, index_path: str):
+    individual = sum(os.path.getsize(path) for path in logo_paths.values())
+    packed = os.path.getsize(image_path) + os.path.getsize(index_path)
+    used = sum(w * h for _, _, w, h in atlas.rects.values())
+    fill = used / (atlas.width * atlas.height) * 100 if atlas.width else 0
+
+    print(f"\n🧩 Atlas de logos: {atlas.width}x{atlas.height} px, {len(atlas.rects)} escudos, "
+          f"padding {atlas.padding} px, ocupación {fill:.0f}%")
+    print(f"   {'':<14} {'Ficheros':>8} {'Bytes':>10}")
+    print(f"   {'PNG sueltos':<14} {len(logo_paths):>8} {individual:>10,}")
+    print(f"   {'Atlas + índice':<14} {2:>8} {packed:>10,}")
+    if individual:
+        ratio = packed / individual * 100
+        icon = "📉" if packed <= individual else "📈"
+        print(f"   {icon} {ratio:.0f}% de los bytes, {len(logo_paths) - 2} aperturas de asset menos")
+
+
+def build_logo_atlas(logos_dir: str = LOGOS_DIR, codes: Optional[List[str]] = None,
+                     padding: int = DEFAULT_PADDING, power_of_two: bool = True) -> Atlas:
+    """Empaqueta los logos de la carpeta (o solo `codes`), escribe el atlas e imprime el informe"""
+    logo_paths = find_logos(logos_dir)
+    if codes is not None:
+        wanted = {code.upper() for code in codes}
+        logo_paths = {code: path for code, path in logo_paths.items() if code in wanted}
+
+    atlas = build_atlas(logo_paths, padding, power_of_two)
+    image_path, index_path = write_atlas(atlas, logos_dir)
+    print_atlas_report(atlas, logo_paths, image_path, index_path)
+    return atlas
+
+
+def add_atlas_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--atlas', action='store_true', help='Empaquetar además los logos en team_logos/atlas.png')
+    parser.add_argument('--atlas-padding', type=int, default=DEFAULT_PADDING,
+                        help='Separación en píxeles alrededor de cada logo del atlas')
+    parser.add_argument('--no-power-of-two', dest='power_of_two', action='store_false',
+                        help='No redondear el tamaño del atlas a potencia de dos')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Empaqueta los logos de equipos en un atlas")
+    parser.add_argument('--padding', type=int, default=DEFAULT_PADDING, help='Separación en píxeles')
+    parser.add_argument('--no-power-of-two', dest='power_of_two', action='store_false',
+                        help='No redondear el tamaño del atlas a potencia de dos')
+    parser.add_argument('--logos-dir', default=LOGOS_DIR, help='Carpeta con los {code}_logo.png')
+    args = parser.parse_args()
+
+    build_logo_atlas(args.logos_dir, padding=args.padding, power_of_two=args.power_of_two)
+    return 0
+
+
+if __name__ == "__main__":
+    with run_report("logo_atlas"):
+        sys.exit(main())
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Optimización de los escudos descargados antes de meterlos en el APK.
+
+El CDN devuelve PNG con metadatos (EXIF, XMP, dpi) y a veces a más resolución
+de la que muestra la app (~90 px). Para cada logo:
+
+1. Se redimensiona (sin ampliar) para que quepa en `max_size` px
+2. Se eliminan los metadatos (se vuelve a codificar solo con los píxeles)
+3. Se cuantiza a paleta de 256 colores si el error medio por canal no supera
+   MAX_QUANTIZE_ERROR; si no, se mantiene en color verdadero
+4. Se escribe el PNG optimizado ({code}_logo.png, la ruta que usa la app) y
+   una variante WebP ({code}_logo.webp): sin pérdida si cabe en el
+   presupuesto por imagen y, si no, con pérdida bajando la calidad
+   (WEBP_QUALITIES) hasta que quepa. La app aún no carga WebP, así que la
+   variante se deja fuera de los assets (WEBP_DIR, no se empaqueta)
+
+Los logos se procesan en un pool de procesos. Un manifiesto guarda, por
+equipo, el SHA-256 de los bytes de origen y el del PNG optimizado; si llega el
+mismo origen (o el propio PNG optimizado, al optimizar in situ) y el PNG no
+ha cambiado desde entonces, no se vuelve a procesar.
+
+Uso:
+    python3 scripts/logo_optimizer.py [--max-size 90] [--budget 6144] [--force]
+    python3 scripts/download_team_logos.py --optimize
+"""
+
+import argparse
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageChops, ImageStat
+
+from asset_writer import record_worker_writes, sha256_bytes, sha256_file, write_atomic, write_if_changed
+import json_codec
+from telemetry import run_report
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+LOGOS_DIR = os.path.join(PROJECT_ROOT, "app", "src", "main", "assets", "team_logos")
+# Directorio de build (no se empaqueta) para los WebP que la app todavía no usa
+WEBP_DIR = os.path.join(PROJECT_ROOT, "app", "build", "generated", "team_logos", "webp")
+MANIFEST_FILE = ".optimized.json"
+LOGO_SUFFIX = "_logo.png"
+
+DEFAULT_MAX_SIZE = 90
+DEFAULT_BUDGET_BYTES = 6 * 1024
+MAX_QUANTIZE_ERROR = 1.5
+WEBP_QUALITIES = (90, 85, 80, 75, 70)
+
+
+@dataclass
+class LogoSource:
+    """Logo a optimizar: bytes originales y PNG de destino"""
+    team_code: str
+    content: bytes
+    png_path: str
+
+
+@dataclass
+class OptimizedLogo:
+    team_code: str
+    png_path: str
+    original_bytes: int = 0
+    png_bytes: int = 0
+    webp_bytes: int = 0
+    size: Tuple[int, int] = (0, 0)
+    quantized: bool = False
+    webp_quality: Optional[int] = None  # None = sin pérdida
+    over_budget: bool = False
+    written: int = 0
+    bytes_written: int = 0
+    skipped: bool = False
+    error: Optional[str] = None
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - self.png_bytes
+
+
+def webp_path(png_path: str, webp_dir: str = WEBP_DIR) -> str:
+    return os.path.join(webp_dir, os.path.splitext(os.path.basename(png_path))[0] + ".webp")
+
+
+def _encode(img: Image.Image, fmt: str, **params) -> bytes:
+    buffer = io.BytesIO()
+    img.save(buffer, fmt, **params)
+    return buffer.getvalue()
+
+
+def quantize(img: Image.Image) -> Optional[Image.Image]:
+    """Versión con paleta de 256 colores, o None si se nota la diferencia"""
+    paletted = img.quantize(colors=256, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+    error = ImageStat.Stat(ImageChops.difference(img, paletted.convert('RGBA'))).mean
+    return paletted if max(error) <= MAX_QUANTIZE_ERROR else None
+
+
+def encode_webp(img: Image.Image, budget: int) -> Tuple[bytes, Optional[int]]:
+    """WebP sin pérdida si cabe en el presupuesto; si no, la mayor calidad que quepa"""
+    best, best_quality = _encode(img, "WEBP", lossless=True, quality=80, method=4), None
+    if len(best) <= budget:
+        return best, None
+    for quality in WEBP_QUALITIES:
+        lossy = _encode(img, "WEBP", quality=quality, method=4, alpha_quality=100)
+        if len(lossy) <= budget:
+            return lossy, quality
+        if len(lossy) < len(best):
+            best, best_quality = lossy, quality
+    return best, best_quality
+
+
+def optimize_image(content: bytes, max_size: int = DEFAULT_MAX_SIZE,
+                   budget: int = DEFAULT_BUDGET_BYTES) -> Tuple[bytes, bytes, Dict]:
+    """Devuelve (PNG, WebP, detalles) a partir de los bytes originales"""
+    with Image.open(io.BytesIO(content)) as source:
+        source.load()
+    img = source.convert('RGBA')
+    resized = max(img.size) > max_size
+    if resized:
+        img.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+
+    # Al volver a codificar solo se guardan los píxeles: se pierden EXIF, XMP y dpi.
+    # Se queda el PNG más pequeño entre color verdadero, paleta propia y la
+    # paleta original (si ya venía con paleta y no se ha redimensionado)
+    paletted = quantize(img)
+    candidates = [(_encode(img, "PNG", optimize=True), False)]
+    if paletted is not None:
+        candidates.append((_encode(paletted, "PNG", optimize=True), True))
+    if not resized and source.mode == 'P':
+        params = {"transparency": source.info["transparency"]} if "transparency" in source.info else {}
+        candidates.append((_encode(source, "PNG", optimize=True, **params), True))
+    png, quantized = min(candidates, key=lambda candidate: len(candidate[0]))
+
+    webp, quality = encode_webp(img, budget)
+    return png, webp, {"size": img.size, "quantized": quantized, "webp_quality": quality}
+
+
+def _optimize_source(args: Tuple[LogoSource, int, int, str]) -> OptimizedLogo:
+    source, max_size, budget, webp_dir = args
+    result = OptimizedLogo(source.team_code, source.png_path, original_bytes=len(source.content))
+    try:
+        png, webp, details = optimize_image(source.content, max_size, budget)
+        result.png_bytes, result.webp_bytes = len(png), len(webp)
+        result.size = details["size"]
+        result.quantized = details["quantized"]
+        result.webp_quality = details["webp_quality"]
+        result.over_budget = len(webp) > budget
+        for path, data in ((source.png_path, png), (webp_path(source.png_path, webp_dir), webp)):
+            if write_if_changed(path, data):
+                result.written += 1
+                result.bytes_written += len(data)
+    except Exception as e:
+        result.error = str(e)
+    return result
+
+
+def load_manifest(logos_dir: str = LOGOS_DIR) -> Dict[str, Dict[str, str]]:
+    try:
+        return json_codec.load(os.path.join(logos_dir, MANIFEST_FILE))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest: Dict[str, Dict[str, str]], logos_dir: str = LOGOS_DIR):
+    write_atomic(os.path.join(logos_dir, MANIFEST_FILE),
+                 json_codec.dumps(manifest, pretty=True, sort_keys=True))
+
+
+def _is_optimized(source: LogoSource, entry: Any, webp_dir: str) -> bool:
+    """El origen ya se optimizó (descarga original o PNG optimizado) y las salidas siguen intactas"""
+    if not isinstance(entry, dict):
+        return False
+    return (sha256_bytes(source.content) in (entry.get("source"), entry.get("png"))
+            and sha256_file(source.png_path) == entry.get("png")
+            and os.path.exists(webp_path(source.png_path, webp_dir)))
+
+
+def optimize_logos(sources: Sequence[LogoSource], logos_dir: str = LOGOS_DIR,
+                   max_size: int = DEFAULT_MAX_SIZE, budget: int = DEFAULT_BUDGET_BYTES,
+                   jobs: Optional[int] = None, force: bool = False,
+                   webp_dir: str = WEBP_DIR) -> List[OptimizedLogo]:
+    """
+    Optimiza los logos en paralelo. Se omiten los que ya se optimizaron a
+    partir de los mismos bytes (ver _is_optimized).
+    """
+    manifest = load_manifest(logos_dir)
+    results: Dict[str, OptimizedLogo] = {}
+    pending = []
+    for source in sources:
+        if not force and _is_optimized(source, manifest.get(source.team_code), webp_dir):
+            results[source.team_code] = OptimizedLogo(source.team_code, source.png_path, len(source.content),
+                                                      os.path.getsize(source.png_path),
+                                                      os.path.getsize(webp_path(source.png_path, webp_dir)),
+                                                      skipped=True)
+        else:
+            pending.append(source)
+
+    work = [(source, max_size, budget, webp_dir) for source in pending]
+    if len(work) > 1 and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            optimized = list(executor.map(_optimize_source, work))
+        for result in optimized:
+            record_worker_writes(result.written, result.bytes_written,
+                                 2 - result.written if result.error is None else 0)
+    else:
+        optimized = [_optimize_source(item) for item in work]
+
+    for source, result in zip(pending, optimized):
+        results[result.team_code] = result
+        if result.error is None:
+            manifest[result.team_code] = {"source": sha256_bytes(source.content),
+                                          "png": sha256_file(result.png_path)}
+        else:
+            manifest.pop(result.team_code, None)
+
+    if pending:
+        save_manifest(manifest, logos_dir)
+    return [results[source.team_code] for source in sources]
+
+
+def sources_from_dir(logos_dir: str = LOGOS_DIR) -> List[LogoSource]:
+    """Los {code}_logo.png de la carpeta como fuentes (optimización in situ)"""
+    sources = []
+    for name in sorted(os.listdir(logos_dir)):
+        if name.endswith(LOGO_SUFFIX):
+            path = os.path.join(logos_dir, name)
+            with open(path, 'rb') as f:
+                sources.append(LogoSource(name[:-len(LOGO_SUFFIX)].upper(), f.read(), path))
+    return sources
+
+
+def print_optimization_report(results: Sequence[OptimizedLogo], budget: int = DEFAULT_BUDGET_BYTES):
+    print(f"\n🗜️ Optimización de logos (presupuesto WebP {budget:,} bytes)")
+    print(f"   {'Equipo':<6} {'Original':>9} {'PNG':>8} {'WebP':>8} {'Ahorro':>8}  Detalle")
+    for r in results:
+        if r.error:
+            print(f"   {r.team_code:<6} ❌ {r.error}")
+            continue
+        if r.skipped:
+            detail = "⏸️ ya optimizado"
+        else:
+            detail = f"{r.size[0]}x{r.size[1]}"
+            detail += ", paleta" if r.quantized else ", RGBA"
+            detail += ", webp sin pérdida" if r.webp_quality is None else f", webp q{r.webp_quality}"
+            if r.over_budget:
+                detail += " ⚠️ excede presupuesto"
+        print(f"   {r.team_code:<6} {r.original_bytes:>9,} {r.png_bytes:>8,} {r.webp_bytes:>8,} "
+              f"{r.saved_bytes:>8,}  {detail}")
+
+    done = [r for r in results if not r.error]
+    original = sum(r.original_bytes for r in done)
+    png = sum(r.png_bytes for r in done)
+    webp = sum(r.webp_bytes for r in done)
+    if original:
+        print(f"   📉 PNG: {original:,} → {png:,} bytes ({(original - png) / original * 100:.0f}% menos); "
+              f"WebP: {webp:,} bytes ({(original - webp) / original * 100:.0f}% menos)")
+
+
+def add_optimize_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--optimize', action='store_true',
+                        help='Redimensionar, quitar metadatos, cuantizar y generar WebP (fuera del APK) de los logos')
+    parser.add_argument('--max-size', type=int, default=DEFAULT_MAX_SIZE,
+                        help='Lado máximo en píxeles de los logos optimizados')
+    parser.add_argument('--budget', type=int, default=DEFAULT_BUDGET_BYTES,
+                        help='Tamaño máximo en bytes de cada WebP')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Optimiza los logos de team_logos/ in situ")
+    parser.add_argument('--max-size', type=int, default=DEFAULT_MAX_SIZE, help='Lado máximo en píxeles')
+    parser.add_argument('--budget', type=int, default=DEFAULT_BUDGET_BYTES, help='Bytes máximos por WebP')
+    parser.add_argument('--jobs', type=int, default=None, help='Procesos en paralelo (por defecto, CPUs)')
+    parser.add_argument('--force', action='store_true', help='Reprocesar aunque ya estén optimizados')
+    parser.add_argument('--logos-dir', default=LOGOS_DIR, help='Carpeta con los {code}_logo.png')
+    args = parser.parse_args()
+
+    results = optimize_logos(sources_from_dir(args.logos_dir), args.logos_dir, args.max_size,
+                             args.budget, args.jobs, args.force)
+    print_optimization_report(results, args.budget)
+    return 1 if any(r.error for r in results) else 0
+
+
+if __name__ == "__main__":
+    with run_report("logo_optimizer"):
+        sys.exit(main())
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Motor de renderizado de logos provisionales (círculo con las iniciales).
+
+- La fuente TrueType se resuelve una sola vez por proceso y cada tamaño se
+  carga una vez (caché por tamaño).
+- Los equipos se renderizan en un pool de procesos.
+- Cada logo se genera en todas las densidades de Android (mdpi → xxxhdpi) en
+  PNG y WebP en una sola pasada. Solo el PNG de 128 px (xhdpi) va a los assets,
+  en team_logos/{code}_logo.png, que es la ruta que usa la app; las variantes
+  por densidad se dejan en app/build/generated/team_logos/<densidad>/, fuera
+  del APK, hasta que la app las consuma.
+- Un manifiesto guarda el hash de las entradas de cada equipo (código,
+  colores, tamaño, densidades y formatos); si coincide y los ficheros existen,
+  el equipo se omite. La salida no lleva metadatos ni marcas de tiempo, así
+  que es determinista.
+
+Uso:
+    python3 scripts/logo_renderer.py [--jobs N] [--force]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from asset_writer import record_worker_writes, write_atomic, write_if_changed
+import json_codec
+from telemetry import run_report
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+LOGOS_DIR = os.path.join(PROJECT_ROOT, "app", "src", "main", "assets", "team_logos")
+# Directorio de build (no se empaqueta): nada en la app lee aún las variantes
+VARIANTS_DIR = os.path.join(PROJECT_ROOT, "app", "build", "generated", "team_logos")
+MANIFEST_FILE = ".placeholders.json"
+
+# Tamaño lógico del logo en dp; en xhdpi son los 128 px de siempre
+BASE_SIZE_DP = 64
+DENSITIES: Dict[str, float] = {
+    "mdpi": 1.0,
+    "hdpi": 1.5,
+    "xhdpi": 2.0,
+    "xxhdpi": 3.0,
+    "xxxhdpi": 4.0,
+}
+DEFAULT_DENSITY = "xhdpi"
+FORMATS = ("png", "webp")
+
+# Se incrementa si cambia el dibujo para invalidar el manifiesto
+RENDER_VERSION = 1
+
+FONT_CANDIDATES = (
+    "/System/Library/Fonts/Arial.ttf",
+    "/System/Library/Fonts/Helvetica.ttc",
+    "/Library/Fonts/Arial.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf",
+    "C:\\Windows\\Fonts\\arialbd.ttf",
+)
+
+
+@dataclass
+class LogoSpec:
+    """Entradas de un logo provisional"""
+    code: str
+    primary_color: str = "#000000"
+    secondary_color: str = "#FFFFFF"
+    size_dp: int = BASE_SIZE_DP
+    densities: Tuple[str, ...] = tuple(DENSITIES)
+    formats: Tuple[str, ...] = FORMATS
+
+    def input_hash(self) -> str:
+        payload = json.dumps({
+            "version": RENDER_VERSION,
+            "font": font_path(),
+            "code": self.code,
+            "primary": self.primary_color,
+            "secondary": self.secondary_color,
+            "size": self.size_dp,
+            "densities": list(self.densities),
+            "formats": list(self.formats),
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def filename(self, fmt: str = "png") -> str:
+        return f"{self.code.lower()}_logo.{fmt}"
+
+
+@dataclass
+class RenderResult:
+    code: str
+    files: List[str] = field(default_factory=list)
+    written: int = 0
+    bytes_written: int = 0
+    skipped: bool = False
+    error: Optional[str] = None
+
+
+@lru_cache(maxsize=None)
+def font_path() -> Optional[str]:
+    """Primera fuente TrueType disponible (se resuelve una vez por proceso)"""
+    for candidate in FONT_CANDIDATES:
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+@lru_cache(maxsize=None)
+def load_font(size: int) -> ImageFont.ImageFont:
+    path = font_path()
+    if path:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            pass
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:  # Pillow < 10.1
+        return ImageFont.load_default()
+
+
+def parse_color(value: str, default: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    if value and value.startswith('#') and len(value) >= 7:
+        try:
+            return tuple(int(value[i:i + 2], 16) for i in (1, 3, 5))
+        except ValueError:
+            pass
+    return default
+
+
+def initials(code: str) -> str:
+    """Iniciales (máximo 3 caracteres)"""
+    return code[:3] if len(code) <= 3 else code[:2]
+
+
+def render_logo(code: str, primary_color: str = "#000000", secondary_color: str = "#FFFFFF",
+                size: int = 128) -> Image.Image:
+    """Logo de `size` px: círculo con el color primario y las iniciales encima"""
+    scale = size / 128
+    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+
+    margin = round(8 * scale)
+    draw.ellipse([margin, margin, size - margin, size - margin],
+                 fill=parse_color(primary_color, (0, 0, 0)))
+
+    text = initials(code)
+    font = load_font(max(round(20 * scale), size // 4))
+    bbox = draw.textbbox((0, 0), text, font=font)
+    x = (size - (bbox[2] - bbox[0])) // 2
+    y = (size - (bbox[3] - bbox[1])) // 2 - round(2 * scale)  # Ajuste visual
+    draw.text((x, y), text, fill=parse_color(secondary_color, (255, 255, 255)), font=font)
+    return img
+
+
+def encode_image(img: Image.Image, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    if fmt == "webp":
+        # method=6 es ~200 veces más lento y no reduce el tamaño de estos logos
+        img.save(buffer, "WEBP", lossless=True, quality=80, method=4)
+    else:
+        img.save(buffer, "PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def output_paths(spec: LogoSpec, logos_dir: str = LOGOS_DIR,
+                 variants_dir: str = VARIANTS_DIR) -> Dict[Tuple[str, str], str]:
+    """{(densidad, formato): ruta en variants_dir} más el PNG por defecto en logos_dir"""
+    paths = {
+        (density, fmt): os.path.join(variants_dir, density, spec.filename(fmt))
+        for density in spec.densities for fmt in spec.formats
+    }
+    paths[("", "png")] = os.path.join(logos_dir, spec.filename("png"))
+    return paths
+
+
+def density_size(spec: LogoSpec, density: str) -> int:
+    return round(spec.size_dp * DENSITIES[density])
+
+
+def render_spec(spec: LogoSpec, logos_dir: str = LOGOS_DIR, variants_dir: str = VARIANTS_DIR) -> RenderResult:
+    """Renderiza todas las densidades y formatos de un equipo"""
+    result = RenderResult(spec.code)
+    try:
+        encoded: Dict[Tuple[str, str], bytes] = {}
+        for density in spec.densities:
+            img = render_logo(spec.code, spec.primary_color, spec.secondary_color,
+                              density_size(spec, density))
+            for fmt in spec.formats:
+                encoded[(density, fmt)] = encode_image(img, fmt)
+
+        default_density = DEFAULT_DENSITY if DEFAULT_DENSITY in spec.densities else spec.densities[0]
+        encoded[("", "png")] = encoded.get((default_density, "png")) or encode_image(
+            render_logo(spec.code, spec.primary_color, spec.secondary_color,
+                        density_size(spec, default_density)), "png")
+
+        for key, path in output_paths(spec, logos_dir, variants_dir).items():
+            result.files.append(path)
+            if write_if_changed(path, encoded[key]):
+                result.written += 1
+                result.bytes_written += len(encoded[key])
+    except Exception as e:
+        result.error = str(e)
+    return result
+
+
+def _warm_fonts():
+    """Inicializador de los procesos del pool: resuelve la fuente una vez"""
+    font_path()
+
+
+def load_manifest(logos_dir: str = LOGOS_DIR) -> Dict[str, str]:
+    try:
+        return json_codec.load(os.path.join(logos_dir, MANIFEST_FILE))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest: Dict[str, str], logos_dir: str = LOGOS_DIR):
+    data = json_codec.dumps(manifest, pretty=True, sort_keys=True)
+    write_atomic(os.path.join(logos_dir, MANIFEST_FILE), data)
+
+
+def render_logos(specs: Sequence[LogoSpec], logos_dir: str = LOGOS_DIR, jobs: Optional[int] = None,
+                 force: bool = False, variants_dir: str = VARIANTS_DIR) -> List[RenderResult]:
+    """
+    Renderiza los logos en paralelo, omitiendo los equipos cuyas entradas no
+    han cambiado desde la última ejecución.
+    """
+    manifest = load_manifest(logos_dir)
+    results: Dict[str, RenderResult] = {}
+    pending = []
+
+    for spec in specs:
+        paths = output_paths(spec, logos_dir, variants_dir).values()
+        if (not force and manifest.get(spec.code) == spec.input_hash()
+                and all(os.path.exists(path) for path in paths)):
+            results[spec.code] = RenderResult(spec.code, files=list(paths), skipped=True)
+        else:
+            pending.append(spec)
+
+    if len(pending) > 1 and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_warm_fonts) as executor:
+            rendered = list(executor.map(render_spec, pending, [logos_dir] * len(pending),
+                                         [variants_dir] * len(pending)))
+        for result in rendered:
+            record_worker_writes(result.written, result.bytes_written,
+                                 len(result.files) - result.written if result.error is None else 0)
+    else:
+        rendered = [render_spec(spec, logos_dir, variants_dir) for spec in pending]
+
+    for spec, result in zip(pending, rendered):
+        results[spec.code] = result
+        if result.error is None:
+            manifest[spec.code] = spec.input_hash()
+        else:
+            manifest.pop(spec.code, None)
+
+    if pending:
+        save_manifest(manifest, logos_dir)
+    return [results[spec.code] for spec in specs]
+
+
+def spec_from_team(team: Dict) -> LogoSpec:
+    return LogoSpec(
+        code=team.get('code', team.get('id', '')),
+        primary_color=team.get('primaryColor') or "#000000",
+        secondary_color=team.get('secondaryColor') or "#FFFFFF",
+    )
+
+
+def print_render_summary(results: Sequence[RenderResult], elapsed: float):
+    rendered = [r for r in results if not r.skipped and r.error is None]
+    skipped = [r for r in results if r.skipped]
+    failed = [r for r in results if r.error]
+    files = sum(len(r.files) for r in rendered)
+    print(f"   🎨 {len(rendered)} equipos renderizados ({files} ficheros, "
+          f"{sum(r.written for r in rendered)} escritos)")
+    print(f"   ⏸️ {len(skipped)} sin cambios")
+    if failed:
+        print(f"   ❌ {len(failed)} con error: {', '.join(r.code for r in failed)}")
+    print(f"   ⏱️ {elapsed:.2f}s ({len(DENSITIES)} densidades × {len(FORMATS)} formatos)")
+
+
+def main() -> int:
+    from teams_asset import TEAMS_FILE, load_teams
+
+    parser = argparse.ArgumentParser(description="Renderiza los logos provisionales de los equipos")
+    parser.add_argument('--jobs', type=int, default=None, help='Procesos en paralelo (por defecto, CPUs)')
+    parser.add_argument('--force', action='store_true', help='Renderizar aunque las entradas no hayan cambiado')
+    args = parser.parse_args()
+
+    print("🎨 Renderizando logos provisionales...")
+    start = time.perf_counter()
+    results = render_logos([spec_from_team(team) for team in load_teams(TEAMS_FILE)],
+                           jobs=args.jobs, force=args.force)
+    print_render_summary(results, time.perf_counter() - start)
+    return 1 if any(r.error for r in results) else 0
+
+
+if __name__ == "__main__":
+    with run_report("logo_renderer"):
+        sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Sincronización paralela de logos de equipos.
+
+Descarga los escudos con concurrencia acotada a través del cliente HTTP
+compartido (peticiones condicionales con la caché HTTP), compara el SHA-256
+con el fichero existente y solo escribe si el contenido ha cambiado, siempre
+de forma atómica (fichero temporal + rename). Así una re-ejecución sin cambios
+no toca el directorio team_logos/ del APK.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import http_client
+from asset_writer import write_if_changed
+
+DEFAULT_MAX_WORKERS = 8
+
+DOWNLOADED = "downloaded"
+UNCHANGED = "unchanged"
+FAILED = "failed"
+
+
+@dataclass
+class LogoJob:
+    """Logo a sincronizar: código de equipo, URL de origen y fichero destino"""
+    team_code: str
+    url: str
+    filepath: str
+
+
+@dataclass
+class LogoResult:
+    team_code: str
+    filepath: str
+    status: str
+    size: int = 0
+    error: Optional[str] = None
+    content: Optional[bytes] = None  # solo con write=False
+
+
+def sync_logo(job: LogoJob, headers: Optional[Dict[str, str]] = None, timeout: float = 15,
+              write: bool = True) -> LogoResult:
+    """
+    Descarga un logo y lo escribe solo si ha cambiado. Con write=False no se
+    escribe y el contenido se devuelve en el resultado (p. ej. para optimizarlo).
+    """
+    try:
+        response = http_client.get(job.url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        content = response.content
+        if not write:
+            return LogoResult(job.team_code, job.filepath, DOWNLOADED, len(content), content=content)
+        written = write_if_changed(job.filepath, content)
+        return LogoResult(job.team_code, job.filepath, DOWNLOADED if written else UNCHANGED, len(content))
+    except Exception as e:
+        return LogoResult(job.team_code, job.filepath, FAILED, error=str(e))
+
+
+def sync_logos(jobs: List[LogoJob], headers: Optional[Dict[str, str]] = None,
+               max_workers: int = DEFAULT_MAX_WORKERS, timeout: float = 15,
+               write: bool = True) -> List[LogoResult]:
+    """Sincroniza varios logos en paralelo. Los resultados mantienen el orden de `jobs`"""
+    if not jobs:
+        return []
+    workers = max(1, min(max_workers, len(jobs)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda job: sync_logo(job, headers, timeout, write), jobs))
+
+
+def print_sync_summary(results: List[LogoResult]):
+    counts = {DOWNLOADED: 0, UNCHANGED: 0, FAILED: 0}
+    for result in results:
+        counts[result.status] += 1
+    print(f"   ⬇️ Actualizados: {counts[DOWNLOADED]}")
+    print(f"   ⏸️ Sin cambios: {counts[UNCHANGED]}")
+    print(f"   ❌ Fallidos: {counts[FAILED]}")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Extracción en streaming del JSON __NEXT_DATA__ de las páginas del Game Center.
+
+En lugar de cargar todo el HTML en memoria y copiar el JSON con find/slicing,
+se lee la respuesta por bloques, se localiza la etiqueta <script> de forma
+incremental y solo se entrega la parte JSON al parser. El pico de memoria queda
+acotado aproximadamente al tamaño del JSON.
+
+Si está instalado `ijson` (opcional) el JSON también se procesa de forma
+incremental y la lectura se corta en cuanto se han obtenido las claves
+necesarias (`currentRound` y `currentRoundGameGroups`).
+"""
+
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence
+
+import json_codec
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+START_MARKER = b'<script id="__NEXT_DATA__" type="application/json">'
+END_MARKER = b'</script>'
+CHUNK_SIZE = 64 * 1024
+
+# Claves de props.pageProps que usa extract_games_from_game_center
+GAME_CENTER_KEYS = ("currentRound", "currentRoundGameGroups")
+
+
+class NextDataNotFound(ValueError):
+    """La página no contiene (completo) el script __NEXT_DATA__"""
+
+
+def iter_json_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Recorre los bloques del HTML y devuelve solo los bytes del JSON que hay
+    entre START_MARKER y END_MARKER, aunque los marcadores queden partidos
+    entre dos bloques.
+    """
+    buffer = b""
+    inside = False
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buffer += chunk
+
+        if not inside:
+            idx = buffer.find(START_MARKER)
+            if idx == -1:
+                # Conservar solo lo justo para detectar un marcador partido
+                buffer = buffer[-(len(START_MARKER) - 1):]
+                continue
+            buffer = buffer[idx + len(START_MARKER):]
+            inside = True
+
+        idx = buffer.find(END_MARKER)
+        if idx != -1:
+            if idx:
+                yield buffer[:idx]
+            return
+
+        keep = len(END_MARKER) - 1
+        if len(buffer) > keep:
+            yield buffer[:-keep]
+            buffer = buffer[-keep:]
+
+    if not inside:
+        raise NextDataNotFound("No se encontró el script __NEXT_DATA__")
+    raise NextDataNotFound("No se encontró el final del script __NEXT_DATA__")
+
+
+class _ChunkReader:
+    """Adaptador mínimo de un iterador de bytes a objeto con read() para ijson"""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._pending = b""
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._pending) < size:
+            try:
+                self._pending += next(self._chunks)
+            except StopIteration:
+                break
+        if size < 0:
+            data, self._pending = self._pending, b""
+        else:
+            data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+def _extract_page_props_streaming(json_chunks: Iterator[bytes], keys: Sequence[str]) -> Dict[str, Any]:
+    """Construye solo las claves pedidas de props.pageProps y para al tenerlas todas"""
+    wanted = {f"props.pageProps.{key}": key for key in keys}
+    page_props: Dict[str, Any] = {}
+    builder = None
+    building_prefix = None
+    depth = 0
+
+    for prefix, event, value in ijson.parse(_ChunkReader(json_chunks), use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+            if depth == 0:
+                page_props[wanted[building_prefix]] = builder.value
+                builder = None
+        elif prefix in wanted and event not in ("map_key", "end_map", "end_array"):
+            if event in ("start_map", "start_array"):
+                builder = ijson.common.ObjectBuilder()
+                builder.event(event, value)
+                building_prefix = prefix
+                depth = 1
+            else:
+                page_props[wanted[prefix]] = value
+
+        if len(page_props) == len(wanted):
+            break
+
+    return {"props": {"pageProps": page_props}}
+
+
+def extract_next_data(chunks: Iterable[bytes], keys: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Devuelve el JSON de __NEXT_DATA__ a partir de los bloques del HTML.
+
+    Con `keys` y `ijson` disponible solo se construyen esas claves de
+    props.pageProps (misma forma {'props': {'pageProps': {...}}}) y se deja de
+    leer en cuanto están todas. Sin `ijson` se decodifica el JSON completo.
+    """
+    json_chunks = iter_json_chunks(chunks)
+
+    if keys and ijson is not None:
+        return _extract_page_props_streaming(json_chunks, keys)
+
+    return json_codec.loads(b"".join(json_chunks))
+
+
+def extract_next_data_from_response(response: Any, keys: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Extrae __NEXT_DATA__ de una respuesta requests abierta con stream=True"""
+    try:
+        return extract_next_data(response.iter_content(CHUNK_SIZE), keys)
+    finally:
+        response.close()
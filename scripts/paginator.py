@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Descarga paginada de los endpoints de listas de la API de feeds (games, clubs).
+
+La primera página dice cuántos elementos hay (`metadata.totalItems`); con eso
+se calcula el conjunto de páginas y el resto se piden en paralelo con el
+mismo motor que las jornadas (round_fetcher: hilos + token bucket). Una
+temporada completa son así unas pocas peticiones fijas, se definan como se
+definan las jornadas.
+
+El tamaño de página efectivo es el que indique `metadata.pageSize` o, si no
+viene, el número de elementos de la primera página (la API limita a 50 por
+llamada aunque se pidan más). Al final se comprueba que el número de
+elementos únicos coincide con totalItems; si el servidor ignora los
+parámetros de paginación (todas las páginas iguales) o falla alguna página,
+el resultado queda marcado como incompleto y el llamador decide. Si el
+servidor rechaza los parámetros (la primera página falla), se repite la
+petición sin ellos, como se hacía antes de paginar.
+"""
+
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from round_fetcher import DEFAULT_MAX_IN_FLIGHT, DEFAULT_RATE_PER_SECOND, fetch_rounds
+
+# Parámetros de paginación de la API de feeds
+PAGE_PARAM = "page"
+PAGE_SIZE_PARAM = "pageSize"
+FIRST_PAGE = 1
+DEFAULT_PAGE_SIZE = 50
+
+# Campos que identifican un elemento (partidos por id, clubs por código)
+DEFAULT_KEY_FIELDS = ("id", "code")
+
+
+@dataclass
+class PaginatedResult:
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    total_items: int = 0
+    page_size: int = 0
+    pages: int = 0
+    failed_pages: List[int] = field(default_factory=list)
+    duplicates: int = 0
+    elapsed: float = 0.0
+    unpaginated: bool = False  # La primera página falló y se pidió la URL sin paginar
+
+    @property
+    def complete(self) -> bool:
+        return not self.failed_pages and len(self.items) == self.total_items
+
+
+def page_url(url: str, page: int, page_size: int) -> str:
+    """URL con los parámetros de página añadidos (o sustituidos) en la query"""
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if key not in (PAGE_PARAM, PAGE_SIZE_PARAM)]
+    query += [(PAGE_PARAM, str(page)), (PAGE_SIZE_PARAM, str(page_size))]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def item_key(item: Dict[str, Any], fields: Sequence[str] = DEFAULT_KEY_FIELDS) -> Optional[str]:
+    for name in fields:
+        if item.get(name):
+            return str(item[name])
+    return None
+
+
+def _page_items(payload: Any) -> Optional[List[Dict[str, Any]]]:
+    if isinstance(payload, dict) and isinstance(payload.get('data'), list):
+        return payload['data']
+    return None
+
+
+def fetch_paginated(url: str, fetch_json: Callable[[str], Dict[str, Any]],
+                    page_size: int = DEFAULT_PAGE_SIZE,
+                    key_fields: Sequence[str] = DEFAULT_KEY_FIELDS,
+                    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                    rate_per_second: float = DEFAULT_RATE_PER_SECOND) -> PaginatedResult:
+    """
+    Descarga todas las páginas de `url`. `fetch_json` recibe la URL de una
+    página y devuelve el JSON decodificado; puede lanzar una excepción o
+    devolver un dict sin 'data' si la página falla. Si falla la primera
+    página se pide `url` sin parámetros de paginación (resultado con
+    `unpaginated`); si esa petición también falla se propaga su excepción.
+    """
+    start = time.perf_counter()
+    result = PaginatedResult(page_size=page_size, pages=1)
+    try:
+        first = fetch_json(page_url(url, FIRST_PAGE, page_size))
+    except Exception:
+        first = None
+    first_items = _page_items(first)
+    if first_items is None:
+        result.unpaginated = True
+        first = fetch_json(url)
+        first_items = _page_items(first)
+    if first_items is None:
+        result.failed_pages.append(FIRST_PAGE)
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    metadata = first.get('metadata') or {}
+    result.total_items = int(metadata.get('totalItems') or len(first_items))
+    if result.total_items > len(first_items) and not result.unpaginated:
+        result.page_size = int(metadata.get('pageSize') or len(first_items) or page_size)
+        result.pages = math.ceil(result.total_items / result.page_size)
+
+    pages: Dict[int, List[Dict[str, Any]]] = {FIRST_PAGE: first_items}
+    remaining = range(FIRST_PAGE + 1, FIRST_PAGE + result.pages)
+    fetched = fetch_rounds(remaining, lambda page: fetch_json(page_url(url, page, result.page_size)),
+                           max_in_flight, rate_per_second)
+    for page in fetched:
+        items = _page_items(page.payload)
+        if items is None:
+            result.failed_pages.append(page.round_num)
+        else:
+            pages[page.round_num] = items
+
+    # Se ensamblan en orden de página; los repetidos (páginas que se solapan
+    # si la lista cambia durante la descarga) se quedan una sola vez
+    seen = set()
+    for page in sorted(pages):
+        for item in pages[page]:
+            key = item_key(item, key_fields)
+            if key is not None and key in seen:
+                result.duplicates += 1
+                continue
+            seen.add(key)
+            result.items.append(item)
+
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def print_pagination_summary(result: PaginatedResult, label: str = "elementos"):
+    mark = "✅" if result.complete else "⚠️"
+    print(f"   {mark} {len(result.items)}/{result.total_items} {label} en {result.pages} páginas "
+          f"de {result.page_size} ({result.elapsed:.2f}s)")
+    if result.unpaginated:
+        print("   ⚠️ La API rechazó los parámetros de paginación: solo la respuesta sin paginar")
+    if result.failed_pages:
+        print(f"   ❌ Páginas fallidas: {result.failed_pages}")
+    if result.duplicates:
+        print(f"   🔁 {result.duplicates} repetidos entre páginas")
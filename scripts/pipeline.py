@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Punto de entrada único del pipeline de datos estáticos.
+
+Modela los scripts de poblado como un grafo de etapas con dependencias:
+
+    game_center ──► static_data_manager ──► team_logo_paths
+    logos ─────────────────────────────────┘
+    game_center ──► seed_db (opcional)
+
+- Las etapas independientes (p. ej. descarga de logos y del calendario) se
+  ejecutan en paralelo.
+- Cada etapa declara sus ficheros de entrada y salida. La clave de una etapa
+  es el SHA-256 de su script y de los módulos de scripts/ que importa
+  (directa o indirectamente), sus argumentos y el contenido de sus entradas;
+  si coincide con la de la última ejecución correcta y las salidas existen,
+  la etapa se omite. Así una reconstrucción sin cambios es prácticamente
+  instantánea.
+- Las etapas que leen de la red no tienen entradas locales: se consideran
+  vigentes durante --max-age horas (o hasta --refresh).
+
+El estado se guarda en scripts/.pipeline_state.json. Cada script deja su
+informe de ejecución en app/src/main/run_reports/ y el pipeline el suyo
+(pipeline.json/.prom) con la duración de cada etapa (ver telemetry.py).
+
+Uso:
+    python3 scripts/pipeline.py [--refresh] [--force] [--only ETAPA ...] [--with seed_db] [--dry-run]
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from asset_writer import sha256_file, write_atomic
+import json_codec
+from telemetry import run_report, span
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+ASSETS_DIR = os.path.join(PROJECT_ROOT, "app", "src", "main", "assets")
+STATIC_DATA_DIR = os.path.join(ASSETS_DIR, "static_data")
+STATE_FILE = os.path.join(SCRIPT_DIR, ".pipeline_state.json")
+
+DEFAULT_MAX_AGE_HOURS = 6.0
+DEFAULT_JOBS = 4
+
+RAN = "ran"
+SKIPPED = "skipped"
+FAILED = "failed"
+BLOCKED = "blocked"
+
+
+@dataclass
+class Stage:
+    """Etapa del pipeline: un script con sus dependencias, entradas y salidas"""
+    name: str
+    script: str
+    args: List[str] = field(default_factory=list)
+    deps: List[str] = field(default_factory=list)
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    remote: bool = False
+    optional: bool = False
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str
+    duration: float = 0.0
+    output: str = ""
+    reason: str = ""
+
+
+def _asset(*parts: str) -> str:
+    return os.path.join(ASSETS_DIR, *parts)
+
+
+def default_stages(incremental: bool = False) -> List[Stage]:
+    """Grafo de etapas del pipeline de datos estáticos"""
+    teams_file = os.path.join(STATIC_DATA_DIR, "teams_2025_26.json")
+    return [
+        Stage(
+            name="game_center",
+            script="populate_game_center_data.py",
+            args=["--incremental"] if incremental else [],
+            outputs=[_asset("static_data.json"), os.path.join(STATIC_DATA_DIR, "standings_2025_26.json")],
+            remote=True,
+        ),
+        Stage(
+            name="logos",
+            script="download_team_logos.py",
+            args=["--logos-only", "--optimize"],
+            outputs=[_asset("team_logos")],
+            remote=True,
+        ),
+        Stage(
+            name="static_data_manager",
+            script="generate_staticdatamanager_files.py",
+            deps=["game_center"],
+            inputs=[_asset("static_data.json")],
+            outputs=[teams_file,
+                     os.path.join(STATIC_DATA_DIR, "matches_calendar_2025_26.json"),
+                     os.path.join(STATIC_DATA_DIR, "data_version.json")],
+        ),
+        Stage(
+            name="team_logo_paths",
+            script="download_team_logos.py",
+            args=["--assign-only"],
+            deps=["static_data_manager", "logos"],
+            inputs=[teams_file, _asset("team_logos")],
+            outputs=[teams_file],
+        ),
+        Stage(
+            name="seed_db",
+            script="room_seed.py",
+            deps=["game_center"],
+            inputs=[_asset("static_data.json"),
+                    os.path.join(PROJECT_ROOT, "app", "schemas")],
+            outputs=[_asset("databases", "euroleague_database.db")],
+            optional=True,
+        ),
+    ]
+
+
+def hash_path(path: str) -> str:
+    """SHA-256 del contenido de un fichero o de un directorio (recursivo)"""
+    if os.path.isdir(path):
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.startswith('.'):
+                    continue
+                file_path = os.path.join(root, name)
+                digest.update(os.path.relpath(file_path, path).encode('utf-8'))
+                digest.update((sha256_file(file_path) or '').encode('ascii'))
+        return digest.hexdigest()
+    return sha256_file(path) or "missing"
+
+
+def local_imports(path: str) -> List[str]:
+    """Módulos de scripts/ importados por un fichero (en cualquier punto del código)"""
+    try:
+        with open(path, 'rb') as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError):
+        return []
+
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split('.')[0])
+    return sorted(f"{name}.py" for name in names if os.path.isfile(os.path.join(SCRIPT_DIR, f"{name}.py")))
+
+
+def script_closure(script: str) -> List[str]:
+    """El script y todos los módulos locales de los que depende, transitivamente"""
+    seen = {script}
+    pending = [script]
+    while pending:
+        for module in local_imports(os.path.join(SCRIPT_DIR, pending.pop())):
+            if module not in seen:
+                seen.add(module)
+                pending.append(module)
+    return sorted(seen)
+
+
+def stage_key(stage: Stage) -> str:
+    """Clave de contenido: script y módulos locales que importa + argumentos + entradas"""
+    digest = hashlib.sha256()
+    for script in script_closure(stage.script):
+        digest.update(script.encode('utf-8'))
+        digest.update(hash_path(os.path.join(SCRIPT_DIR, script)).encode('ascii'))
+    digest.update(json.dumps(stage.args).encode('utf-8'))
+    for path in stage.inputs:
+        digest.update(os.path.relpath(path, PROJECT_ROOT).encode('utf-8'))
+        digest.update(hash_path(path).encode('ascii'))
+    return digest.hexdigest()
+
+
+def load_state(path: str = STATE_FILE) -> Dict[str, Dict]:
+    try:
+        return json_codec.load(path)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state: Dict[str, Dict], path: str = STATE_FILE):
+    write_atomic(path, json_codec.dumps(state, pretty=True, sort_keys=True))
+
+
+class Pipeline:
+    """Ejecuta un grafo de etapas en paralelo omitiendo las que no han cambiado"""
+
+    def __init__(self, stages: Sequence[Stage], state: Optional[Dict[str, Dict]] = None,
+                 force: bool = False, refresh: bool = False,
+                 max_age_hours: float = DEFAULT_MAX_AGE_HOURS, jobs: int = DEFAULT_JOBS,
+                 dry_run: bool = False):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state = state if state is not None else {}
+        self.force = force
+        self.refresh = refresh
+        self.max_age = max_age_hours * 3600
+        self.jobs = max(1, jobs)
+        self.dry_run = dry_run
+        self._lock = threading.Lock()
+
+        for stage in stages:
+            missing = [dep for dep in stage.deps if dep not in self.stages]
+            if missing:
+                raise ValueError(f"La etapa {stage.name} depende de etapas no seleccionadas: {missing}")
+
+    def _skip_reason(self, stage: Stage, upstream_ran: bool) -> Optional[str]:
+        """Motivo para omitir la etapa, o None si hay que ejecutarla"""
+        # Si la dependencia se ejecutó, el hash de las entradas ya refleja sus
+        # cambios; en --dry-run no hay salidas nuevas y se asume que cambiarán
+        if self.force or (self.dry_run and upstream_ran):
+            return None
+        previous = self.state.get(stage.name)
+        if not previous or previous.get("key") != stage_key(stage):
+            return None
+        if not all(os.path.exists(path) for path in stage.outputs):
+            return None
+        if stage.remote:
+            age = time.time() - previous.get("finished_at", 0)
+            if self.refresh or age > self.max_age:
+                return None
+            return f"datos remotos de hace {age / 3600:.1f} h"
+        return "entradas sin cambios"
+
+    def _run_stage(self, stage: Stage, upstream_ran: bool) -> StageResult:
+        reason = self._skip_reason(stage, upstream_ran)
+        if reason:
+            return StageResult(stage.name, SKIPPED, reason=reason)
+        if self.dry_run:
+            return StageResult(stage.name, RAN, reason="se ejecutaría")
+
+        start = time.perf_counter()
+        with span(f"stage.{stage.name}", script=stage.script):
+            process = subprocess.run(
+                [sys.executable, os.path.join(SCRIPT_DIR, stage.script), *stage.args],
+                cwd=PROJECT_ROOT, capture_output=True, text=True,
+            )
+        duration = time.perf_counter() - start
+        output = process.stdout + process.stderr
+
+        if process.returncode != 0:
+            return StageResult(stage.name, FAILED, duration, output, f"código de salida {process.returncode}")
+
+        # La clave se calcula tras la ejecución: las etapas que modifican sus
+        # propias entradas (team_logo_paths) quedan vigentes en la siguiente
+        with self._lock:
+            self.state[stage.name] = {"key": stage_key(stage), "finished_at": time.time()}
+        return StageResult(stage.name, RAN, duration, output)
+
+    def run(self) -> Dict[str, StageResult]:
+        results: Dict[str, StageResult] = {}
+        pending = dict(self.stages)
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            running = {}
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    dep_results = [results.get(dep) for dep in stage.deps]
+                    if any(r is not None and r.status in (FAILED, BLOCKED) for r in dep_results):
+                        results[name] = StageResult(name, BLOCKED, reason="falló una dependencia")
+                        del pending[name]
+                        print_stage_result(results[name])
+                    elif all(r is not None for r in dep_results):
+                        upstream_ran = any(r.status == RAN for r in dep_results)
+                        running[executor.submit(self._run_stage, stage, upstream_ran)] = name
+                        del pending[name]
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+                    print_stage_result(results[name])
+
+        return results
+
+
+def print_stage_result(result: StageResult):
+    icons = {RAN: "✅", SKIPPED: "⏭️", FAILED: "❌", BLOCKED: "⛔"}
+    detail = f" ({result.reason})" if result.reason else ""
+    timing = f" en {result.duration:.1f}s" if result.duration else ""
+    print(f"{icons[result.status]} {result.name}: {result.status}{timing}{detail}")
+    if result.output and result.status in (RAN, FAILED):
+        for line in result.output.rstrip().splitlines():
+            print(f"   │ {line}")
+
+
+def select_stages(stages: List[Stage], only: Optional[List[str]], extra: List[str]) -> List[Stage]:
+    """Etapas a ejecutar: las obligatorias más las opcionales pedidas, o solo --only"""
+    if only:
+        unknown = set(only) - {stage.name for stage in stages}
+        if unknown:
+            raise ValueError(f"Etapas desconocidas: {sorted(unknown)}")
+        return [stage for stage in stages if stage.name in only]
+    return [stage for stage in stages if not stage.optional or stage.name in extra]
+
+
+def main() -> int:
+    stages = default_stages()
+    names = [stage.name for stage in stages]
+
+    parser = argparse.ArgumentParser(description="Pipeline de datos estáticos con etapas cacheadas")
+    parser.add_argument('--only', nargs='+', choices=names, help='Ejecutar solo estas etapas')
+    parser.add_argument('--with', dest='extra', nargs='+', default=[],
+                        choices=[s.name for s in stages if s.optional], help='Incluir etapas opcionales')
+    parser.add_argument('--force', action='store_true', help='Ejecutar todas las etapas aunque no hayan cambiado')
+    parser.add_argument('--refresh', action='store_true', help='Volver a descargar los datos remotos')
+    parser.add_argument('--incremental', action='store_true', help='Refresco incremental del calendario')
+    parser.add_argument('--max-age', type=float, default=DEFAULT_MAX_AGE_HOURS,
+                        help='Horas de vigencia de los datos remotos')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS, help='Etapas en paralelo')
+    parser.add_argument('--dry-run', action='store_true', help='Mostrar qué se ejecutaría')
+    args = parser.parse_args()
+
+    stages = select_stages(default_stages(args.incremental), args.only, args.extra)
+    if args.only:
+        # Con --only las dependencias no seleccionadas se dan por satisfechas
+        selected = {stage.name for stage in stages}
+        for stage in stages:
+            stage.deps = [dep for dep in stage.deps if dep in selected]
+
+    print("🚀 Pipeline de datos estáticos")
+    print("=" * 60)
+    start = time.perf_counter()
+
+    state = load_state()
+    pipeline = Pipeline(stages, state, force=args.force, refresh=args.refresh,
+                        max_age_hours=args.max_age, jobs=args.jobs, dry_run=args.dry_run)
+    results = pipeline.run()
+    if not args.dry_run:
+        save_state(state)
+
+    counts = {status: sum(1 for r in results.values() if r.status == status)
+              for status in (RAN, SKIPPED, FAILED, BLOCKED)}
+    print("=" * 60)
+    print(f"⏱️ {time.perf_counter() - start:.2f}s | ✅ {counts[RAN]} ejecutadas, ⏭️ {counts[SKIPPED]} omitidas, "
+          f"❌ {counts[FAILED]} fallidas, ⛔ {counts[BLOCKED]} bloqueadas")
+    return 1 if counts[FAILED] or counts[BLOCKED] else 0
+
+
+if __name__ == "__main__":
+    with run_report("pipeline"):
+        sys.exit(main())
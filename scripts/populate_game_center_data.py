@@ -4,70 +4,103 @@ Script para poblar datos estáticos de EuroLeague desde feeds.incrowdsports.com
 y la página del Game Center.
 """
 
+import argparse
 import requests
-import json
 import sys
 import os
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any, Optional
 from datetime import datetime
 import time
 
+from asset_writer import FORMAT_PRETTY, GAME_TEAM_FIELDS, add_format_arguments, report_asset, write_asset
+from game_normalizer import from_feed_game, to_game_center_game, to_static_data_game
+from game_store import ADDED, GameStore
+import http_client
+import json_codec
+from http_cache import HTTP_CACHE
+from incremental import load_previous_games, merge_games, open_rounds, print_changeset
+from next_data import GAME_CENTER_KEYS, NextDataNotFound, extract_next_data_from_response
+from paginator import fetch_paginated, print_pagination_summary
+from resilience import INCOMPLETE
+from room_seed import DEFAULT_OUTPUT as SEED_DB_FILE, SchemaMismatch, build_seed_database, print_seed_summary
+from round_fetcher import (
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_RATE_PER_SECOND,
+    fetch_rounds,
+    print_latency_summary,
+)
+from rosters import (
+    DEFAULT_BUDGET_SECONDS,
+    build_roster_data,
+    fetch_rosters,
+    load_roster_asset,
+    merge_previous_rosters,
+    print_budget_report,
+    record_incomplete,
+    write_roster_asset,
+)
+from standings import compute_standings, print_standings, write_standings_asset
+from telemetry import run_report, span
+
 # Rutas de archivos
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 ASSETS_DIR = os.path.join(PROJECT_ROOT, "app", "src", "main", "assets")
 OUTPUT_FILE = os.path.join(ASSETS_DIR, "static_data.json")
+STANDINGS_FILE = os.path.join(ASSETS_DIR, "static_data", "standings_2025_26.json")
+ROSTERS_FILE = os.path.join(ASSETS_DIR, "static_data", "rosters_2025_26.json")
+
+FEEDS_BASE_URL = "https://feeds.incrowdsports.com/provider/euroleague-feeds/v2"
+COMPETITION = "E"
+SEASON_CODE = "E2025"
+PHASE_REGULAR_SEASON = "RS"
 
 def fetch_json_data(url: str) -> Dict[str, Any]:
     """Obtiene datos JSON de una URL."""
     try:
-        response = requests.get(url, timeout=10)
+        response = http_client.get(url, timeout=10)
         response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
+        return json_codec.loads(response.content)
+    except (requests.RequestException, ValueError) as e:
         print(f"Error al obtener datos de {url}: {e}")
         return {}
 
 def fetch_game_center_data(round_num: int = 1) -> Dict[str, Any]:
-    """Obtiene datos del Game Center de EuroLeague."""
+    """
+    Obtiene datos del Game Center de EuroLeague.
+    
+    El HTML se lee en streaming y solo se decodifica el JSON de __NEXT_DATA__
+    (ver next_data.py), sin mantener copias de la página completa en memoria.
+    """
     try:
         url = f"https://www.euroleaguebasketball.net/es/euroleague/game-center/?round={round_num}&season=E2025"
-        response = requests.get(url, timeout=15)
-        response.raise_for_status()
-        
-        # Extraer JSON del script __NEXT_DATA__
-        content = response.text
-        start_marker = '<script id="__NEXT_DATA__" type="application/json">'
-        end_marker = '</script>'
-        
-        start_idx = content.find(start_marker)
-        if start_idx == -1:
-            print("No se encontró el script __NEXT_DATA__")
-            return {}
-        
-        start_idx += len(start_marker)
-        end_idx = content.find(end_marker, start_idx)
-        if end_idx == -1:
-            print("No se encontró el final del script __NEXT_DATA__")
-            return {}
-        
-        json_str = content[start_idx:end_idx]
-        return json.loads(json_str)
+        with http_client.get(url, timeout=15, cache=False, stream=True) as response:
+            response.raise_for_status()
+            
+            # Extraer JSON del script __NEXT_DATA__
+            return extract_next_data_from_response(response, GAME_CENTER_KEYS)
+    except NextDataNotFound as e:
+        print(e)
+        return {}
     except Exception as e:
         print(f"Error al obtener datos del Game Center: {e}")
         return {}
 
 def extract_teams_from_clubs_api() -> List[Dict[str, Any]]:
     """Extrae información completa de equipos desde el API de clubs."""
-    clubs_url = "https://feeds.incrowdsports.com/provider/euroleague-feeds/v2/competitions/E/seasons/E2025/clubs"
-    clubs_data = fetch_json_data(clubs_url)
+    clubs_url = f"{FEEDS_BASE_URL}/competitions/{COMPETITION}/seasons/{SEASON_CODE}/clubs"
+    clubs = fetch_paginated(clubs_url, fetch_json_data)
     
-    if not clubs_data or 'data' not in clubs_data:
+    if not clubs.items:
         print("No se pudieron obtener datos de clubs")
+        INCOMPLETE.record("equipos", "clubs", "sin respuesta de la API de clubs")
         return []
+    if not clubs.complete:
+        print_pagination_summary(clubs, "clubs")
+        INCOMPLETE.record("equipos", "clubs", f"{len(clubs.items)}/{clubs.total_items} clubs")
     
     teams = []
-    for club in clubs_data['data']:
+    for club in clubs.items:
         # Extraer información completa del equipo
         team = {
             "id": club.get('code', ''),
@@ -91,25 +124,71 @@ def extract_teams_from_clubs_api() -> List[Dict[str, Any]]:
     
     return teams
 
-def extract_all_games_from_feeds_api() -> List[Dict[str, Any]]:
-    """Extrae TODOS los partidos de las 38 jornadas usando la API correcta."""
+def extract_rosters_from_people_api(teams: List[Dict[str, Any]],
+                                    budget_seconds: float = DEFAULT_BUDGET_SECONDS) -> Dict[str, Any]:
+    """
+    Descarga en paralelo las plantillas de todos los clubes y las normaliza.
+    Los clubes que fallan conservan la plantilla de la ejecución anterior.
+    """
+    start = time.perf_counter()
+    results = fetch_rosters([team['code'] for team in teams], budget_seconds=budget_seconds)
+    wall_time = time.perf_counter() - start
+    
+    record_incomplete(results)
+    roster_data = build_roster_data(results, teams)
+    recovered = merge_previous_rosters(roster_data, load_roster_asset(ROSTERS_FILE))
+    if recovered:
+        print(f"   ♻️ {recovered} plantillas conservadas de la ejecución anterior")
+    
+    print_budget_report(results, roster_data, wall_time, budget_seconds)
+    return roster_data
+
+def feeds_games_url(round_num: int, competition: str = COMPETITION, season_code: str = SEASON_CODE,
+                    phase: str = PHASE_REGULAR_SEASON) -> str:
+    """URL de los partidos de una jornada de una fase (RS, PO, FF) de cualquier temporada"""
+    return (f"{FEEDS_BASE_URL}/competitions/{competition}/seasons/{season_code}/games"
+            f"?teamCode=&phaseTypeCode={phase}&roundNumber={round_num}")
+
+def feeds_game_to_game(game: Dict[str, Any], round_num: int, season_code: str = SEASON_CODE) -> Dict[str, Any]:
+    """Convierte un partido de la API de feeds al formato de static_data.json"""
+    return to_static_data_game(from_feed_game(game, round_num, season_code))
+
+def extract_all_games_from_feeds_api(max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                                     rate_per_second: float = DEFAULT_RATE_PER_SECOND,
+                                     rounds: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+    """
+    Extrae los partidos de las jornadas indicadas usando la API correcta.
+    Por defecto descarga TODAS las 38 jornadas.
+    """
+    round_list = sorted(rounds) if rounds is not None else list(range(1, 39))
+    total = len(round_list)
+    
     print("🏀 Extrayendo calendario COMPLETO desde Feeds API...")
-    print("📅 Descargando las 38 jornadas de la temporada EuroLeague 2025-26")
+    print(f"📅 Descargando {total} de las 38 jornadas de la temporada EuroLeague 2025-26")
+    print(f"⚡ Descarga concurrente: {max_in_flight} peticiones en vuelo, máx. {rate_per_second:.1f} req/s")
     
-    all_games = []
+    store = GameStore()
     successful_rounds = 0
     failed_rounds = 0
     
-    # Extraer todas las jornadas del 1 al 38 usando roundNumber
-    for round_num in range(1, 39):  # Jornadas 1 a 38
-        print(f"📥 Descargando jornada {round_num:2d}/38...", end=" ")
-        
+    def fetch_round(round_num: int) -> Dict[str, Any]:
         # URL correcta con roundNumber
-        url = f"https://feeds.incrowdsports.com/provider/euroleague-feeds/v2/competitions/E/seasons/E2025/games?teamCode=&phaseTypeCode=RS&roundNumber={round_num}"
-        games_data = fetch_json_data(url)
+        return fetch_json_data(feeds_games_url(round_num))
+    
+    # Extraer las jornadas usando roundNumber
+    start = time.perf_counter()
+    results = fetch_rounds(round_list, fetch_round, max_in_flight, rate_per_second)
+    wall_time = time.perf_counter() - start
+    
+    # Procesar en orden de jornada, igual que la descarga secuencial
+    for result in results:
+        round_num = result.round_num
+        games_data = result.payload
+        print(f"📥 Jornada {round_num:2d}/38 ({result.latency:.2f}s)...", end=" ")
         
         if not games_data or 'data' not in games_data:
             print("❌ Error de conexión")
+            INCOMPLETE.record("jornada", round_num, result.error or "error de conexión")
             failed_rounds += 1
             continue
         
@@ -121,59 +200,28 @@ def extract_all_games_from_feeds_api() -> List[Dict[str, Any]]:
         
         round_games = 0
         for game in games:
-            # Convertir fecha
-            date_str = game.get('date', '')
-            formatted_date = ""
-            if date_str:
-                try:
-                    # Fecha viene en formato "2025-10-03T18:00:00.000Z"
-                    dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    formatted_date = dt.strftime('%Y-%m-%d %H:%M:%S')
-                except:
-                    formatted_date = date_str
-            
-            # Extraer información completa del partido
-            game_obj = {
-                "id": game.get('id', ''),
-                "homeTeamId": game.get('home', {}).get('code', ''),
-                "awayTeamId": game.get('away', {}).get('code', ''),
-                "homeTeamName": game.get('home', {}).get('name', ''),
-                "awayTeamName": game.get('away', {}).get('name', ''),
-                "date": formatted_date,
-                "round": game.get('round', {}).get('round', round_num),
-                "homeScore": game.get('home', {}).get('score', 0),
-                "awayScore": game.get('away', {}).get('score', 0),
-                "status": game.get('status', 'scheduled'),
-                "venue": game.get('venue', {}).get('name', ''),
-                "venueCapacity": game.get('venue', {}).get('capacity', 0),
-                "venueCode": game.get('venue', {}).get('code', ''),
-                "gameCode": game.get('code', 0),
-                "phaseType": game.get('phaseType', {}).get('code', 'RS'),
-                "season": game.get('season', {}).get('code', 'E2025')
-            }
-            all_games.append(game_obj)
+            store.add(feeds_game_to_game(game, round_num))
             round_games += 1
         
         print(f"✅ {round_games} partidos")
         successful_rounds += 1
-        
-        # Pausa pequeña para no sobrecargar el servidor
-        time.sleep(0.2)
     
     print(f"\n📊 Resumen de extracción Feeds API:")
-    print(f"   ✅ Jornadas exitosas: {successful_rounds}/38")
-    print(f"   ❌ Jornadas fallidas: {failed_rounds}/38")
-    print(f"   🎯 Total partidos: {len(all_games)}")
+    print(f"   ✅ Jornadas exitosas: {successful_rounds}/{total}")
+    print(f"   ❌ Jornadas fallidas: {failed_rounds}/{total}")
+    print(f"   🎯 Total partidos: {len(store)}")
+    print_latency_summary(results, wall_time)
+    HTTP_CACHE.print_stats()
+    http_client.print_connection_stats()
     
-    return all_games
+    return store.to_list()
 
 def extract_games_from_game_center() -> List[Dict[str, Any]]:
     """Extrae partidos desde el Game Center - solo jornadas con datos reales."""
     print("🏀 Extrayendo calendario desde Game Center...")
     print("⚠️  Nota: Solo extrayendo jornadas con datos reales programados")
     
-    all_games = []
-    unique_games = set()  # Para evitar duplicados
+    store = GameStore()  # Para evitar duplicados
     
     # Probar las primeras jornadas para encontrar datos únicos
     for round_num in range(1, 6):  # Probar jornadas 1-5
@@ -182,6 +230,7 @@ def extract_games_from_game_center() -> List[Dict[str, Any]]:
         round_data = fetch_game_center_data(round_num)
         if not round_data:
             print("❌ Error de conexión")
+            INCOMPLETE.record("jornada Game Center", round_num, "error de conexión")
             continue
         
         try:
@@ -197,45 +246,11 @@ def extract_games_from_game_center() -> List[Dict[str, Any]]:
             
             for group in game_groups:
                 for game in group.get('games', []):
-                    game_id = game.get('id', '')
-                    
-                    # Evitar duplicados
-                    if game_id in unique_games:
-                        continue
-                    unique_games.add(game_id)
-                    
-                    # Convertir fecha
-                    date_str = game.get('date', '')
-                    formatted_date = ""
-                    if date_str:
-                        try:
-                            dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                            formatted_date = dt.strftime('%Y-%m-%d %H:%M:%S')
-                        except:
-                            formatted_date = date_str
-                    
-                    # Usar la jornada real del partido
-                    actual_game_round = game.get('round', {}).get('round', actual_round)
-                    
-                    game_obj = {
-                        "id": game_id,
-                        "homeTeamId": game.get('home', {}).get('code', ''),
-                        "awayTeamId": game.get('away', {}).get('code', ''),
-                        "homeTeamName": game.get('home', {}).get('name', ''),
-                        "awayTeamName": game.get('away', {}).get('name', ''),
-                        "date": formatted_date,
-                        "round": actual_game_round,
-                        "homeScore": game.get('home', {}).get('score', 0),
-                        "awayScore": game.get('away', {}).get('score', 0),
-                        "status": game.get('status', 'scheduled'),
-                        "venue": game.get('venue', {}).get('name', ''),
-                        "venueCapacity": game.get('venue', {}).get('capacity', 0),
-                        "venueAddress": game.get('venue', {}).get('address', ''),
-                        "gameUrl": game.get('url', ''),
-                        "gameCode": game.get('code', 0)
-                    }
-                    all_games.append(game_obj)
-                    round_games += 1
+                    # Usar la jornada real del partido (si no la trae, la de la página)
+                    game_obj = to_game_center_game(from_feed_game(game, actual_round))
+                    # Evitar duplicados (fusiona si llega con estado más avanzado)
+                    if store.add(game_obj) == ADDED:
+                        round_games += 1
             
             if round_games > 0:
                 print(f"✅ {round_games} partidos únicos")
@@ -244,11 +259,14 @@ def extract_games_from_game_center() -> List[Dict[str, Any]]:
                 
         except Exception as e:
             print(f"❌ Error: {str(e)[:50]}...")
+            INCOMPLETE.record("jornada Game Center", round_num, str(e))
             continue
         
         # Pausa pequeña
         time.sleep(0.2)
     
+    all_games = store.to_list()
+    
     print(f"\n📊 Resumen de extracción Game Center:")
     print(f"   🎯 Total partidos únicos: {len(all_games)}")
     
@@ -265,8 +283,17 @@ def extract_games_from_game_center() -> List[Dict[str, Any]]:
     
     return all_games
 
-def create_static_data():
-    """Crea los archivos de datos estáticos."""
+def create_static_data(incremental: bool = False, output_format: str = FORMAT_PRETTY,
+                       gzip_copy: bool = False, report: bool = False, seed_db: bool = False,
+                       rosters: bool = False, roster_budget: float = DEFAULT_BUDGET_SECONDS):
+    """
+    Crea los archivos de datos estáticos.
+    
+    En modo incremental solo se descargan las jornadas que siguen abiertas en el
+    static_data.json anterior y se fusionan con el resto del calendario. Con
+    `rosters` se descargan también las plantillas (rosters.py) y con `seed_db`
+    se genera la base de datos Room precargada (room_seed.py).
+    """
     print("🏀 Poblando datos estáticos de EuroLeague 2025-26")
     print("📡 Fuente: API Feeds oficial con calendario completo")
     print("🎯 Objetivo: Los 380 partidos de la temporada")
@@ -276,7 +303,8 @@ def create_static_data():
     os.makedirs(ASSETS_DIR, exist_ok=True)
     
     print("1️⃣ Obteniendo información de equipos...")
-    teams = extract_teams_from_clubs_api()
+    with span("fetch.teams"):
+        teams = extract_teams_from_clubs_api()
     
     if not teams:
         print("❌ Error: No se pudieron obtener datos de equipos")
@@ -284,8 +312,28 @@ def create_static_data():
     
     print(f"✅ Obtenidos {len(teams)} equipos con información rica")
     
-    print("\n2️⃣ Obteniendo calendario COMPLETO de partidos...")
-    all_games = extract_all_games_from_feeds_api()
+    roster_data = None
+    if rosters:
+        print("\n👥 Obteniendo plantillas de los clubes...")
+        with span("fetch.rosters"):
+            roster_data = extract_rosters_from_people_api(teams, roster_budget)
+    
+    previous_games = load_previous_games(OUTPUT_FILE, 'games') if incremental else []
+    
+    if previous_games:
+        rounds_to_fetch = open_rounds(previous_games, date_field='date', total_rounds=38)
+        print(f"\n2️⃣ Refrescando {len(rounds_to_fetch)} jornadas abiertas del calendario...")
+        with span("fetch.games", rounds=len(rounds_to_fetch)):
+            fresh_games = extract_all_games_from_feeds_api(rounds=rounds_to_fetch) if rounds_to_fetch else []
+        with span("transform.merge"):
+            all_games, changeset = merge_games(previous_games, fresh_games)
+        print_changeset(changeset, rounds_to_fetch)
+    else:
+        if incremental:
+            print("\n⚠️ No hay datos previos: se realiza una descarga completa")
+        print("\n2️⃣ Obteniendo calendario COMPLETO de partidos...")
+        with span("fetch.games"):
+            all_games = extract_all_games_from_feeds_api()
     
     if not all_games:
         print("❌ Error: No se pudieron obtener partidos")
@@ -318,8 +366,8 @@ def create_static_data():
     
     # Guardar en archivo JSON
     try:
-        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-            json.dump(static_data, f, ensure_ascii=False, indent=2)
+        write_asset(OUTPUT_FILE, static_data, output_format, list_key="games",
+                    dict_fields=GAME_TEAM_FIELDS, gzip_copy=gzip_copy)
         
         print("\n" + "=" * 60)
         print("✅ DATOS ESTÁTICOS GENERADOS EXITOSAMENTE")
@@ -354,6 +402,30 @@ def create_static_data():
                 date = game.get('date', '')[:10] if game.get('date') else 'TBD'
                 print(f"   {home} vs {away} - {date} (Jornada {game.get('round', '?')})")
         
+        with span("transform.standings"):
+            table = compute_standings(all_games, (team['id'] for team in teams))
+        standings_rows = write_standings_asset(STANDINGS_FILE, table, "2025-26", output_format, gzip_copy)
+        print(f"\n📊 Clasificación ({table.games_applied} partidos terminados): {STANDINGS_FILE}")
+        print_standings(standings_rows, limit=5)
+        
+        if roster_data is not None:
+            write_roster_asset(ROSTERS_FILE, roster_data, output_format, gzip_copy)
+            print(f"\n👥 Plantillas: {ROSTERS_FILE}")
+        
+        if report:
+            report_asset(OUTPUT_FILE)
+        
+        if seed_db:
+            print()
+            try:
+                with span("write.seed_db"):
+                    counts = build_seed_database(teams, all_games, SEED_DB_FILE, standings=standings_rows,
+                                                 rosters=roster_data)
+                print_seed_summary(SEED_DB_FILE, counts)
+            except SchemaMismatch as e:
+                print(f"❌ La base de datos no coincide con el esquema de Room: {e}")
+                return False
+        
         return True
         
     except Exception as e:
@@ -361,11 +433,30 @@ def create_static_data():
         return False
 
 if __name__ == "__main__":
-    success = create_static_data()
-    if success:
-        print("\n🎉 ¡Datos estáticos poblados exitosamente!")
-        print("La aplicación ahora tendrá todos los datos precargados en la instalación.")
-    else:
-        print("\n💥 Error al poblar los datos estáticos")
+    parser = argparse.ArgumentParser(description="Pobla los datos estáticos de EuroLeague")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Solo descarga las jornadas que pueden haber cambiado desde la última ejecución")
+    parser.add_argument("--seed-db", action="store_true",
+                        help="Generar también la base de datos SQLite precargada para Room")
+    parser.add_argument("--rosters", action="store_true",
+                        help="Descargar también las plantillas de los clubes")
+    parser.add_argument("--roster-budget", type=float, default=DEFAULT_BUDGET_SECONDS,
+                        help="Presupuesto de tiempo en segundos para la etapa de plantillas")
+    add_format_arguments(parser)
+    args = parser.parse_args()
+    
+    with run_report("populate_game_center_data") as run:
+        success = create_static_data(incremental=args.incremental, output_format=args.format,
+                                     gzip_copy=args.gzip, report=args.report, seed_db=args.seed_db,
+                                     rosters=args.rosters, roster_budget=args.roster_budget)
+        run.ok = success
+        
+        print("\n📋 Informe de completitud:")
+        INCOMPLETE.print_report()
+        if success:
+            print("\n🎉 ¡Datos estáticos poblados exitosamente!")
+            print("La aplicación ahora tendrá todos los datos precargados en la instalación.")
+        else:
+            print("\n💥 Error al poblar los datos estáticos")
     
     sys.exit(0 if success else 1)
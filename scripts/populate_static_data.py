@@ -16,12 +16,23 @@ El script creará:
 - app/src/main/assets/static_data/matches_calendar_2025_26.json
 """
 
-import json
+import argparse
 import os
 import sys
 import requests
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any, Optional
+
+from asset_writer import FORMAT_PRETTY, MATCH_TEAM_FIELDS, add_format_arguments, report_asset, write_asset
+from game_normalizer import from_feed_game, to_calendar_match
+from game_store import GameStore
+import http_client
+import json_codec
+from http_cache import HTTP_CACHE
+from incremental import has_fields, load_previous_games, merge_games, open_rounds, print_changeset
+from paginator import fetch_paginated, print_pagination_summary
+from resilience import INCOMPLETE
+from telemetry import run_report, span
 
 # Configuración
 API_BASE_URL = "https://feeds.incrowdsports.com/provider/euroleague-feeds/v2"
@@ -40,15 +51,19 @@ ASSETS_DIR = os.path.join(PROJECT_ROOT, "app", "src", "main", "assets", "static_
 TEAMS_FILE = os.path.join(ASSETS_DIR, "teams_2025_26.json")
 MATCHES_FILE = os.path.join(ASSETS_DIR, "matches_calendar_2025_26.json")
 
+def game_to_static_match(game: Dict[str, Any]) -> Dict[str, Any]:
+    """Convierte un partido de la API de feeds al formato StaticMatch"""
+    return to_calendar_match(from_feed_game(game))
+
 class EuroLeagueDataPopulator:
     """Poblador de datos estáticos de EuroLeague"""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Cabeceras propias; la sesión con pool de conexiones es la compartida
+        self.headers = {
             'User-Agent': 'EuroLeagueApp/1.0',
             'Accept': 'application/json'
-        })
+        }
         
     def create_assets_directory(self):
         """Crea el directorio assets si no existe"""
@@ -91,6 +106,11 @@ class EuroLeagueDataPopulator:
         
         return teams_list
         
+    def fetch_json(self, url: str) -> Dict[str, Any]:
+        response = http_client.get(url, headers=self.headers, timeout=30)
+        response.raise_for_status()
+        return json_codec.loads(response.content)
+        
     def fetch_teams(self) -> List[Dict[str, Any]]:
         """Obtiene todos los equipos primero intentando clubs, luego extrayendo de partidos"""
         print("🏀 Obteniendo equipos desde API EuroLeague...")
@@ -100,11 +120,11 @@ class EuroLeagueDataPopulator:
         print(f"   URL: {url}")
         
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            clubs = data.get('data', [])
+            page = fetch_paginated(url, self.fetch_json)
+            if not page.complete:
+                print_pagination_summary(page, "clubs")
+                raise requests.RequestException(f"clubs incompletos ({len(page.items)}/{page.total_items})")
+            clubs = page.items
             
             print(f"✅ Equipos obtenidos desde API clubs: {len(clubs)}")
             
@@ -134,14 +154,15 @@ class EuroLeagueDataPopulator:
             
         except requests.RequestException as e:
             print(f"⚠️ Error obteniendo equipos desde clubs: {e}")
+            INCOMPLETE.record("equipos", "clubs", str(e))
             print("🔄 Intentando extraer equipos desde datos de partidos...")
             
             # Obtener partidos y extraer equipos de ahí
             try:
-                response = self.session.get(GAMES_API_URL, timeout=30)
+                response = http_client.get(GAMES_API_URL, headers=self.headers, timeout=30)
                 response.raise_for_status()
                 
-                data = response.json()
+                data = json_codec.loads(response.content)
                 games = data.get('data', [])
                 
                 return self.fetch_teams_from_games(games)
@@ -150,54 +171,54 @@ class EuroLeagueDataPopulator:
                 print(f"❌ Error obteniendo partidos para extraer equipos: {e2}")
                 raise e2
             
-    def fetch_all_matches(self) -> List[Dict[str, Any]]:
-        """Obtiene todos los partidos de la temporada 2025-26"""
+    def fetch_all_matches(self, rounds: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Obtiene todos los partidos de la temporada 2025-26, o solo los de las
+        jornadas indicadas en `rounds` (modo incremental)
+        """
         print(f"⚽ Obteniendo todos los partidos de la temporada 2025-26...")
         
         url = GAMES_API_URL
         print(f"   URL: {url}")
         
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
+            store = GameStore()
+            round_list = sorted(rounds) if rounds is not None else []
             
-            data = response.json()
-            metadata = data.get('metadata', {})
-            total_items = metadata.get('totalItems', 0)
-            
-            print(f"📊 Total partidos en temporada según API: {total_items}")
-            
-            # La API parece limitada a 50 partidos por llamada
-            # Intentemos obtener partidos por jornadas específicas
-            all_games = []
-            
-            # Intentar obtener partidos de diferentes maneras
-            print("� Probando diferentes estrategias de obtención...")
-            
-            # Estrategia 1: Sin parámetros de paginación
-            basic_games = data.get('data', [])
-            print(f"   📄 Estrategia básica: {len(basic_games)} partidos")
+            if rounds is None:
+                # Temporada completa: páginas según metadata.totalItems, en paralelo
+                try:
+                    page = fetch_paginated(url, self.fetch_json)
+                except requests.RequestException as e:
+                    # Ni paginada ni sin paginar: se intenta jornada a jornada
+                    print(f"   ⚠️ Error en la descarga paginada: {e}")
+                    page = None
+                if page is not None:
+                    print(f"📊 Total partidos en temporada según API: {page.total_items}")
+                    print_pagination_summary(page, "partidos")
+                    store.add_many(page.items)
+                if page is None or not page.complete:
+                    # Si la paginación no cuadra se completa jornada a jornada
+                    print("   🔄 Paginación incompleta: descargando por jornadas")
+                    round_list = range(1, TOTAL_ROUNDS + 1)
             
-            # Estrategia 2: Por jornadas individuales
-            for round_num in range(1, 39):  # 38 jornadas
+            for round_num in round_list:
                 try:
                     round_url = f"{url}?round={round_num}"
-                    round_response = self.session.get(round_url, timeout=30)
+                    round_response = http_client.get(round_url, headers=self.headers, timeout=30)
                     if round_response.status_code == 200:
-                        round_data = round_response.json()
+                        round_data = json_codec.loads(round_response.content)
                         round_games = round_data.get('data', [])
                         if round_games:
                             print(f"   📄 Jornada {round_num}: {len(round_games)} partidos")
-                            for game in round_games:
-                                if not any(g.get('id') == game.get('id') for g in all_games):
-                                    all_games.append(game)
-                except:
+                            store.add_many(round_games)
+                    else:
+                        INCOMPLETE.record("jornada", round_num, f"HTTP {round_response.status_code}")
+                except Exception as e:
+                    INCOMPLETE.record("jornada", round_num, str(e))
                     continue
             
-            # Si no conseguimos muchos partidos por jornadas, usar los básicos
-            if len(all_games) < len(basic_games):
-                print("   🔄 Usando datos básicos de la API")
-                all_games = basic_games
+            all_games = store.to_list()
             
             print(f"✅ Total partidos únicos obtenidos: {len(all_games)}")
             
@@ -206,56 +227,7 @@ class EuroLeagueDataPopulator:
             
             for game in all_games:
                 try:
-                    # Procesar fecha y hora
-                    game_date = game.get('date', '')
-                    
-                    # La fecha ya viene en formato ISO
-                    if game_date:
-                        # Convertir de UTC a formato local
-                        from datetime import datetime
-                        try:
-                            dt = datetime.fromisoformat(game_date.replace('Z', '+00:00'))
-                            iso_datetime = dt.isoformat()
-                        except:
-                            iso_datetime = game_date
-                    else:
-                        iso_datetime = "2025-10-01T20:00:00"
-                    
-                    # Procesar broadcasters
-                    broadcasters = []
-                    game_broadcasters = game.get('broadcasters', [])
-                    if isinstance(game_broadcasters, list):
-                        for broadcaster in game_broadcasters:
-                            if isinstance(broadcaster, dict):
-                                broadcasters.append(broadcaster.get('name', ''))
-                            else:
-                                broadcasters.append(str(broadcaster))
-                    
-                    # Obtener información del partido
-                    home_team = game.get('home', {})
-                    away_team = game.get('away', {})
-                    venue = game.get('venue', {})
-                    round_info = game.get('round', {})
-                    
-                    static_match = {
-                        "id": str(game.get('id', '')),
-                        "homeTeamId": str(home_team.get('code', '')),
-                        "awayTeamId": str(away_team.get('code', '')),
-                        "homeTeamName": home_team.get('name', ''),
-                        "awayTeamName": away_team.get('name', ''),
-                        "dateTime": iso_datetime,
-                        "status": game.get('status', 'scheduled'),
-                        "round": round_info.get('round', 1),
-                        "arena": venue.get('name', ''),
-                        "city": venue.get('address', ''),
-                        "country": "",
-                        "broadcasters": broadcasters,
-                        "homeScore": home_team.get('score', None),
-                        "awayScore": away_team.get('score', None)
-                    }
-                    
-                    all_matches.append(static_match)
-                    
+                    all_matches.append(game_to_static_match(game))
                 except Exception as e:
                     print(f"\n⚠️ Error procesando partido {game.get('id', 'unknown')}: {e}")
                     continue
@@ -291,13 +263,13 @@ class EuroLeagueDataPopulator:
             "teams": teams
         }
         
-        with open(TEAMS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(teams_data, f, ensure_ascii=False, indent=2)
+        write_asset(TEAMS_FILE, teams_data)
             
         print(f"✅ Archivo de equipos guardado: {len(teams)} equipos")
         
-    def save_matches_data(self, matches: List[Dict[str, Any]]):
-        """Guarda los datos de partidos en formato JSON"""
+    def save_matches_data(self, matches: List[Dict[str, Any]], output_format: str = FORMAT_PRETTY,
+                          gzip_copy: bool = False):
+        """Guarda los datos de partidos en formato JSON (ver asset_writer para los formatos)"""
         print(f"💾 Guardando partidos en: {MATCHES_FILE}")
         
         matches_data = {
@@ -309,8 +281,8 @@ class EuroLeagueDataPopulator:
             "matches": matches
         }
         
-        with open(MATCHES_FILE, 'w', encoding='utf-8') as f:
-            json.dump(matches_data, f, ensure_ascii=False, indent=2)
+        write_asset(MATCHES_FILE, matches_data, output_format, list_key="matches",
+                    dict_fields=MATCH_TEAM_FIELDS, gzip_copy=gzip_copy)
             
         print(f"✅ Archivo de partidos guardado: {len(matches)} partidos")
         
@@ -323,6 +295,11 @@ class EuroLeagueDataPopulator:
         print(f"⚽ Partidos generados: {len(matches)}")
         print(f"📅 Jornadas cubiertas: {TOTAL_ROUNDS}")
         print(f"🗓️ Generado el: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        HTTP_CACHE.print_stats()
+        http_client.print_connection_stats()
+        
+        print("\n📋 Informe de completitud:")
+        INCOMPLETE.print_report()
         
         # Verificar fechas de partidos
         if matches:
@@ -338,8 +315,26 @@ class EuroLeagueDataPopulator:
         print("\n✅ ¡Datos estáticos listos para la aplicación!")
         print("   Los usuarios tendrán todos los datos desde la primera instalación.")
         
-    def populate_all_data(self):
-        """Ejecuta todo el proceso de población de datos"""
+    def fetch_changed_matches(self, previous: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Refresca solo las jornadas abiertas y las fusiona con el calendario anterior"""
+        rounds = open_rounds(previous, date_field='dateTime', total_rounds=TOTAL_ROUNDS)
+        print(f"🔁 Jornadas abiertas a refrescar: {len(rounds)}/{TOTAL_ROUNDS}")
+        
+        fresh = self.fetch_all_matches(rounds) if rounds else []
+        matches, changeset = merge_games(previous, fresh)
+        matches.sort(key=lambda x: x['dateTime'])
+        
+        print_changeset(changeset, rounds)
+        return matches
+        
+    def populate_all_data(self, incremental: bool = False, output_format: str = FORMAT_PRETTY,
+                          gzip_copy: bool = False, report: bool = False):
+        """
+        Ejecuta todo el proceso de población de datos.
+        
+        En modo incremental reutiliza el calendario ya generado y solo vuelve a
+        descargar las jornadas que todavía pueden cambiar.
+        """
         print("🚀 INICIANDO POBLACIÓN DE DATOS ESTÁTICOS EUROLEAGUE 2025-26")
         print("="*70)
         
@@ -348,17 +343,28 @@ class EuroLeagueDataPopulator:
             self.create_assets_directory()
             
             # Obtener equipos
-            teams = self.fetch_teams()
+            with span("fetch.teams"):
+                teams = self.fetch_teams()
             
             # Obtener partidos
-            matches = self.fetch_all_matches()
+            previous = load_previous_games(MATCHES_FILE, 'matches') if incremental else []
+            with span("fetch.matches", incremental=bool(previous)):
+                if previous and has_fields(previous, ("homeTeamId", "awayTeamId", "dateTime")):
+                    matches = self.fetch_changed_matches(previous)
+                else:
+                    if incremental:
+                        print("⚠️ Sin calendario previo compatible: se realiza una descarga completa")
+                    matches = self.fetch_all_matches()
             
             # Guardar datos
-            self.save_teams_data(teams)
-            self.save_matches_data(matches)
+            with span("write.teams"):
+                self.save_teams_data(teams)
+            self.save_matches_data(matches, output_format, gzip_copy)
             
             # Mostrar resumen
             self.generate_summary(teams, matches)
+            if report:
+                report_asset(MATCHES_FILE)
             
             return True
             
@@ -382,9 +388,18 @@ def main():
         print("   Ejecuta este script desde la raíz del proyecto.")
         sys.exit(1)
     
+    parser = argparse.ArgumentParser(description="Pobla los datos estáticos de EuroLeague 2025-26")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Solo descarga las jornadas que pueden haber cambiado desde la última ejecución")
+    add_format_arguments(parser)
+    args = parser.parse_args()
+    
     # Ejecutar población
     populator = EuroLeagueDataPopulator()
-    success = populator.populate_all_data()
+    with run_report("populate_static_data") as run:
+        success = populator.populate_all_data(incremental=args.incremental, output_format=args.format,
+                                              gzip_copy=args.gzip, report=args.report)
+        run.ok = success
     
     if success:
         print("\n🎉 ¡POBLACIÓN COMPLETADA CON ÉXITO!")
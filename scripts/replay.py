@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Grabación y reproducción offline de las respuestas HTTP de los scripts.
+
+Con la variable EUROLEAGUE_HTTP_MODE, http_client.get cambia de modo:
+
+- live (por defecto): peticiones reales
+- record: peticiones reales y cada respuesta (clubs, jornadas por
+  roundNumber, HTML del Game Center, logos...) se guarda en el almacén de
+  fixtures (EUROLEAGUE_FIXTURES, por defecto scripts/fixtures/)
+- replay: las peticiones van a un servidor HTTP local que sirve las fixtures.
+  Las peticiones siguen pasando por la sesión, el pool de conexiones, los
+  reintentos y el circuit breaker, así que se mide el comportamiento real de
+  cada extractor, pero sin red y de forma determinista. La caché HTTP no se
+  usa en este modo.
+
+El servidor de reproducción admite latencia, jitter e inyección de errores,
+configurables por entorno (o con `serve`):
+
+    EUROLEAGUE_REPLAY_LATENCY_MS   latencia base por respuesta (0)
+    EUROLEAGUE_REPLAY_JITTER_MS    variación uniforme ± sobre la latencia (0)
+    EUROLEAGUE_REPLAY_ERROR_RATE   fracción de respuestas con error (0.0)
+    EUROLEAGUE_REPLAY_ERROR_STATUS código de los errores inyectados (503)
+    EUROLEAGUE_REPLAY_SEED         semilla de jitter y errores (0)
+    EUROLEAGUE_REPLAY_URL          servidor externo ya arrancado (si no, cada
+                                   proceso arranca uno propio en un puerto libre)
+
+La latencia y los errores de cada petición dependen solo de la semilla, la
+URL y el número de veces que se ha pedido, no del orden entre hilos.
+
+Almacén: fixtures/index.json (URL → estado, cabeceras y cuerpo) y
+fixtures/bodies/<sha256> (cuerpos deduplicados por contenido).
+
+Uso:
+    python3 scripts/replay.py record -- python3 scripts/populate_game_center_data.py
+    python3 scripts/replay.py run --latency 80 --jitter 40 --error-rate 0.05 -- python3 scripts/populate_game_center_data.py
+    python3 scripts/replay.py serve --port 8765
+    python3 scripts/replay.py list
+    python3 scripts/replay.py --self-test
+"""
+
+import argparse
+import hashlib
+import http.server
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from asset_writer import write_atomic, write_if_changed
+import json_codec
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FIXTURES_DIR = os.path.join(SCRIPT_DIR, "fixtures")
+INDEX_FILE = "index.json"
+BODIES_DIR = "bodies"
+
+MODE_LIVE = "live"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+MODES = (MODE_LIVE, MODE_RECORD, MODE_REPLAY)
+
+# Cabeceras que se conservan al grabar (el cuerpo se guarda ya descomprimido)
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+def canonical_url(url: str) -> str:
+    """URL con los parámetros ordenados, para que el orden no cambie la clave"""
+    parts = urlparse(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunparse((parts.scheme, parts.netloc.lower(), parts.path or "/", "", query, ""))
+
+
+def fixture_key(url: str) -> str:
+    return hashlib.sha256(canonical_url(url).encode('utf-8')).hexdigest()[:24]
+
+
+class FixtureStore:
+    """Respuestas grabadas indexadas por URL canónica"""
+
+    def __init__(self, directory: str = DEFAULT_FIXTURES_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict[str, Any]] = self._load_index()
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            return json_codec.load(self.index_path).get("entries", {})
+        except (OSError, ValueError):
+            return {}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        return sorted(self._index.values(), key=lambda entry: entry["url"])
+
+    def save(self, url: str, status: int, headers: Dict[str, str], body: bytes):
+        digest = hashlib.sha256(body).hexdigest()
+        write_if_changed(os.path.join(self.directory, BODIES_DIR, digest), body)
+        entry = {
+            "url": canonical_url(url),
+            "status": status,
+            "headers": {name: headers[name] for name in KEPT_HEADERS if name in headers},
+            "body": digest,
+            "size": len(body),
+        }
+        with self._lock:
+            self._index[fixture_key(url)] = entry
+            data = {"version": 1, "entries": dict(sorted(self._index.items()))}
+            write_atomic(self.index_path, json_codec.dumps(data, pretty=True))
+
+    def record_response(self, url: str, response: Any):
+        """Graba una respuesta requests (lee el cuerpo; iter_content sigue funcionando)"""
+        self.save(url, response.status_code, dict(response.headers), response.content)
+
+    def load(self, url: str) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        entry = self._index.get(fixture_key(url))
+        if entry is None:
+            return None
+        with open(os.path.join(self.directory, BODIES_DIR, entry["body"]), 'rb') as f:
+            return entry["status"], entry["headers"], f.read()
+
+
+@dataclass
+class ReplayConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    seed: int = 0
+
+    @classmethod
+    def from_environment(cls) -> "ReplayConfig":
+        env = os.environ
+        return cls(
+            latency_ms=float(env.get("EUROLEAGUE_REPLAY_LATENCY_MS", 0)),
+            jitter_ms=float(env.get("EUROLEAGUE_REPLAY_JITTER_MS", 0)),
+            error_rate=float(env.get("EUROLEAGUE_REPLAY_ERROR_RATE", 0)),
+            error_status=int(env.get("EUROLEAGUE_REPLAY_ERROR_STATUS", 503)),
+            seed=int(env.get("EUROLEAGUE_REPLAY_SEED", 0)),
+        )
+
+    def to_environment(self) -> Dict[str, str]:
+        return {
+            "EUROLEAGUE_REPLAY_LATENCY_MS": str(self.latency_ms),
+            "EUROLEAGUE_REPLAY_JITTER_MS": str(self.jitter_ms),
+            "EUROLEAGUE_REPLAY_ERROR_RATE": str(self.error_rate),
+            "EUROLEAGUE_REPLAY_ERROR_STATUS": str(self.error_status),
+            "EUROLEAGUE_REPLAY_SEED": str(self.seed),
+        }
+
+
+class ReplayStats:
+    """Contadores del servidor (seguros entre hilos)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.served = 0
+        self.missing = 0
+        self.injected_errors = 0
+        self.bytes_sent = 0
+        self._attempts: Dict[str, int] = {}
+
+    def next_attempt(self, key: str) -> int:
+        with self._lock:
+            attempt = self._attempts.get(key, 0)
+            self._attempts[key] = attempt + 1
+            return attempt
+
+    def count(self, served: int = 0, missing: int = 0, errors: int = 0, size: int = 0):
+        with self._lock:
+            self.served += served
+            self.missing += missing
+            self.injected_errors += errors
+            self.bytes_sent += size
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "served": self.served,
+            "missing": self.missing,
+            "injected_errors": self.injected_errors,
+            "bytes_sent": self.bytes_sent,
+        }
+
+
+def replay_path(url: str) -> str:
+    """https://host/path?q → /https/host/path?q (ruta en el servidor de reproducción)"""
+    parts = urlparse(url)
+    path = f"/{parts.scheme}/{parts.netloc}{parts.path or '/'}"
+    return f"{path}?{parts.query}" if parts.query else path
+
+
+def original_url(path: str) -> Optional[str]:
+    """Inversa de replay_path"""
+    scheme, _, rest = path.lstrip('/').partition('/')
+    if scheme not in ("http", "https") or not rest:
+        return None
+    return f"{scheme}://{rest}"
+
+
+class ReplayServer:
+    """Servidor HTTP local que sirve las fixtures con latencia y errores simulados"""
+
+    def __init__(self, store: FixtureStore, config: Optional[ReplayConfig] = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.store = store
+        self.config = config or ReplayConfig()
+        self.stats = ReplayStats()
+        self._server = http.server.ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _decide(self, url: str) -> Tuple[float, bool]:
+        """(retardo en segundos, inyectar error) deterministas por URL e intento"""
+        key = fixture_key(url)
+        attempt = self.stats.next_attempt(key)
+        rng = random.Random(f"{self.config.seed}:{key}:{attempt}")
+        delay = self.config.latency_ms + rng.uniform(-self.config.jitter_ms, self.config.jitter_ms)
+        return max(0.0, delay) / 1000, rng.random() < self.config.error_rate
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # Cabeceras y cuerpo van en escrituras separadas: sin TCP_NODELAY
+                # Nagle + ACK retardado añaden ~40 ms por respuesta con keep-alive
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def do_GET(self):
+                url = original_url(self.path)
+                fixture = server.store.load(url) if url else None
+                delay, inject_error = server._decide(url or self.path)
+                if delay:
+                    time.sleep(delay)
+
+                if fixture is None:
+                    body = json_codec.dumps({"error": "fixture no encontrada", "url": url})
+                    server.stats.count(missing=1)
+                    self._respond(404, {"Content-Type": "application/json"}, body)
+                elif inject_error:
+                    server.stats.count(errors=1)
+                    self._respond(server.config.error_status, {"Retry-After": "0"}, b"")
+                else:
+                    status, headers, body = fixture
+                    server.stats.count(served=1, size=len(body))
+                    self._respond(status, headers, body)
+
+            def _respond(self, status: int, headers: Dict[str, str], body: bytes):
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def shutdown(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class HttpMode:
+    """Estado del modo record/replay de un proceso (lo usa http_client.get)"""
+
+    def __init__(self, mode: str = MODE_LIVE, fixtures_dir: str = DEFAULT_FIXTURES_DIR,
+                 replay_url: Optional[str] = None, config: Optional[ReplayConfig] = None):
+        if mode not in MODES:
+            raise ValueError(f"EUROLEAGUE_HTTP_MODE desconocido: {mode} (usa {', '.join(MODES)})")
+        self.mode = mode
+        self.fixtures_dir = fixtures_dir
+        self.config = config or ReplayConfig()
+        self._replay_url = replay_url.rstrip('/') if replay_url else None
+        self._store: Optional[FixtureStore] = None
+        self._server: Optional[ReplayServer] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls) -> "HttpMode":
+        return cls(
+            mode=os.environ.get("EUROLEAGUE_HTTP_MODE", MODE_LIVE),
+            fixtures_dir=os.environ.get("EUROLEAGUE_FIXTURES", DEFAULT_FIXTURES_DIR),
+            replay_url=os.environ.get("EUROLEAGUE_REPLAY_URL"),
+            config=ReplayConfig.from_environment(),
+        )
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == MODE_RECORD
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == MODE_REPLAY
+
+    @property
+    def store(self) -> FixtureStore:
+        if self._store is None:
+            with self._lock:
+                if self._store is None:
+                    self._store = FixtureStore(self.fixtures_dir)
+        return self._store
+
+    @property
+    def server(self) -> Optional[ReplayServer]:
+        return self._server
+
+    def replay_base(self) -> str:
+        """URL del servidor de reproducción (arranca uno en el proceso si no hay externo)"""
+        if self._replay_url:
+            return self._replay_url
+        with self._lock:
+            if self._server is None:
+                self._server = ReplayServer(FixtureStore(self.fixtures_dir), self.config).start()
+        return self._server.base_url
+
+    def rewrite(self, url: str) -> str:
+        return self.replay_base() + replay_path(url)
+
+    def record(self, url: str, response: Any):
+        """Graba la respuesta salvo errores transitorios (429/5xx), que se reintentan"""
+        if response.status_code != 429 and response.status_code < 500:
+            self.store.record_response(url, response)
+
+
+def print_replay_stats(mode: HttpMode):
+    if mode.server is None:
+        return
+    stats = mode.server.stats.snapshot()
+    print(f"   🎞️ Replay: {stats['served']} respuestas, {stats['injected_errors']} errores inyectados, "
+          f"{stats['missing']} sin fixture, {stats['bytes_sent']:,} bytes")
+
+
+def _run_command(command: List[str], env: Dict[str, str]) -> int:
+    if command and command[0] == "--":
+        command = command[1:]
+    if not command:
+        print("❌ Falta el comando a ejecutar (después de --)")
+        return 2
+    return subprocess.call(command, env={**os.environ, **env})
+
+
+def _self_test() -> bool:
+    """Graba desde un origen local y reproduce con errores inyectados, sin red"""
+    import tempfile
+
+    import requests
+
+    from resilience import CircuitBreaker, RetryPolicy, execute_with_retry
+
+    class Origin(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = json_codec.dumps({"path": self.path})
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    origin = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Origin)
+    threading.Thread(target=origin.serve_forever, daemon=True).start()
+    origin_url = f"http://127.0.0.1:{origin.server_address[1]}"
+    urls = [f"{origin_url}/games?seasonCode=E2025&roundNumber={n}" for n in range(1, 6)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        session = requests.Session()
+        store = FixtureStore(directory)
+        for url in urls:
+            store.record_response(url, session.get(url))
+        origin.shutdown()
+
+        # Mismo orden de parámetros distinto → misma fixture
+        reordered = f"{origin_url}/games?roundNumber=3&seasonCode=E2025"
+        config = ReplayConfig(latency_ms=5, jitter_ms=5, error_rate=0.3, seed=7)
+        server = ReplayServer(FixtureStore(directory), config).start()
+        policy = RetryPolicy(max_attempts=8, base_delay=0, max_delay=0)
+
+        def fetch(url):
+            def send():
+                return session.get(server.base_url + replay_path(url))
+            response = execute_with_retry(send, CircuitBreaker(failure_threshold=100), policy)
+            return json_codec.loads(response.content)
+
+        replayed = [fetch(url) for url in urls]
+        checks = [
+            ("grabación", len(FixtureStore(directory)) == len(urls)),
+            ("reproducción", all(r["path"] == urlparse(u).path + "?" + urlparse(u).query
+                                 for r, u in zip(replayed, urls))),
+            ("URL canónica", fetch(reordered)["path"].endswith("roundNumber=3")),
+            ("errores inyectados y reintentados", server.stats.injected_errors > 0),
+            ("fixture inexistente → 404",
+             session.get(server.base_url + replay_path(origin_url + "/missing")).status_code == 404),
+        ]
+        server.shutdown()
+
+    for name, ok in checks:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return all(ok for _, ok in checks)
+
+
+def main() -> int:
+    if "--self-test" in sys.argv:
+        return 0 if _self_test() else 1
+
+    parser = argparse.ArgumentParser(description="Grabación y reproducción offline de respuestas HTTP")
+    parser.add_argument('--fixtures', default=os.environ.get("EUROLEAGUE_FIXTURES", DEFAULT_FIXTURES_DIR),
+                        help='Directorio del almacén de fixtures')
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    record = sub.add_parser("record", help="Ejecutar un comando grabando sus respuestas")
+    record.add_argument("cmd", nargs=argparse.REMAINDER)
+
+    for name, help_text in (("run", "Ejecutar un comando contra las fixtures"),
+                            ("serve", "Arrancar el servidor de reproducción")):
+        command = sub.add_parser(name, help=help_text)
+        command.add_argument('--latency', type=float, default=0, help='Latencia base en ms')
+        command.add_argument('--jitter', type=float, default=0, help='Variación ± de la latencia en ms')
+        command.add_argument('--error-rate', type=float, default=0, help='Fracción de respuestas con error')
+        command.add_argument('--error-status', type=int, default=503, help='Código HTTP de los errores')
+        command.add_argument('--seed', type=int, default=0, help='Semilla de jitter y errores')
+        if name == "serve":
+            command.add_argument('--port', type=int, default=8765)
+        else:
+            command.add_argument("cmd", nargs=argparse.REMAINDER)
+
+    sub.add_parser("list", help="Listar las fixtures grabadas")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        store = FixtureStore(args.fixtures)
+        for entry in store.entries():
+            print(f"   {entry['status']} {entry['size']:>9,} {entry['url']}")
+        print(f"📦 {len(store)} fixtures en {args.fixtures}")
+        return 0
+
+    if args.command == "record":
+        return _run_command(args.cmd, {"EUROLEAGUE_HTTP_MODE": MODE_RECORD, "EUROLEAGUE_FIXTURES": args.fixtures})
+
+    config = ReplayConfig(args.latency, args.jitter, args.error_rate, args.error_status, args.seed)
+    if args.command == "run":
+        env = {"EUROLEAGUE_HTTP_MODE": MODE_REPLAY, "EUROLEAGUE_FIXTURES": args.fixtures}
+        env.update(config.to_environment())
+        return _run_command(args.cmd, env)
+
+    server = ReplayServer(FixtureStore(args.fixtures), config, port=args.port)
+    print(f"🎞️ Sirviendo {len(server.store)} fixtures en {server.base_url} "
+          f"(EUROLEAGUE_HTTP_MODE=replay EUROLEAGUE_REPLAY_URL={server.base_url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Capa de resiliencia para las llamadas a los feeds.
+
+- Reintentos por petición con backoff exponencial y jitter ("full jitter")
+- Respeto de la cabecera Retry-After en respuestas 429/503
+- Circuit breaker por host: tras varios fallos seguidos deja de insistir
+  durante un tiempo y deja pasar una única petición de prueba
+- Informe final de jornadas/equipos incompletos para no tener que repetir
+  una ejecución completa por un fallo transitorio
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+RETRYABLE_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+
+class CircuitOpenError(requests.RequestException):
+    """El circuito del host está abierto: no se envía la petición"""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Convierte Retry-After (segundos o fecha HTTP) en segundos de espera"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Backoff exponencial con full jitter: espera aleatoria en [0, min(max, base * 2^n)]"""
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5, max_delay: float = 30.0,
+                 rng: Optional[random.Random] = None):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Segundos a esperar antes del reintento número `attempt` (desde 1)"""
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return self._rng.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """Circuit breaker clásico: cerrado → abierto → semiabierto → cerrado"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+
+class CircuitBreakerRegistry:
+    """Un circuit breaker por host"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def for_host(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[host]
+
+
+def execute_with_retry(call: Callable[[], Any], breaker: CircuitBreaker, policy: RetryPolicy,
+                       sleep: Callable[[float], None] = time.sleep) -> Any:
+    """
+    Ejecuta `call` (que devuelve una respuesta con status_code) aplicando
+    reintentos y circuit breaker. Si se agotan los intentos por estado HTTP
+    se devuelve la última respuesta para que el llamador decida.
+    """
+    for attempt in range(1, policy.max_attempts + 1):
+        if not breaker.allow():
+            raise CircuitOpenError("Circuito abierto: host con demasiados fallos seguidos")
+
+        try:
+            response = call()
+        except RETRYABLE_EXCEPTIONS:
+            breaker.record_failure()
+            if attempt == policy.max_attempts:
+                raise
+            sleep(policy.delay(attempt))
+            continue
+
+        if response.status_code not in RETRYABLE_STATUS:
+            breaker.record_success()
+            return response
+
+        breaker.record_failure()
+        if attempt == policy.max_attempts:
+            return response
+        delay = policy.delay(attempt, parse_retry_after(response.headers.get("Retry-After")))
+        # La respuesta descartada se cierra: con stream=True retendría su
+        # conexión del pool hasta el final
+        close = getattr(response, "close", None)
+        if close is not None:
+            close()
+        sleep(delay)
+
+    return response
+
+
+class IncompleteReport:
+    """Registro de elementos (jornadas, equipos, logos) que no se pudieron obtener"""
+
+    def __init__(self):
+        self._items: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, item: Any, reason: str):
+        with self._lock:
+            self._items.append({"kind": kind, "item": item, "reason": reason})
+
+    def items(self, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [entry for entry in self._items if kind is None or entry["kind"] == kind]
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def print_report(self):
+        if not self._items:
+            print("   ✅ Sin elementos incompletos")
+            return
+
+        print(f"   ⚠️ Elementos incompletos ({len(self._items)}):")
+        for entry in self._items:
+            print(f"      - {entry['kind']} {entry['item']}: {entry['reason']}")
+
+
+# Instancias compartidas por los scripts
+BREAKERS = CircuitBreakerRegistry()
+DEFAULT_RETRY_POLICY = RetryPolicy()
+INCOMPLETE = IncompleteReport()
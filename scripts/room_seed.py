@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Generación de una base de datos SQLite precargada con el esquema de Room.
+
+Lee el esquema exportado por Room (app/schemas/.../EuroLeagueDatabase/N.json),
+crea las tablas, índices y la room_master_table tal y como lo haría Room, e
+inserta equipos, partidos y clasificación (standings.py) a partir de los
+mismos datos que recopila populate_game_center_data.py. El fichero resultante se puede abrir desde la
+app con Room.databaseBuilder(...).createFromAsset(...), evitando parsear JSON
+e insertar cientos de filas en el primer arranque.
+
+Antes de publicar el fichero se valida: identity hash, user_version,
+columnas (tipo, NOT NULL, clave primaria) e índices de cada tabla.
+
+Uso:
+    python3 scripts/room_seed.py [--input static_data.json] [--schema N.json] [--output fichero.db]
+"""
+
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from game_normalizer import Column, compile_view, from_static_data_game
+import json_codec
+from rosters import load_roster_asset, player_rows, team_roster_rows
+from standings import compute_standings
+from telemetry import run_report
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+SCHEMA_DIR = os.path.join(PROJECT_ROOT, "app", "schemas",
+                          "es.itram.basketmatch.data.datasource.local.EuroLeagueDatabase")
+ASSETS_DIR = os.path.join(PROJECT_ROOT, "app", "src", "main", "assets")
+DEFAULT_INPUT = os.path.join(ASSETS_DIR, "static_data.json")
+DEFAULT_OUTPUT = os.path.join(ASSETS_DIR, "databases", "euroleague_database.db")
+DEFAULT_ROSTERS = os.path.join(ASSETS_DIR, "static_data", "rosters_2025_26.json")
+
+TABLE_PLACEHOLDER = "${TABLE_NAME}"
+
+# Estados de los feeds → MatchStatus (Room guarda el nombre del enum)
+ROOM_MATCH_STATUS = {
+    "scheduled": "SCHEDULED",
+    "confirmed": "SCHEDULED",
+    "live": "LIVE",
+    "playing": "LIVE",
+    "result": "FINISHED",
+    "played": "FINISHED",
+    "finished": "FINISHED",
+    "closed": "FINISHED",
+    "postponed": "POSTPONED",
+    "cancelled": "CANCELLED",
+}
+
+# phaseType de los feeds → SeasonType
+ROOM_SEASON_TYPE = {
+    "RS": "REGULAR",
+    "PO": "PLAYOFFS",
+    "FF": "FINAL_FOUR",
+}
+
+
+class SchemaMismatch(Exception):
+    """La base de datos generada no coincide con el esquema de Room"""
+
+
+def latest_schema_path(schema_dir: str = SCHEMA_DIR) -> str:
+    """Ruta del esquema exportado con la versión más alta"""
+    paths = glob.glob(os.path.join(schema_dir, "*.json"))
+    if not paths:
+        raise FileNotFoundError(f"No hay esquemas de Room en {schema_dir}")
+    return max(paths, key=lambda p: int(os.path.splitext(os.path.basename(p))[0]))
+
+
+def load_room_schema(path: Optional[str] = None) -> Dict[str, Any]:
+    """Carga la sección 'database' del esquema exportado por Room"""
+    with open(path or latest_schema_path(), 'r', encoding='utf-8') as f:
+        return json.load(f)["database"]
+
+
+def _entity_sql(sql: str, table_name: str) -> str:
+    return sql.replace(TABLE_PLACEHOLDER, table_name)
+
+
+def create_schema(conn: sqlite3.Connection, schema: Dict[str, Any]):
+    """Crea tablas, índices y room_master_table igual que Room en onCreate"""
+    for entity in schema["entities"]:
+        table = entity["tableName"]
+        conn.execute(_entity_sql(entity["createSql"], table))
+        for index in entity.get("indices", []):
+            conn.execute(_entity_sql(index["createSql"], table))
+
+    for query in schema.get("setupQueries", []):
+        conn.execute(query)
+
+    conn.execute(f"PRAGMA user_version = {int(schema['version'])}")
+
+
+def insert_rows(conn: sqlite3.Connection, entity: Dict[str, Any], rows: Iterable[Dict[str, Any]]) -> int:
+    """Inserta filas (diccionarios por columnName) con las columnas del esquema"""
+    columns = [field["columnName"] for field in entity["fields"]]
+    required = [field["columnName"] for field in entity["fields"] if field.get("notNull")]
+    sql = (f"INSERT OR REPLACE INTO `{entity['tableName']}` "
+           f"({', '.join(f'`{c}`' for c in columns)}) VALUES ({', '.join('?' for _ in columns)})")
+
+    values = []
+    for row in rows:
+        missing = [c for c in required if row.get(c) is None]
+        if missing:
+            raise SchemaMismatch(f"{entity['tableName']}: fila {row.get('id')} sin {missing}")
+        values.append(tuple(row.get(c) for c in columns))
+
+    conn.executemany(sql, values)
+    return len(values)
+
+
+def team_row(team: Dict[str, Any]) -> Dict[str, Any]:
+    """Equipo de static_data.json → fila de la tabla teams"""
+    return {
+        "id": team.get("id", ""),
+        "name": team.get("name", ""),
+        "shortName": team.get("shortName") or team.get("name", ""),
+        "code": team.get("code") or team.get("id", ""),
+        "city": team.get("city") or "",
+        "country": team.get("country") or "",
+        "logoUrl": team.get("logoUrl") or team.get("imageUrl") or "",
+        "founded": team.get("founded") or 0,
+        "coach": team.get("coach") or "",
+        "website": team.get("website") or "",
+        "primaryColor": team.get("primaryColor") or "#000000",
+        "secondaryColor": team.get("secondaryColor") or "#FFFFFF",
+        "is_favorite": 0,
+    }
+
+
+# Columnas de la tabla matches que salen del partido (nombres y logos se
+# completan con los equipos)
+ROOM_MATCH_VIEW = compile_view({
+    "id": Column("id", ""),
+    "homeTeamId": Column("home_code", ""),
+    "homeTeamName": "home_name",
+    "awayTeamId": Column("away_code", ""),
+    "awayTeamName": "away_name",
+    # LocalDateTimeConverter usa ISO_LOCAL_DATE_TIME (ver is_local_date_time)
+    "dateTime": "date_iso",
+    "venue": Column("venue", convert=lambda venue: venue or ""),
+    "round": Column("round", 0),
+    "status": Column("status", "", lambda status: ROOM_MATCH_STATUS.get(str(status).lower(), "SCHEDULED")),
+    "homeScore": "home_score",
+    "awayScore": "away_score",
+    "seasonType": Column("phase_type", convert=lambda phase: ROOM_SEASON_TYPE.get(phase, "REGULAR")),
+}, "room_match_view")
+
+
+def match_row(game: Dict[str, Any], teams_by_id: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Partido de static_data.json → fila de la tabla matches"""
+    row = ROOM_MATCH_VIEW(from_static_data_game(game))
+    home = teams_by_id.get(row["homeTeamId"], {})
+    away = teams_by_id.get(row["awayTeamId"], {})
+    row["homeTeamName"] = row["homeTeamName"] or home.get("name", "")
+    row["homeTeamLogo"] = home.get("logoUrl") or None
+    row["awayTeamName"] = row["awayTeamName"] or away.get("name", "")
+    row["awayTeamLogo"] = away.get("logoUrl") or None
+    return row
+
+
+def is_local_date_time(value: Optional[str]) -> bool:
+    """True si LocalDateTime.parse(value) (ISO_LOCAL_DATE_TIME) lo acepta"""
+    if not value or "T" not in value:
+        return False
+    try:
+        return datetime.fromisoformat(value).tzinfo is None
+    except ValueError:
+        return False
+
+
+def match_rows(games: Iterable[Dict[str, Any]], teams_by_id: Dict[str, Dict[str, Any]],
+               skipped: List[str]) -> Iterable[Dict[str, Any]]:
+    """
+    Filas de la tabla matches. Los partidos sin fecha válida se omiten (y se
+    anotan en `skipped`): la app no podría leer la fila al convertir dateTime.
+    """
+    for game in games:
+        row = match_row(game, teams_by_id)
+        if is_local_date_time(row["dateTime"]):
+            yield row
+        else:
+            skipped.append(str(row["id"]))
+
+
+def validate_database(path: str, schema: Dict[str, Any]) -> List[str]:
+    """Compara la base de datos con el esquema. Devuelve la lista de diferencias"""
+    problems = []
+    conn = sqlite3.connect(path)
+    try:
+        row = conn.execute("SELECT identity_hash FROM room_master_table WHERE id = 42").fetchone()
+        if not row or row[0] != schema["identityHash"]:
+            problems.append(f"identity hash {row[0] if row else None} != {schema['identityHash']}")
+
+        user_version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if user_version != schema["version"]:
+            problems.append(f"user_version {user_version} != {schema['version']}")
+
+        for entity in schema["entities"]:
+            table = entity["tableName"]
+            info = {r[1]: r for r in conn.execute(f"PRAGMA table_info(`{table}`)")}
+            if not info:
+                problems.append(f"{table}: tabla inexistente")
+                continue
+
+            expected = {field["columnName"]: field for field in entity["fields"]}
+            if set(info) != set(expected):
+                problems.append(f"{table}: columnas {sorted(info)} != {sorted(expected)}")
+            for name, field in expected.items():
+                if name not in info:
+                    continue
+                _, _, col_type, not_null, _, pk = info[name]
+                if col_type.upper() != field["affinity"]:
+                    problems.append(f"{table}.{name}: tipo {col_type} != {field['affinity']}")
+                if bool(not_null) != bool(field.get("notNull")):
+                    problems.append(f"{table}.{name}: NOT NULL {bool(not_null)}")
+
+            pk_columns = [r[1] for r in sorted(info.values(), key=lambda r: r[5]) if r[5]]
+            if pk_columns != entity["primaryKey"]["columnNames"]:
+                problems.append(f"{table}: clave primaria {pk_columns}")
+
+            indexes = {r[1] for r in conn.execute(f"PRAGMA index_list(`{table}`)")}
+            for index in entity.get("indices", []):
+                if index["name"] not in indexes:
+                    problems.append(f"{table}: falta el índice {index['name']}")
+    finally:
+        conn.close()
+    return problems
+
+
+def build_seed_database(teams: List[Dict[str, Any]], games: List[Dict[str, Any]],
+                        output_path: str = DEFAULT_OUTPUT,
+                        schema_path: Optional[str] = None,
+                        standings: Optional[List[Dict[str, Any]]] = None,
+                        rosters: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+    """
+    Genera la base de datos precargada en un temporal, la valida contra el
+    esquema y solo entonces la mueve a `output_path`. Si no se pasan las filas
+    de clasificación se calculan a partir de `games`; las plantillas (asset de
+    rosters.py) son opcionales. Lanza SchemaMismatch si la validación falla.
+    """
+    if standings is None:
+        standings = compute_standings(games, (team.get("id") for team in teams)).rows()
+
+    schema = load_room_schema(schema_path)
+    entities = {entity["tableName"]: entity for entity in schema["entities"]}
+
+    directory = os.path.dirname(output_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".db")
+    os.close(fd)
+
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            # Room abre las bases de datos en modo WAL; el asset se entrega sin journal
+            conn.execute("PRAGMA journal_mode = DELETE")
+            with conn:
+                create_schema(conn, schema)
+                team_rows = [team_row(team) for team in teams]
+                teams_by_id = {row["id"]: row for row in team_rows}
+                skipped = []
+                counts = {
+                    "teams": insert_rows(conn, entities["teams"], team_rows),
+                    "matches": insert_rows(conn, entities["matches"], match_rows(games, teams_by_id, skipped)),
+                    "standings": insert_rows(conn, entities["standings"], standings),
+                    "players": 0,
+                    "skipped_matches": skipped,
+                }
+                if rosters:
+                    insert_rows(conn, entities["team_rosters"], team_roster_rows(rosters))
+                    counts["players"] = insert_rows(conn, entities["players"], player_rows(rosters))
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+
+        problems = validate_database(tmp_path, schema)
+        if problems:
+            raise SchemaMismatch("; ".join(problems))
+
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    counts["version"] = schema["version"]
+    counts["bytes"] = os.path.getsize(output_path)
+    return counts
+
+
+def print_seed_summary(output_path: str, counts: Dict[str, int]):
+    print(f"🗄️ Base de datos precargada: {output_path}")
+    print(f"   📐 Esquema Room v{counts['version']} (identity hash validado)")
+    print(f"   🏆 {counts['teams']} equipos, ⚽ {counts['matches']} partidos, "
+          f"📊 {counts['standings']} filas de clasificación, 👥 {counts['players']} jugadores")
+    if counts["skipped_matches"]:
+        print(f"   ⚠️ {len(counts['skipped_matches'])} partidos sin fecha válida omitidos: "
+              f"{', '.join(counts['skipped_matches'][:10])}")
+    print(f"   📦 {counts['bytes'] / 1024:.1f} KB")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Genera la base de datos SQLite precargada para Room")
+    parser.add_argument('--input', default=DEFAULT_INPUT, help='static_data.json de origen')
+    parser.add_argument('--schema', default=None, help='Esquema Room exportado (por defecto el más reciente)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Fichero .db de salida')
+    parser.add_argument('--rosters', default=DEFAULT_ROSTERS, help='Asset de plantillas (opcional)')
+    args = parser.parse_args()
+
+    data = json_codec.load(args.input)
+
+    try:
+        counts = build_seed_database(data.get("teams", []), data.get("games", []), args.output, args.schema,
+                                     rosters=load_roster_asset(args.rosters))
+    except SchemaMismatch as e:
+        print(f"❌ La base de datos no coincide con el esquema: {e}")
+        return 1
+
+    print_seed_summary(args.output, counts)
+    return 0
+
+
+if __name__ == "__main__":
+    with run_report("room_seed"):
+        sys.exit(main())
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Etapa de plantillas: descarga concurrente de los jugadores de cada club.
+
+Las plantillas de los 20 clubes se piden en paralelo a la API oficial
+(clubs/{code}/people) a través del cliente HTTP compartido, se normalizan a
+registros compactos con los campos de PlayerEntity y las URLs de imagen se
+deduplican en una tabla común que los jugadores referencian por índice.
+
+La etapa tiene un presupuesto de tiempo: las plantillas que no han empezado
+a descargarse cuando se agota quedan en el informe de incompletos y se
+conservan las de la ejecución anterior si existen.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import http_client
+import json_codec
+from asset_writer import FORMAT_PRETTY, write_asset
+from resilience import INCOMPLETE
+from round_fetcher import DEFAULT_BURST, DEFAULT_MAX_IN_FLIGHT, DEFAULT_RATE_PER_SECOND, TokenBucket
+
+API_BASE_URL = "https://api-live.euroleague.net/v2"
+COMPETITION_CODE = "E"
+SEASON_CODE = "E2025"
+DEFAULT_BUDGET_SECONDS = 30.0
+
+# type de la API: J = jugador, C = entrenador, Z = staff
+PLAYER_TYPE = "J"
+
+# positionName de la API → PlayerPosition (ver PlayerPosition.fromString en la app)
+PLAYER_POSITIONS = {
+    "PG": "POINT_GUARD", "POINT GUARD": "POINT_GUARD", "BASE": "POINT_GUARD",
+    "SG": "SHOOTING_GUARD", "SHOOTING GUARD": "SHOOTING_GUARD", "ESCOLTA": "SHOOTING_GUARD",
+    "SF": "SMALL_FORWARD", "SMALL FORWARD": "SMALL_FORWARD", "ALERO": "SMALL_FORWARD",
+    "PF": "POWER_FORWARD", "POWER FORWARD": "POWER_FORWARD", "ALA-PIVOT": "POWER_FORWARD",
+    "ALA-PÍVOT": "POWER_FORWARD",
+    "C": "CENTER", "CENTER": "CENTER", "PIVOT": "CENTER", "PÍVOT": "CENTER",
+    "G": "GUARD", "GUARD": "GUARD",
+    "F": "FORWARD", "FORWARD": "FORWARD",
+}
+
+
+def roster_url(club_code: str, competition: str = COMPETITION_CODE, season: str = SEASON_CODE) -> str:
+    return f"{API_BASE_URL}/competitions/{competition}/seasons/{season}/clubs/{club_code}/people"
+
+
+@dataclass
+class RosterResult:
+    """Resultado de la descarga de la plantilla de un club"""
+    team_code: str
+    people: List[Dict[str, Any]] = field(default_factory=list)
+    latency: float = 0.0
+    size: int = 0
+    error: Optional[str] = None
+    skipped: bool = False
+
+
+def fetch_roster(team_code: str, timeout: float = 15) -> RosterResult:
+    start = time.perf_counter()
+    try:
+        response = http_client.get(roster_url(team_code), timeout=timeout)
+        response.raise_for_status()
+        payload = json_codec.loads(response.content)
+        # La API devuelve directamente un array de personas
+        people = payload.get('data', []) if isinstance(payload, dict) else payload
+        return RosterResult(team_code, people or [], time.perf_counter() - start, len(response.content))
+    except Exception as e:
+        return RosterResult(team_code, latency=time.perf_counter() - start, error=str(e))
+
+
+def fetch_rosters(team_codes: Iterable[str],
+                  max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                  rate_per_second: float = DEFAULT_RATE_PER_SECOND,
+                  budget_seconds: float = DEFAULT_BUDGET_SECONDS) -> List[RosterResult]:
+    """
+    Descarga las plantillas en paralelo respetando el límite de tasa. Las que
+    no han empezado cuando se agota el presupuesto se marcan como omitidas.
+    Los resultados mantienen el orden de `team_codes`.
+    """
+    codes = list(team_codes)
+    bucket = TokenBucket(rate_per_second, DEFAULT_BURST)
+    deadline = time.monotonic() + budget_seconds
+
+    def run(team_code: str) -> RosterResult:
+        bucket.acquire()
+        if time.monotonic() > deadline:
+            return RosterResult(team_code, skipped=True, error="presupuesto de tiempo agotado")
+        return fetch_roster(team_code)
+
+    if not codes:
+        return []
+    workers = max(1, min(max_in_flight, len(codes)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run, codes))
+
+
+class ImageTable:
+    """URLs de imagen deduplicadas; los jugadores guardan solo el índice"""
+
+    def __init__(self):
+        self.urls: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def add(self, url: Optional[str]) -> Optional[int]:
+        if not url:
+            return None
+        if url not in self._index:
+            self._index[url] = len(self.urls)
+            self.urls.append(url)
+        return self._index[url]
+
+
+def normalize_player(person_entry: Dict[str, Any], images: ImageTable) -> Optional[Dict[str, Any]]:
+    """Entrada de la API → registro compacto de jugador (None si no es jugador)"""
+    if str(person_entry.get('type') or '').upper() != PLAYER_TYPE \
+            and str(person_entry.get('typeName') or '').upper() != "PLAYER":
+        return None
+
+    person = person_entry.get('person') or {}
+    name = person.get('passportName') or person.get('name') or ''
+    surname = person.get('passportSurname') or person.get('jerseyName') or ''
+    dorsal = person_entry.get('dorsal') or person_entry.get('dorsalRaw')
+    country = (person.get('country') or {}).get('name')
+    birth_country = (person.get('birthCountry') or {}).get('name')
+    image_urls = person_entry.get('images') or {}
+
+    # Mismo código alternativo que PlayerDto.validCode
+    code = person.get('code') or (name or surname or "UNK")[:3].upper() + str(dorsal or "00")[:2].zfill(2)
+
+    record = {
+        "code": code,
+        "name": name,
+        "surname": surname,
+        "fullName": person.get('name') or f"{name} {surname}".strip(),
+        "jersey": int(dorsal) if str(dorsal or '').isdigit() else None,
+        "position": PLAYER_POSITIONS.get(str(person_entry.get('positionName') or '').upper(), "UNKNOWN"),
+        "height": f"{person['height']}cm" if person.get('height') else None,
+        "weight": f"{person['weight']}kg" if person.get('weight') else None,
+        "dateOfBirth": person.get('birthDate'),
+        "placeOfBirth": birth_country or country,
+        "nationality": country,
+        # Misma prioridad que PlayerMapper.fromApiDto: action > profile > headshot
+        "image": images.add(image_urls.get('action') or image_urls.get('profile') or image_urls.get('headshot')),
+        "active": bool(person_entry.get('active', True)),
+    }
+    # Registro compacto: se omiten los campos vacíos
+    return {key: value for key, value in record.items() if value not in (None, '')}
+
+
+def build_roster_data(results: List[RosterResult], teams: List[Dict[str, Any]],
+                      season: str = "2025-26") -> Dict[str, Any]:
+    """Construye el asset de plantillas a partir de las descargas"""
+    teams_by_code = {team.get('code') or team.get('id'): team for team in teams}
+    images = ImageTable()
+    rosters = []
+
+    for result in results:
+        if result.error:
+            continue
+        team = teams_by_code.get(result.team_code, {})
+        logo_url = team.get('logoUrl') or team.get('imageUrl')
+        players = []
+        seen = set()
+        for entry in result.people:
+            player = normalize_player(entry, images)
+            if player is None or player.get('code') in seen:
+                continue
+            seen.add(player.get('code'))
+            players.append(player)
+        rosters.append({
+            "teamCode": result.team_code,
+            "teamName": team.get('name', result.team_code),
+            "logoUrl": logo_url if isinstance(logo_url, str) and logo_url else None,
+            "players": players,
+        })
+
+    return {
+        "version": "1.0",
+        "season": season,
+        "seasonCode": SEASON_CODE,
+        "lastUpdated": datetime.now().isoformat(),
+        "images": images.urls,
+        "rosters": rosters,
+    }
+
+
+def load_roster_asset(path: str) -> Optional[Dict[str, Any]]:
+    """Carga el asset de plantillas de una ejecución anterior"""
+    if not os.path.exists(path):
+        return None
+    try:
+        return json_codec.load(path)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ No se pudo leer {path}: {e}")
+        return None
+
+
+def merge_previous_rosters(data: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> int:
+    """
+    Conserva las plantillas de la ejecución anterior para los clubes que no se
+    pudieron descargar. Devuelve cuántas se recuperaron.
+    """
+    if not previous:
+        return 0
+    present = {roster["teamCode"] for roster in data["rosters"]}
+    images = ImageTable()
+    for url in data["images"]:
+        images.add(url)
+
+    previous_images = previous.get("images", [])
+    recovered = 0
+    for roster in previous.get("rosters", []):
+        if roster.get("teamCode") in present:
+            continue
+        for player in roster.get("players", []):
+            if "image" in player:
+                player["image"] = images.add(previous_images[player["image"]])
+        data["rosters"].append(roster)
+        recovered += 1
+
+    data["images"] = images.urls
+    return recovered
+
+
+def player_rows(data: Dict[str, Any], last_updated_ms: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Filas de la tabla `players` de Room (id = teamCode_playerCode, como PlayerMapper)"""
+    last_updated_ms = last_updated_ms or int(time.time() * 1000)
+    images = data.get("images", [])
+    rows = []
+    for roster in data.get("rosters", []):
+        team_code = roster["teamCode"]
+        for player in roster.get("players", []):
+            rows.append({
+                "id": f"{team_code}_{player.get('code', '')}",
+                "teamCode": team_code,
+                "playerCode": player.get("code", ""),
+                "name": player.get("name", ""),
+                "surname": player.get("surname", ""),
+                "fullName": player.get("fullName", ""),
+                "jersey": player.get("jersey"),
+                "position": player.get("position"),
+                "height": player.get("height"),
+                "weight": player.get("weight"),
+                "dateOfBirth": player.get("dateOfBirth"),
+                "placeOfBirth": player.get("placeOfBirth"),
+                "nationality": player.get("nationality"),
+                "experience": None,
+                "profileImageUrl": images[player["image"]] if "image" in player else None,
+                "isActive": int(player.get("active", True)),
+                "isStarter": 0,
+                "isCaptain": 0,
+                "lastUpdated": last_updated_ms,
+            })
+    return rows
+
+
+def team_roster_rows(data: Dict[str, Any], last_updated_ms: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Filas de la tabla `team_rosters` de Room"""
+    last_updated_ms = last_updated_ms or int(time.time() * 1000)
+    return [{
+        "teamCode": roster["teamCode"],
+        "teamName": roster["teamName"],
+        "season": data.get("seasonCode", SEASON_CODE),
+        "logoUrl": roster.get("logoUrl"),
+        "lastUpdated": last_updated_ms,
+    } for roster in data.get("rosters", [])]
+
+
+def write_roster_asset(path: str, data: Dict[str, Any], output_format: str = FORMAT_PRETTY,
+                       gzip_copy: bool = False):
+    write_asset(path, data, output_format, gzip_copy=gzip_copy)
+
+
+def record_incomplete(results: List[RosterResult]):
+    for result in results:
+        if result.error:
+            INCOMPLETE.record("plantilla", result.team_code, result.error)
+
+
+def print_budget_report(results: List[RosterResult], data: Dict[str, Any],
+                        wall_time: float, budget_seconds: float):
+    """Informe de tiempos de la etapa frente a su presupuesto"""
+    fetched = [r for r in results if not r.error]
+    skipped = sum(1 for r in results if r.skipped)
+    failed = len(results) - len(fetched) - skipped
+    players = sum(len(roster["players"]) for roster in data["rosters"])
+    status = "✅" if wall_time <= budget_seconds and not skipped else "⚠️"
+
+    print(f"   {status} Tiempo: {wall_time:.2f}s de {budget_seconds:.0f}s de presupuesto")
+    print(f"   👥 Plantillas: {len(fetched)} descargadas, {failed} fallidas, {skipped} omitidas")
+    print(f"   🏀 Jugadores: {players} | 🖼️ Imágenes únicas: {len(data['images'])}")
+    if fetched:
+        latencies = sorted(r.latency for r in fetched)
+        slowest = max(fetched, key=lambda r: r.latency)
+        total_kb = sum(r.size for r in fetched) / 1024
+        print(f"   ⏱️ Latencia media: {sum(latencies) / len(latencies):.2f}s | "
+              f"más lenta: {slowest.team_code} ({slowest.latency:.2f}s) | {total_kb:.0f} KB descargados")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Motor de descarga concurrente de jornadas para la API de feeds de EuroLeague.
+
+Sustituye la descarga secuencial con pausa fija (time.sleep) por un pool de
+hilos con un número máximo de peticiones en vuelo y un limitador token-bucket
+que respeta los límites del feed sin dejar tiempo muerto entre peticiones.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional
+
+# Configuración por defecto
+DEFAULT_MAX_IN_FLIGHT = 8
+DEFAULT_RATE_PER_SECOND = 10.0
+DEFAULT_BURST = 10
+
+
+class TokenBucket:
+    """Limitador de tasa token-bucket seguro entre hilos"""
+
+    def __init__(self, rate_per_second: float, capacity: int):
+        self.rate = rate_per_second
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Bloquea hasta que haya un token disponible y lo consume"""
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - self._last_refill
+                self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+                self._last_refill = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+@dataclass
+class RoundResult:
+    """Resultado de la descarga de una jornada"""
+    round_num: int
+    payload: Any
+    latency: float
+    error: Optional[str] = None
+
+
+def fetch_rounds(round_numbers: Iterable[int],
+                 fetch: Callable[[int], Any],
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 rate_per_second: float = DEFAULT_RATE_PER_SECOND,
+                 burst: int = DEFAULT_BURST) -> List[RoundResult]:
+    """
+    Descarga varias jornadas en paralelo.
+
+    `fetch` recibe el número de jornada y devuelve el payload ya decodificado.
+    Los resultados se devuelven en el mismo orden que `round_numbers`,
+    independientemente del orden en que terminen las peticiones.
+    """
+    rounds = list(round_numbers)
+    bucket = TokenBucket(rate_per_second, burst)
+
+    def run(round_num: int) -> RoundResult:
+        bucket.acquire()
+        start = time.perf_counter()
+        try:
+            payload = fetch(round_num)
+            return RoundResult(round_num, payload, time.perf_counter() - start)
+        except Exception as e:
+            return RoundResult(round_num, None, time.perf_counter() - start, str(e))
+
+    workers = max(1, min(max_in_flight, len(rounds)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run, rounds))
+
+
+def print_latency_summary(results: List[RoundResult], wall_time: float):
+    """Muestra un resumen de latencias por jornada"""
+    if not results:
+        return
+
+    latencies = sorted(r.latency for r in results)
+    slowest = max(results, key=lambda r: r.latency)
+    average = sum(latencies) / len(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+    print(f"   ⏱️ Tiempo total: {wall_time:.2f}s ({len(results)} jornadas)")
+    print(f"   ⏱️ Latencia media: {average:.2f}s | p95: {p95:.2f}s")
+    print(f"   🐢 Jornada más lenta: {slowest.round_num} ({slowest.latency:.2f}s)")
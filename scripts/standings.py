@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Cálculo de la clasificación a partir de los partidos recopilados.
+
+Las estadísticas se guardan en arrays indexados por equipo (NumPy si está
+instalado, listas en caso contrario) y se acumulan en una sola pasada sobre
+los partidos terminados (np.bincount por equipo y por pareja de equipos). Además se mantiene una matriz de enfrentamientos
+directos (victorias y puntos) para aplicar los desempates de la EuroLeague:
+
+1. Victorias
+2. Victorias en los enfrentamientos directos entre los equipos empatados
+3. Diferencia de puntos en esos enfrentamientos directos
+4. Diferencia de puntos general
+5. Puntos a favor
+
+Los pasos 2 y 3 se vuelven a aplicar dentro de cada subgrupo que siga
+empatado. Un partido que termina se puede aplicar de forma incremental con
+apply_game sin recalcular la temporada.
+
+Las filas generadas coinciden con la tabla `standings` del esquema Room.
+"""
+
+from datetime import datetime
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from asset_writer import FORMAT_PRETTY, write_asset
+from game_store import FINAL_STATUS_RANK, STATUS_RANK, game_scores, game_team_codes, is_finished
+
+SEASON_TYPE_REGULAR = "REGULAR"
+
+_STATS = ("played", "won", "points_for", "points_against")
+
+FINISHED_STATUSES = frozenset(status for status, rank in STATUS_RANK.items() if rank >= FINAL_STATUS_RANK)
+
+
+def _zeros(size: int) -> Any:
+    return np.zeros(size, dtype=np.int64) if np is not None else [0] * size
+
+
+def _zeros_matrix(size: int) -> Any:
+    if np is not None:
+        return np.zeros((size, size), dtype=np.int64)
+    return [[0] * size for _ in range(size)]
+
+
+class StandingsTable:
+    """Clasificación de una competición indexada por código de equipo"""
+
+    def __init__(self, team_codes: Iterable[str] = ()):
+        self.team_codes: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._applied: Dict[Any, tuple] = {}
+        self._allocate(0)
+        for code in team_codes:
+            self._ensure_team(code)
+
+    def _allocate(self, size: int):
+        for name in _STATS:
+            setattr(self, name, _zeros(size))
+        self.h2h_wins = _zeros_matrix(size)
+        self.h2h_points = _zeros_matrix(size)
+
+    def _ensure_team(self, code: str) -> int:
+        """Devuelve el índice del equipo, ampliando los arrays si es nuevo"""
+        index = self._index.get(code)
+        if index is not None:
+            return index
+
+        index = len(self.team_codes)
+        self.team_codes.append(code)
+        self._index[code] = index
+
+        if np is not None:
+            for name in _STATS:
+                setattr(self, name, np.append(getattr(self, name), 0))
+            self.h2h_wins = np.pad(self.h2h_wins, ((0, 1), (0, 1)))
+            self.h2h_points = np.pad(self.h2h_points, ((0, 1), (0, 1)))
+        else:
+            for name in _STATS:
+                getattr(self, name).append(0)
+            for matrix in (self.h2h_wins, self.h2h_points):
+                for row in matrix:
+                    row.append(0)
+                matrix.append([0] * (index + 1))
+        return index
+
+    @staticmethod
+    def _parse_game(game: Dict[str, Any]) -> tuple:
+        """
+        Devuelve (clave, entrada). La entrada es (local, visitante, puntos
+        local, puntos visitante) o None si el partido no ha terminado.
+        """
+        home, away = game_team_codes(game)
+        key = game.get('id') or (home, away, game.get('round'))
+        if not is_finished(game) or not home or not away:
+            return key, None
+        home_score, away_score = game_scores(game)
+        return key, (home, away, int(home_score), int(away_score))
+
+    @property
+    def games_applied(self) -> int:
+        return len(self._applied)
+
+    def _add(self, home: int, away: int, home_score: int, away_score: int, sign: int = 1):
+        """Suma (o resta con sign=-1) un partido en los arrays"""
+        home_win = int(home_score > away_score)
+        away_win = int(away_score > home_score)
+
+        self.played[home] += sign
+        self.played[away] += sign
+        self.won[home] += sign * home_win
+        self.won[away] += sign * away_win
+        self.points_for[home] += sign * home_score
+        self.points_for[away] += sign * away_score
+        self.points_against[home] += sign * away_score
+        self.points_against[away] += sign * home_score
+
+        self.h2h_wins[home][away] += sign * home_win
+        self.h2h_wins[away][home] += sign * away_win
+        self.h2h_points[home][away] += sign * home_score
+        self.h2h_points[away][home] += sign * away_score
+
+    def compute(self, games: Iterable[Dict[str, Any]]) -> "StandingsTable":
+        """
+        Recalcula la clasificación completa en una pasada: cada partido
+        terminado se traduce directamente a (índice local, índice visitante,
+        puntos local, puntos visitante) y las sumas por equipo se hacen con
+        np.bincount (o un bucle sobre listas sin NumPy).
+        """
+        index, team_codes = self._index, self.team_codes
+        entries: Dict[Any, tuple] = {}
+        rows: Dict[Any, tuple] = {}
+        for game in games:
+            # Mismo criterio que _parse_game, sin llamadas por partido
+            get = game.get
+            status = get('status')
+            if status not in FINISHED_STATUSES and str(status or '').lower() not in FINISHED_STATUSES:
+                continue
+            home = get('homeTeamId') or get('homeTeamCode') or (get('home') or {}).get('code')
+            away = get('awayTeamId') or get('awayTeamCode') or (get('away') or {}).get('code')
+            if not home or not away:
+                continue
+            if 'homeScore' in game or 'awayScore' in game:
+                home_score, away_score = int(get('homeScore') or 0), int(get('awayScore') or 0)
+            else:
+                home_score = int((get('home') or {}).get('score') or 0)
+                away_score = int((get('away') or {}).get('score') or 0)
+
+            if home not in index:
+                index[home] = len(team_codes)
+                team_codes.append(home)
+            if away not in index:
+                index[away] = len(team_codes)
+                team_codes.append(away)
+
+            key = get('id') or (home, away, get('round'))
+            entries[key] = (home, away, home_score, away_score)
+            rows[key] = (index[home], index[away], home_score, away_score)
+
+        # Los arrays se crean una sola vez, con todos los equipos ya registrados
+        size = len(team_codes)
+        self._allocate(size)
+        self._applied = entries
+        if not rows:
+            return self
+
+        if np is None:
+            for row in rows.values():
+                self._add(*row)
+            return self
+
+        flat = np.fromiter(chain.from_iterable(rows.values()), dtype=np.int64, count=4 * len(rows))
+        h, a, hs, aws = flat.reshape(-1, 4).T
+        home_win = hs > aws
+        away_win = aws > hs
+
+        def per_team(indices, weights=None):
+            return np.bincount(indices, weights, minlength=size).astype(np.int64)
+
+        self.played = per_team(h) + per_team(a)
+        self.won = per_team(h, home_win) + per_team(a, away_win)
+        self.points_for = per_team(h, hs) + per_team(a, aws)
+        self.points_against = per_team(h, aws) + per_team(a, hs)
+
+        # Matrices de enfrentamientos: índice plano local*size+visitante
+        home_away, away_home = h * size + a, a * size + h
+        cells = size * size
+        self.h2h_wins = (np.bincount(home_away, home_win, minlength=cells) +
+                         np.bincount(away_home, away_win, minlength=cells)).astype(np.int64).reshape(size, size)
+        self.h2h_points = (np.bincount(home_away, hs, minlength=cells) +
+                           np.bincount(away_home, aws, minlength=cells)).astype(np.int64).reshape(size, size)
+        return self
+
+    def apply_game(self, game: Dict[str, Any]) -> bool:
+        """
+        Aplica un partido terminado. Si ya estaba aplicado con otro marcador
+        (corrección de acta) se descuenta el anterior. Devuelve si cambió algo.
+        """
+        game_id, entry = self._parse_game(game)
+        previous = self._applied.get(game_id)
+        if entry == previous:
+            return False
+
+        if previous is not None:
+            home, away, home_score, away_score = previous
+            self._add(self._index[home], self._index[away], home_score, away_score, sign=-1)
+            del self._applied[game_id]
+
+        if entry is not None:
+            home, away, home_score, away_score = entry
+            home_index, away_index = self._ensure_team(home), self._ensure_team(away)
+            self._add(home_index, away_index, home_score, away_score)
+            self._applied[game_id] = entry
+        return True
+
+    def _team_stats(self, index: int) -> Dict[str, int]:
+        played, won = int(self.played[index]), int(self.won[index])
+        points_for, points_against = int(self.points_for[index]), int(self.points_against[index])
+        return {
+            "played": played,
+            "won": won,
+            "lost": played - won,
+            "pointsFor": points_for,
+            "pointsAgainst": points_against,
+            "pointsDifference": points_for - points_against,
+        }
+
+    def _head_to_head(self, group: Sequence[int]) -> Dict[int, tuple]:
+        """(victorias, diferencia de puntos) de cada equipo solo contra los del grupo"""
+        result = {}
+        for i in group:
+            wins = sum(int(self.h2h_wins[i][j]) for j in group)
+            diff = sum(int(self.h2h_points[i][j]) - int(self.h2h_points[j][i]) for j in group)
+            result[i] = (wins, diff)
+        return result
+
+    def _break_ties(self, group: List[int]) -> List[int]:
+        if len(group) == 1:
+            return group
+
+        h2h = self._head_to_head(group)
+        subgroups: Dict[tuple, List[int]] = {}
+        for index in group:
+            subgroups.setdefault(h2h[index], []).append(index)
+
+        if len(subgroups) == 1:
+            # Los enfrentamientos directos no deshacen el empate
+            return sorted(group, key=lambda i: (-(int(self.points_for[i]) - int(self.points_against[i])),
+                                                -int(self.points_for[i]), self.team_codes[i]))
+
+        ordered = []
+        for key in sorted(subgroups, reverse=True):
+            ordered.extend(self._break_ties(subgroups[key]))
+        return ordered
+
+    def ranking(self) -> List[str]:
+        """Códigos de equipo ordenados según la clasificación"""
+        by_wins: Dict[int, List[int]] = {}
+        for index in range(len(self.team_codes)):
+            by_wins.setdefault(int(self.won[index]), []).append(index)
+
+        ordered = []
+        for wins in sorted(by_wins, reverse=True):
+            ordered.extend(self._break_ties(by_wins[wins]))
+        return [self.team_codes[i] for i in ordered]
+
+    def rows(self, season_type: str = SEASON_TYPE_REGULAR) -> List[Dict[str, Any]]:
+        """Filas con las columnas de la tabla `standings` de Room"""
+        rows = []
+        for position, code in enumerate(self.ranking(), start=1):
+            row = {"teamId": code, "position": position}
+            row.update(self._team_stats(self._index[code]))
+            row["seasonType"] = season_type
+            rows.append(row)
+        return rows
+
+
+def compute_standings(games: Iterable[Dict[str, Any]], team_codes: Iterable[str] = ()) -> StandingsTable:
+    return StandingsTable(team_codes).compute(games)
+
+
+def compute_by_season(games: Iterable[Dict[str, Any]], team_codes: Iterable[str] = (),
+                      season_key: str = 'season') -> Dict[Any, StandingsTable]:
+    """Una clasificación por temporada para históricos de varias temporadas"""
+    by_season: Dict[Any, List[Dict[str, Any]]] = {}
+    for game in games:
+        by_season.setdefault(game.get(season_key), []).append(game)
+    team_codes = list(team_codes)
+    return {season: compute_standings(season_games, team_codes) for season, season_games in by_season.items()}
+
+
+def write_standings_asset(path: str, table: StandingsTable, season: str,
+                          output_format: str = FORMAT_PRETTY, gzip_copy: bool = False) -> List[Dict[str, Any]]:
+    """Guarda la clasificación como asset estático y devuelve las filas"""
+    rows = table.rows()
+    data = {
+        "version": "1.0",
+        "season": season,
+        "lastUpdated": datetime.now().isoformat(),
+        "gamesPlayed": table.games_applied,
+        "standings": rows,
+    }
+    write_asset(path, data, output_format, list_key="standings", dict_fields=("teamId",), gzip_copy=gzip_copy)
+    return rows
+
+
+def print_standings(rows: List[Dict[str, Any]], limit: Optional[int] = None):
+    print(f"   {'#':>2} {'Equipo':<6} {'J':>3} {'G':>3} {'P':>3} {'+/-':>5}")
+    for row in rows[:limit]:
+        print(f"   {row['position']:>2} {row['teamId']:<6} {row['played']:>3} {row['won']:>3} "
+              f"{row['lost']:>3} {row['pointsDifference']:>+5}")
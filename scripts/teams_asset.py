@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Actualización por lotes de static_data/teams_2025_26.json.
+
+Los scripts de logos (add_team_logos, download_team_logos, create_team_logos)
+solo cambian algunos campos de cada equipo. En lugar de que cada uno cargue y
+reescriba el fichero completo, pasan un lote de cambios indexado por código de
+equipo a patch_teams, que:
+
+- toma un bloqueo exclusivo (fcntl) sobre .teams_2025_26.json.lock, de modo que
+  dos scripts ejecutados a la vez se serializan en lugar de pisarse (el punto
+  inicial hace que aapt no lo empaquete en el APK)
+- carga el JSON una vez, aplica todos los cambios y lo escribe una vez
+- escribe de forma atómica (temporal + rename) y solo si el contenido cambia
+- conserva el formato del fichero (indentado o minificado)
+"""
+
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos
+    fcntl = None
+
+from asset_writer import FORMAT_MINIFIED, FORMAT_PRETTY, encode_json, write_if_changed
+import json_codec
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+STATIC_DATA_DIR = os.path.join(PROJECT_ROOT, "app", "src", "main", "assets", "static_data")
+TEAMS_FILE = os.path.join(STATIC_DATA_DIR, "teams_2025_26.json")
+
+LOCK_SUFFIX = ".lock"
+
+
+def lock_path(path: str) -> str:
+    """Fichero de bloqueo oculto junto a `path` (aapt ignora los assets que empiezan por '.')"""
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}{LOCK_SUFFIX}")
+
+
+@dataclass
+class PatchResult:
+    """Resultado de aplicar un lote de cambios"""
+    teams: List[Dict[str, Any]] = field(default_factory=list)
+    updated: List[Tuple[Dict[str, Any], List[str]]] = field(default_factory=list)
+    unknown: List[str] = field(default_factory=list)
+    written: bool = False
+
+    @property
+    def updated_count(self) -> int:
+        return len(self.updated)
+
+
+def team_code(team: Dict[str, Any]) -> str:
+    return team.get('code', team.get('id', ''))
+
+
+@contextmanager
+def locked(path: str = TEAMS_FILE) -> Iterator[None]:
+    """Bloqueo exclusivo entre procesos sobre `path` (mediante .path.lock)"""
+    if fcntl is None:
+        yield
+        return
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(lock_path(path), 'a') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _detect_format(content: bytes) -> str:
+    """Los assets indentados empiezan por '{' seguido de salto de línea"""
+    return FORMAT_PRETTY if content[:2] in (b'{\n', b'[\n') else FORMAT_MINIFIED
+
+
+def patch_teams(patches: Dict[str, Dict[str, Any]], path: str = TEAMS_FILE) -> PatchResult:
+    """
+    Aplica `patches` ({código: {campo: valor}}) en una sola lectura/escritura.
+    Los códigos que no existen en el fichero se devuelven en `unknown`.
+    """
+    with locked(path):
+        with open(path, 'rb') as f:
+            content = f.read()
+        teams_data = json_codec.loads(content)
+
+        result = PatchResult(teams=teams_data['teams'])
+        found = set()
+        for team in result.teams:
+            code = team_code(team)
+            patch = patches.get(code)
+            if patch is None:
+                continue
+            found.add(code)
+            changed = [key for key, value in patch.items() if team.get(key) != value]
+            if changed:
+                team.update(patch)
+                result.updated.append((team, changed))
+
+        result.unknown = [code for code in patches if code not in found]
+        if result.updated:
+            result.written = write_if_changed(path, encode_json(teams_data, _detect_format(content)))
+    return result
+
+
+def load_teams(path: str = TEAMS_FILE) -> List[Dict[str, Any]]:
+    """Lista de equipos (la escritura atómica garantiza un fichero completo)"""
+    return json_codec.load(path)['teams']
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Instrumentación ligera de los scripts de poblado.
+
+Con solo los print de cada script no se sabe en qué se fue el tiempo de una
+ejecución nocturna lenta. Este módulo recoge, en memoria y sin dependencias:
+
+- Spans: `with span("fetch.games"):` mide un bloque (anidable, por hilo)
+- Histogramas de latencia HTTP por host y endpoint (los segmentos con
+  dígitos de la ruta se agrupan como {id} y se ignora la query)
+- Contadores: peticiones por estado, bytes recibidos, reintentos, resultado
+  de la caché HTTP y ficheros/bytes escritos
+
+http_client.get y asset_writer registran lo suyo automáticamente; cada
+script envuelve su punto de entrada en `run_report("nombre")`, que al
+terminar escribe el informe en app/src/main/run_reports/ (junto a assets/,
+fuera del APK):
+
+- {nombre}.json: informe completo (spans, etapas agregadas, HTTP, contadores)
+- {nombre}.prom: formato textfile de Prometheus para node_exporter, con
+  duración, éxito, peticiones y bytes, para alertar si derivan
+
+EUROLEAGUE_RUN_REPORTS=0 desactiva la escritura y EUROLEAGUE_REPORT_DIR
+cambia la carpeta.
+
+Uso:
+    python3 scripts/telemetry.py [informe.json]    # Resumen de un informe
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DEFAULT_REPORT_DIR = os.path.join(PROJECT_ROOT, "app", "src", "main", "run_reports")
+
+METRIC_PREFIX = "euroleague"
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+STAGE_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+MAX_SPANS = 5000  # Los spans que excedan solo cuentan en los agregados
+
+# Resultado de la caché HTTP de cada petición
+CACHE_FRESH = "fresh"
+CACHE_REVALIDATED = "revalidated"
+CACHE_MISS = "miss"
+CACHE_BYPASS = "bypass"
+
+VERSION_SEGMENT = re.compile(r"v\d+")
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def endpoint(url: str) -> str:
+    """Ruta de la URL con los segmentos variables (con dígitos, salvo la versión v2) como {id}"""
+    path = urlparse(url).path or "/"
+    segments = ["{id}" if any(c.isdigit() for c in segment) and not VERSION_SEGMENT.fullmatch(segment)
+                else segment for segment in path.split("/")]
+    return "/".join(segments)
+
+
+class Histogram:
+    """Histograma de buckets acumulativos al estilo Prometheus"""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def quantile(self, q: float) -> float:
+        """Cota superior del bucket que contiene el cuantil q (el máximo si cae en +Inf)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, count in zip(self.buckets, self.counts):
+            if count >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "max": round(self.max, 6),
+            "p50": round(self.quantile(0.5), 6),
+            "p95": round(self.quantile(0.95), 6),
+            "buckets": {str(bound): count for bound, count in zip(self.buckets, self.counts)},
+        }
+
+
+@dataclass
+class Span:
+    name: str
+    start: float
+    duration: float = 0.0
+    parent: Optional[int] = None
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+class Telemetry:
+    """Registro de spans, contadores e histogramas de un proceso (seguro entre hilos)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self._origin = time.perf_counter()
+            self.spans: List[Span] = []
+            self.dropped_spans = 0
+            self.stages: Dict[str, Histogram] = {}
+            self.counters: Dict[Tuple[str, Labels], float] = {}
+            self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+
+    # --- Spans ----------------------------------------------------------------
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[Span]:
+        stack = self._local.__dict__.setdefault("stack", [])
+        current = Span(name, time.perf_counter() - self._origin, attrs=attrs)
+        with self._lock:
+            current.parent = stack[-1] if stack else None
+            index = len(self.spans)
+            if index < MAX_SPANS:
+                self.spans.append(current)
+            else:
+                index = None
+                self.dropped_spans += 1
+        stack.append(index)
+        try:
+            yield current
+        except SystemExit as e:
+            # sys.exit(0) / sys.exit() al terminar bien no es un error
+            if e.code not in (0, None):
+                current.error = type(e).__name__
+            raise
+        except BaseException as e:
+            current.error = type(e).__name__
+            raise
+        finally:
+            stack.pop()
+            current.duration = time.perf_counter() - self._origin - current.start
+            with self._lock:
+                self.stages.setdefault(name, Histogram(STAGE_BUCKETS)).observe(current.duration)
+
+    # --- Métricas -------------------------------------------------------------
+
+    def incr(self, name: str, value: float = 1, **labels):
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(value)
+
+    def record_http(self, url: str, status: Any, elapsed: float, size: int = 0,
+                    cache: str = CACHE_BYPASS, attempt: int = 1):
+        """Una petición (o intento) HTTP. Las servidas desde caché no cuentan latencia"""
+        host, path = urlparse(url).hostname or "", endpoint(url)
+        self.incr("http_requests_total", host=host, endpoint=path, status=status, cache=cache)
+        if cache != CACHE_FRESH:
+            self.observe("http_request_duration_seconds", elapsed, host=host, endpoint=path)
+            self.incr("http_response_bytes_total", size, host=host, endpoint=path)
+        if attempt > 1:
+            self.incr("http_retries_total", host=host, endpoint=path)
+
+    # --- Informe --------------------------------------------------------------
+
+    def snapshot(self, script: str, success: bool) -> Dict[str, Any]:
+        with self._lock:
+            duration = time.perf_counter() - self._origin
+            return {
+                "version": 1,
+                "script": script,
+                "success": success,
+                "startedAt": datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(),
+                "durationSeconds": round(duration, 6),
+                "stages": {name: hist.to_dict() for name, hist in sorted(self.stages.items())},
+                "spans": [
+                    {"name": s.name, "start": round(s.start, 6), "duration": round(s.duration, 6),
+                     "parent": s.parent, **({"attrs": s.attrs} if s.attrs else {}),
+                     **({"error": s.error} if s.error else {})}
+                    for s in self.spans
+                ],
+                "droppedSpans": self.dropped_spans,
+                "counters": [{"name": name, "labels": dict(labels), "value": value}
+                             for (name, labels), value in sorted(self.counters.items())],
+                "histograms": [{"name": name, "labels": dict(labels), **hist.to_dict()}
+                               for (name, labels), hist in sorted(self.histograms.items())],
+            }
+
+
+TELEMETRY = Telemetry()
+
+
+def span(name: str, **attrs):
+    return TELEMETRY.span(name, **attrs)
+
+
+def incr(name: str, value: float = 1, **labels):
+    TELEMETRY.incr(name, value, **labels)
+
+
+# --- Formato textfile de Prometheus -------------------------------------------
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def to_prometheus(report: Dict[str, Any]) -> str:
+    """Informe en formato de exposición de texto de Prometheus"""
+    script = {"script": report["script"]}
+    lines: List[str] = []
+    declared = set()
+
+    def metric(family: str, kind: str, value: float, labels: Dict[str, str], help_text: str = "",
+               suffix: str = ""):
+        name = f"{METRIC_PREFIX}_{family}"
+        if name not in declared:
+            declared.add(name)
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"{name}{suffix}{_labels({**script, **labels})} {value}")
+
+    def histogram(family: str, hist: Dict[str, Any], labels: Dict[str, str], help_text: str):
+        for bound, count in hist["buckets"].items():
+            metric(family, "histogram", count, {**labels, "le": bound}, help_text, "_bucket")
+        metric(family, "histogram", hist["count"], {**labels, "le": "+Inf"}, help_text, "_bucket")
+        metric(family, "histogram", hist["sum"], labels, help_text, "_sum")
+        metric(family, "histogram", hist["count"], labels, help_text, "_count")
+
+    metric("run_success", "gauge", int(report["success"]), {}, "1 si la última ejecución terminó bien")
+    metric("run_duration_seconds", "gauge", report["durationSeconds"], {}, "Duración de la última ejecución")
+    started = datetime.fromisoformat(report["startedAt"]).timestamp()
+    metric("run_timestamp_seconds", "gauge", started, {}, "Inicio de la última ejecución (epoch)")
+    for name, stage in report["stages"].items():
+        histogram("stage_duration_seconds", stage, {"stage": name}, "Duración de los spans por nombre")
+    for hist in report["histograms"]:
+        histogram(hist["name"], hist, hist["labels"], "Latencia HTTP por host y endpoint")
+    for counter in report["counters"]:
+        metric(counter["name"], "counter", counter["value"], counter["labels"])
+    return "\n".join(lines) + "\n"
+
+
+# --- Escritura del informe ----------------------------------------------------
+
+def report_dir() -> str:
+    return os.environ.get("EUROLEAGUE_REPORT_DIR") or DEFAULT_REPORT_DIR
+
+
+def reports_enabled() -> bool:
+    return os.environ.get("EUROLEAGUE_RUN_REPORTS", "1").lower() not in ("0", "false", "no", "off")
+
+
+def load_report(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_run_report(report: Dict[str, Any], directory: Optional[str] = None) -> Tuple[str, str]:
+    """Escribe {script}.json y {script}.prom. Devuelve sus rutas"""
+    from asset_writer import write_atomic
+
+    directory = directory or report_dir()
+    json_path = os.path.join(directory, f"{report['script']}.json")
+    prom_path = os.path.join(directory, f"{report['script']}.prom")
+    write_atomic(json_path, (json.dumps(report, ensure_ascii=False, indent=2) + "\n").encode('utf-8'))
+    write_atomic(prom_path, to_prometheus(report).encode('utf-8'))
+    return json_path, prom_path
+
+
+def _drift(current: float, previous: Optional[float]) -> str:
+    if not previous:
+        return ""
+    change = (current - previous) / previous * 100
+    return f" ({'+' if change >= 0 else ''}{change:.0f}% vs anterior)"
+
+
+def print_run_summary(report: Dict[str, Any], previous: Optional[Dict[str, Any]] = None,
+                      path: Optional[str] = None, top: int = 5):
+    """Etapas más lentas y resumen HTTP, con la variación frente al informe anterior"""
+    counters = report["counters"]
+    requests_made = sum(c["value"] for c in counters if c["name"] == "http_requests_total"
+                        and c["labels"].get("cache") != CACHE_FRESH)
+    previous_requests = None
+    if previous:
+        previous_requests = sum(c["value"] for c in previous["counters"] if c["name"] == "http_requests_total"
+                                and c["labels"].get("cache") != CACHE_FRESH)
+    received = sum(c["value"] for c in counters if c["name"] == "http_response_bytes_total")
+    retries = sum(c["value"] for c in counters if c["name"] == "http_retries_total")
+    written = sum(c["value"] for c in counters if c["name"] == "asset_bytes_written_total")
+
+    print(f"\n📈 Informe de ejecución: {report['durationSeconds']:.2f}s"
+          f"{_drift(report['durationSeconds'], previous and previous.get('durationSeconds'))}")
+    slowest = sorted(report["stages"].items(), key=lambda item: item[1]["sum"], reverse=True)[:top]
+    for name, stage in slowest:
+        times = f" × {stage['count']}" if stage["count"] > 1 else ""
+        print(f"   ⏱️ {name:<28} {stage['sum']:>8.2f}s{times}")
+    if requests_made:
+        print(f"   🌐 {requests_made:.0f} peticiones{_drift(requests_made, previous_requests)}, "
+              f"{received / 1024:,.0f} KB recibidos, {retries:.0f} reintentos")
+        for hist in sorted(report["histograms"], key=lambda h: h["sum"], reverse=True)[:3]:
+            labels = hist["labels"]
+            print(f"      {labels.get('host', '')}{labels.get('endpoint', '')}: {hist['count']} × "
+                  f"p50 {hist['p50'] * 1000:.0f} ms, p95 {hist['p95'] * 1000:.0f} ms")
+    if written:
+        print(f"   💾 {written / 1024:,.0f} KB escritos")
+    if path:
+        print(f"   📄 {os.path.relpath(path)}")
+
+
+class RunReport:
+    """Ejecución en curso; `ok` se puede poner a False para marcarla como fallida"""
+
+    def __init__(self, script: str):
+        self.script = script
+        self.ok = True
+
+
+@contextmanager
+def run_report(script: str, quiet: bool = False) -> Iterator[RunReport]:
+    """
+    Envuelve el punto de entrada de un script: lo mide como span raíz y al
+    salir (también con sys.exit o excepción) escribe el informe.
+    """
+    run = RunReport(script)
+    try:
+        with span(script):
+            yield run
+    except SystemExit as e:
+        run.ok = run.ok and e.code in (0, None)
+        raise
+    except BaseException:
+        run.ok = False
+        raise
+    finally:
+        if reports_enabled():
+            report = TELEMETRY.snapshot(script, run.ok)
+            json_path = os.path.join(report_dir(), f"{script}.json")
+            previous = load_report(json_path)
+            try:
+                write_run_report(report)
+            except OSError as e:
+                print(f"⚠️ No se pudo escribir el informe de ejecución: {e}")
+                json_path = None
+            if not quiet:
+                print_run_summary(report, previous, json_path)
+
+
+def main() -> int:
+    paths = sys.argv[1:]
+    if not paths and os.path.isdir(report_dir()):
+        paths = [os.path.join(report_dir(), name) for name in sorted(os.listdir(report_dir()))
+                 if name.endswith(".json")]
+    if not paths:
+        print("ℹ️ No hay informes de ejecución")
+        return 0
+    for path in paths:
+        report = load_report(path)
+        if report is None:
+            print(f"❌ Informe no válido: {path}")
+            return 1
+        print(f"\n🏀 {report['script']} ({report['startedAt']}) {'✅' if report['success'] else '❌'}")
+        print_run_summary(report, path=path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())